@@ -5,17 +5,28 @@ Baseado em configuração JSON com suporte a JavaScript, tratamento de lixo e li
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import re
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
-from urllib.parse import urljoin, urlparse
-from collections import deque
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 import hashlib
 
+# Permite importar libs/ quando executado como script
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+try:
+    from libs.scrapers.adapters.adaptive_host_limiter import AdaptiveHostLimiter
+except ImportError:
+    AdaptiveHostLimiter = None
+
 
 @dataclass
 class PageMetadata:
@@ -59,7 +70,8 @@ class ConfigManager:
             "javascript_handling": {"enable_js_interaction": True, "click_and_wait": []},
             "selectors": {"title": ["h1"], "content": ["#main-content"], "skip": []},
             "links": {"follow_patterns": [], "ignore_patterns": []},
-            "output": {"format": "jsonl", "save_directory": "docs_scraped"}
+            "output": {"format": "jsonl", "save_directory": "docs_scraped"},
+            "concurrency": {"enable_worker_pool": False, "num_workers": 1}
         }
     
     def get(self, key_path: str, default: Any = None) -> Any:
@@ -76,8 +88,53 @@ class ConfigManager:
         return value if value is not None else default
 
 
+_HORIZONTAL_WS = re.compile(r'[ \t]+')
+# Substituições especiais de garbage_patterns; os demais padrões são removidos
+_PATTERN_REPLACEMENTS = {"\\s+": " ", "\\n{3,}": "\n\n"}
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Equivale a re.sub(r'\\s+', ' ', text) usando str.split (mesma definição de espaço)"""
+    parts = text.split()
+    if not parts:
+        return ' ' if text else ''
+    lead = ' ' if text[0].isspace() else ''
+    trail = ' ' if text[-1].isspace() else ''
+    return lead + ' '.join(parts) + trail
+
+
+def _compile_rule(pattern: str, replacement: str, literals: Optional[List[str]] = None) -> Callable[[str], str]:
+    """
+    Regra compilada; com pré-filtro quando o config declara os literais do padrão.
+    
+    literals lista textos dos quais ao menos um aparece em todo trecho que o
+    padrão casa (ex: '<!--.*?-->' -> ['<!--']). Sem literais a regex sempre roda.
+    """
+    if pattern == "\\s+" and replacement == " ":
+        return _collapse_whitespace
+    
+    regex = re.compile(pattern)
+    literals = tuple(literal for literal in (literals or []) if literal)
+    if not literals:
+        return lambda text: regex.sub(replacement, text)
+    
+    def apply(text: str) -> str:
+        # `in` é uma busca de substring em C, bem mais barata que varrer com a regex
+        if any(literal in text for literal in literals):
+            return regex.sub(replacement, text)
+        return text
+    return apply
+
+
 class GarbageCollector:
-    """Remove lixo e caracteres indesejados do conteúdo"""
+    """
+    Remove lixo e caracteres indesejados do conteúdo.
+    
+    As regras de cleanup são compiladas uma vez no construtor em uma lista
+    ordenada de funções. Padrões listados em cleanup.prefilter_literals só
+    varrem o texto com a regex quando um dos literais declarados aparece
+    nele, então a maioria dos textos passa por poucas varreduras.
+    """
     
     def __init__(self, config: ConfigManager):
         self.config = config
@@ -85,47 +142,48 @@ class GarbageCollector:
         self.garbage_sequences = config.get("cleanup.garbage_sequences", [])
         self.normalize_whitespace = config.get("cleanup.normalize_whitespace", True)
         self.remove_empty_lines = config.get("cleanup.remove_empty_lines", True)
+        self.prefilter_literals = config.get("cleanup.prefilter_literals", {})
+        self._steps = self._compile_steps()
     
-    def clean(self, content: str) -> str:
-        """Remove lixo do conteúdo"""
-        if not content:
-            return ""
-        
-        # Remove padrões de lixo
+    def _compile_steps(self) -> List[Callable[[str], str]]:
+        """Compila as regras na ordem do config (padrões inválidos são avisados uma vez)"""
+        rules: List[Tuple[str, str]] = []
         for pattern in self.garbage_patterns:
+            rules.append((pattern, _PATTERN_REPLACEMENTS.get(pattern, '')))
+        for seq in self.garbage_sequences:
+            # 'skip'/'skip_element' marcam elementos durante o parsing de HTML; não alteram texto
+            if seq.get('action', 'remove') == 'remove':
+                rules.append((seq.get('pattern', ''), ''))
+        
+        steps = []
+        for pattern, replacement in rules:
             try:
-                if pattern == "\\s+":
-                    content = re.sub(r'\s+', ' ', content)
-                elif pattern == "\\n{3,}":
-                    content = re.sub(r'\n{3,}', '\n\n', content)
-                else:
-                    content = re.sub(pattern, '', content)
+                steps.append(_compile_rule(pattern, replacement, self.prefilter_literals.get(pattern)))
             except re.error:
                 print(f"⚠️  Padrão regex inválido: {pattern}")
+        return steps
+    
+    def clean(self, content: str) -> str:
+        """Remove lixo do conteúdo"""
+        if not content:
+            return ""
         
-        # Processa sequências de lixo
-        for seq in self.garbage_sequences:
-            pattern = seq.get('pattern', '')
-            action = seq.get('action', 'remove')
-            
-            try:
-                if action == 'remove':
-                    content = re.sub(pattern, '', content)
-                elif action == 'skip':
-                    # Marca para pular elemento (durante HTML parsing)
-                    pass
-            except re.error:
-                print(f"⚠️  Padrão inválido: {pattern}")
+        for step in self._steps:
+            content = step(content)
         
-        # Normaliza espaços em branco
+        # Normaliza espaços em branco (só há o que trocar com tab ou espaço duplo)
         if self.normalize_whitespace:
-            content = re.sub(r'[ \t]+', ' ', content)
+            if '\t' in content or '  ' in content:
+                content = _HORIZONTAL_WS.sub(' ', content)
             content = content.strip()
         
         # Remove linhas vazias
         if self.remove_empty_lines:
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            content = '\n'.join(lines)
+            if '\n' in content:
+                lines = (line.strip() for line in content.split('\n'))
+                content = '\n'.join(line for line in lines if line)
+            else:
+                content = content.strip()
         
         return content
     
@@ -135,26 +193,154 @@ class GarbageCollector:
         return any(kw in text.lower() for kw in garbage_keywords)
 
 
+# Extração do documento principal em um único evaluate: título, conteúdo
+# (removendo os seletores skip antes do texto), breadcrumb e links, na
+# mesma ordem em que as chamadas separadas eram feitas
+_EXTRACTION_SCRIPT = """
+(args) => {
+    const cfg = %s;
+    const query = (selector, all) => {
+        try {
+            return all ? Array.from(document.querySelectorAll(selector)) : document.querySelector(selector);
+        } catch (e) {
+            return all ? [] : null;
+        }
+    };
+    
+    let title = '';
+    for (const selector of cfg.title) {
+        const el = query(selector, false);
+        if (el && el.textContent) { title = el.textContent; break; }
+    }
+    
+    let content = '';
+    if (args.mainContent) {
+        for (const selector of cfg.content) {
+            const el = query(selector, false);
+            if (!el) continue;
+            for (const skip of cfg.skip) query(skip, true).forEach(node => node.remove());
+            if (el.textContent) { content = el.textContent; break; }
+        }
+        if (!content && document.body) content = document.body.textContent || '';
+    }
+    
+    let breadcrumb = [];
+    for (const selector of cfg.breadcrumb) {
+        const items = query(`${selector} li, ${selector} a, ${selector} span`, true);
+        if (items.length) {
+            breadcrumb = items.slice(0, cfg.maxDepth).map(item => item.textContent || '');
+            break;
+        }
+    }
+    
+    const links = Array.from(document.querySelectorAll('a[href]'))
+        .map(a => a.href)
+        .filter(href => href && href.length > 0);
+    
+    return {title, content, breadcrumb, links};
+}
+"""
+
+
 class ContentExtractor:
-    """Extrai conteúdo das páginas"""
+    """
+    Extrai conteúdo das páginas.
+    
+    extract_page faz uma única chamada page.evaluate com um script gerado
+    a partir dos seletores do config (compilado no construtor), em vez de
+    um round trip CDP por seletor/item. Os métodos extract_title,
+    extract_content e extract_breadcrumb continuam disponíveis para
+    extrações avulsas.
+    """
     
     def __init__(self, config: ConfigManager, garbage_collector: GarbageCollector):
         self.config = config
         self.gc = garbage_collector
         self.max_length = config.get("extraction.max_content_length", 50000)
         self.min_length = config.get("extraction.min_content_length", 100)
+        self.max_title_length = config.get("extraction.max_title_length", 500)
+        self.max_breadcrumb_depth = config.get("extraction.max_breadcrumb_depth", 8)
+        self.extraction_script = self._compile_extraction_script()
+    
+    def _compile_extraction_script(self) -> str:
+        """Embute os seletores do config no script de extração"""
+        selectors = {
+            "title": self.config.get("selectors.title", ["h1"]),
+            "content": self.config.get("selectors.content", ["#main-content"]),
+            "skip": self.config.get("selectors.skip", []),
+            "breadcrumb": self.config.get("selectors.breadcrumb", [".breadcrumb"]),
+            "maxDepth": self.max_breadcrumb_depth,
+        }
+        return _EXTRACTION_SCRIPT % json.dumps(selectors, ensure_ascii=False)
+    
+    async def extract_page(self, page) -> Dict[str, Any]:
+        """
+        Extrai título, conteúdo, breadcrumb e links de uma vez.
+        
+        Returns:
+            Dict com title, content ("" se abaixo do mínimo), breadcrumb e links (brutos)
+        """
+        # Iframes (MadCap Flare) podem ser de outra origem: lidos pelo Playwright
+        frame_content = await self._extract_frames_text(page)
+        
+        try:
+            raw = await page.evaluate(self.extraction_script, {"mainContent": not frame_content})
+        except Exception:
+            raw = {"title": "", "content": "", "breadcrumb": [], "links": []}
+        
+        return {
+            "title": self._finish_title(raw.get("title")),
+            "content": self._finish_content(frame_content or raw.get("content") or ""),
+            "breadcrumb": self._finish_breadcrumb(raw.get("breadcrumb") or []),
+            "links": raw.get("links") or [],
+        }
+    
+    async def _extract_frames_text(self, page) -> str:
+        """Maior texto de body entre os iframes da página"""
+        content = ""
+        try:
+            frames = page.frames
+            if len(frames) > 1:
+                for frame in frames[1:]:  # Pula frame principal
+                    try:
+                        text = await frame.text_content('body')
+                        if text and len(text) > len(content):
+                            content = text
+                    except:
+                        pass
+        except:
+            pass
+        return content
+    
+    def _finish_title(self, title: Optional[str]) -> str:
+        return self.gc.clean(title)[:self.max_title_length] if title else ""
+    
+    def _finish_content(self, content: str) -> str:
+        # Limpa conteúdo
+        content = self.gc.clean(content)
+        
+        # Respeita limites de comprimento
+        if len(content) > self.max_length:
+            content = content[:self.max_length]
+            content = content.rsplit(' ', 1)[0] + '...'
+        
+        if len(content) < self.min_length:
+            return ""
+        
+        return content
+    
+    def _finish_breadcrumb(self, items: List[str]) -> List[str]:
+        return [self.gc.clean(text) for text in items if text and not self.gc.is_garbage(text)]
     
     async def extract_title(self, page) -> str:
         """Extrai título da página"""
         title_selectors = self.config.get("selectors.title", ["h1"])
-        max_length = self.config.get("extraction.max_title_length", 500)
         
         for selector in title_selectors:
             try:
                 title = await page.text_content(selector)
                 if title:
-                    title = self.gc.clean(title)[:max_length]
-                    return title
+                    return self._finish_title(title)
             except:
                 continue
         
@@ -165,21 +351,8 @@ class ContentExtractor:
         content_selectors = self.config.get("selectors.content", ["#main-content"])
         skip_selectors = self.config.get("selectors.skip", [])
         
-        content = ""
-        
         # Tenta extrair de iframes (suporte MadCap Flare)
-        try:
-            frames = page.frames
-            if len(frames) > 1:
-                for frame in frames[1:]:  # Pula frame principal
-                    try:
-                        text = await frame.text_content('body')
-                        if text and len(text) > len(content):
-                            content = text
-                    except:
-                        pass
-        except:
-            pass
+        content = await self._extract_frames_text(page)
         
         # Se não encontrou em iframes, procura na página principal
         if not content:
@@ -190,7 +363,10 @@ class ContentExtractor:
                         # Remove elementos a ignorar
                         for skip_sel in skip_selectors:
                             try:
-                                await page.evaluate(f"() => document.querySelectorAll('{skip_sel}').forEach(el => el.remove())")
+                                await page.evaluate(
+                                    "(sel) => document.querySelectorAll(sel).forEach(el => el.remove())",
+                                    skip_sel,
+                                )
                             except:
                                 pass
                         
@@ -206,35 +382,18 @@ class ContentExtractor:
             # Fallback: pega todo o conteúdo visível
             content = await page.text_content('body')
         
-        # Limpa conteúdo
-        content = self.gc.clean(content)
-        
-        # Respeita limites de comprimento
-        if len(content) > self.max_length:
-            content = content[:self.max_length]
-            content = content.rsplit(' ', 1)[0] + '...'
-        
-        if len(content) < self.min_length:
-            return ""
-        
-        return content
+        return self._finish_content(content or "")
     
     async def extract_breadcrumb(self, page) -> List[str]:
         """Extrai breadcrumb/navegação"""
         breadcrumb_selectors = self.config.get("selectors.breadcrumb", [".breadcrumb"])
-        max_depth = self.config.get("extraction.max_breadcrumb_depth", 8)
         
         for selector in breadcrumb_selectors:
             try:
                 items = await page.query_selector_all(f"{selector} li, {selector} a, {selector} span")
                 if items:
-                    breadcrumb = []
-                    for item in items[:max_depth]:
-                        text = await item.text_content()
-                        if text and not self.gc.is_garbage(text):
-                            breadcrumb.append(self.gc.clean(text))
-                    
-                    return breadcrumb
+                    texts = [await item.text_content() for item in items[:self.max_breadcrumb_depth]]
+                    return self._finish_breadcrumb(texts)
             except:
                 continue
         
@@ -263,7 +422,12 @@ class JavaScriptHandler:
                 pass
     
     async def handle_dynamic_content(self, page):
-        """Trata conteúdo dinâmico (clica em links com #, expande elementos)"""
+        """
+        Trata conteúdo dinâmico (clica em links com #, expande elementos).
+        
+        Um evaluate por configuração de clique (até 5 elementos) e uma
+        espera por configuração, em vez de click + espera por elemento.
+        """
         if not self.enable_js:
             return
         
@@ -275,21 +439,25 @@ class JavaScriptHandler:
             detect_change = click_cfg.get('detect_change', {})
             
             try:
-                # Encontra elementos
-                elements = await page.query_selector_all(selector)
+                clicked = await page.evaluate(
+                    """(selector) => {
+                        const elements = Array.from(document.querySelectorAll(selector)).slice(0, 5);
+                        for (const el of elements) {
+                            try { el.click(); } catch (e) {}
+                        }
+                        return elements.length;
+                    }""",
+                    selector,
+                )
+                if not clicked:
+                    continue
+                await asyncio.sleep(wait_ms / 1000)
                 
-                for element in elements[:5]:  # Limita a 5 cliques
+                # Detecta mudanças
+                monitor_sel = detect_change.get('monitor_selector', '')
+                if monitor_sel:
                     try:
-                        await element.click()
-                        await asyncio.sleep(wait_ms / 1000)
-                        
-                        # Detecta mudanças
-                        monitor_sel = detect_change.get('monitor_selector', '')
-                        if monitor_sel:
-                            try:
-                                await page.wait_for_selector(monitor_sel, timeout=wait_ms)
-                            except:
-                                pass
+                        await page.wait_for_selector(monitor_sel, timeout=wait_ms)
                     except:
                         pass
             except:
@@ -304,7 +472,6 @@ class LinkExtractor:
         self.follow_patterns = config.get("links.follow_patterns", [])
         self.ignore_patterns = config.get("links.ignore_patterns", [])
         self.internal_only = config.get("links.internal_only", True)
-        self.visited: Set[str] = set()
     
     def normalize_anchor_url(self, url: str) -> str:
         """Normaliza URLs com âncoras para extração via JavaScript clique"""
@@ -319,11 +486,10 @@ class LinkExtractor:
         return base + '#' + anchor
     
     def should_follow(self, url: str) -> bool:
-        """Decide se deve seguir um link"""
-        if not url or url in self.visited:
+        """Decide se deve seguir um link (duplicatas são filtradas pela BfsFrontier)"""
+        if not url:
             return False
         
-        # Normaliza e adiciona à visitados
         normalized = self.normalize_anchor_url(url)
         
         # Verifica padrões a ignorar
@@ -347,15 +513,101 @@ class LinkExtractor:
                     .filter(href => href && href.length > 0)
             """)
             
-            valid_links = []
-            for link in links:
-                if self.should_follow(link):
-                    self.visited.add(link)
-                    valid_links.append(link)
-            
-            return valid_links
+            return self.filter_links(links)
         except:
             return []
+    
+    def filter_links(self, links: List[str]) -> List[str]:
+        """Aplica should_follow a links já extraídos (ex: por ContentExtractor.extract_page)"""
+        return [link for link in links if self.should_follow(link)]
+
+
+class BfsFrontier:
+    """
+    Fronteira do crawl com deduplicação na entrada.
+    
+    Cada URL é normalizada e reduzida a um digest de 64 bits; `_seen`
+    guarda só esses inteiros (URLs já enfileiradas ou visitadas), então
+    uma URL entra na fila no máximo uma vez e não há strings repetidas
+    na memória. Com 64 bits, colisões só ficam prováveis na casa de
+    bilhões de URLs.
+    
+    A fila é um heap por (profundidade, ordem de chegada): BFS também com
+    vários workers consumindo ao mesmo tempo. add/pop não têm await, então
+    são atômicos entre tasks do mesmo event loop.
+    """
+    
+    def __init__(self, max_depth: Optional[int] = None):
+        self.max_depth = max_depth
+        self._queue: List[Tuple[int, int, str]] = []
+        self._seen: Set[int] = set()
+        self._order = itertools.count()
+        self.duplicates = 0
+    
+    @staticmethod
+    def normalize(url: str) -> str:
+        """Esquema/host em minúsculas, sem porta padrão, path vazio vira '/' e sem '#' vazio"""
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        netloc = parts.netloc.lower()
+        if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+            netloc = netloc.rsplit(":", 1)[0]
+        # Fragmento é mantido: no MadCap Flare ele identifica a página (#modulo/pagina.htm)
+        return urlunsplit((scheme, netloc, parts.path or "/", parts.query, parts.fragment))
+    
+    @classmethod
+    def fingerprint(cls, url: str) -> int:
+        """Digest de 64 bits da URL normalizada"""
+        digest = hashlib.blake2b(cls.normalize(url).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+    
+    def add(self, url: str, depth: int = 0) -> bool:
+        """Enfileira a URL se ela nunca foi vista e está dentro de max_depth; retorna True se entrou"""
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        key = self.fingerprint(url)
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        heapq.heappush(self._queue, (depth, next(self._order), url))
+        return True
+    
+    def extend(self, urls: List[str], depth: int = 0) -> int:
+        """Enfileira várias URLs na mesma profundidade; retorna quantas eram novas"""
+        return sum(1 for url in urls if self.add(url, depth))
+    
+    def pop(self) -> Tuple[str, int]:
+        """Próxima URL e sua profundidade (menor profundidade primeiro, FIFO no empate)"""
+        depth, _, url = heapq.heappop(self._queue)
+        return url, depth
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+    
+    def __contains__(self, url: str) -> bool:
+        return self.fingerprint(url) in self._seen
+    
+    @property
+    def seen_count(self) -> int:
+        """URLs distintas já enfileiradas (pendentes + visitadas)"""
+        return len(self._seen)
+    
+    def memory_bytes(self) -> int:
+        """Memória aproximada do conjunto de digests e da fila pendente"""
+        seen = sys.getsizeof(self._seen) + sum(sys.getsizeof(key) for key in self._seen)
+        queue = sys.getsizeof(self._queue) + sum(
+            sys.getsizeof(entry) + sys.getsizeof(entry[2]) for entry in self._queue
+        )
+        return seen + queue
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "seen": self.seen_count,
+            "pending": len(self._queue),
+            "duplicates": self.duplicates,
+            "memory_bytes": self.memory_bytes(),
+        }
 
 
 class ModularScraper:
@@ -368,9 +620,15 @@ class ModularScraper:
         self.js_handler = JavaScriptHandler(self.config)
         self.link_extractor = LinkExtractor(self.config)
         
+        # Rate limit por host (seção rate_limit do config)
+        rate_config = self.config.get("rate_limit", {}) or {}
+        self.rate_limiter = (
+            AdaptiveHostLimiter.from_config(rate_config)
+            if AdaptiveHostLimiter and rate_config.get("enabled", True) else None
+        )
+        
         # Estado
-        self.to_visit = deque()
-        self.visited: Set[str] = set()
+        self.frontier = BfsFrontier(max_depth=self.config.get("links.max_depth"))
         self.documents: List[Dict[str, Any]] = []
         
         # Estatísticas
@@ -395,16 +653,20 @@ class ModularScraper:
         self.stats['start_time'] = datetime.now(timezone.utc)
         base_url = self.config.get("scraper.base_url")
         max_pages = self.config.get("scraper.max_pages", 100)
+        num_workers = self.config.get("concurrency.num_workers", 1)
+        if not self.config.get("concurrency.enable_worker_pool", False):
+            num_workers = 1
         
         print(f"\n{'='*80}")
         print(f"SCRAPER MODULAR - Documentação Senior")
         print(f"{'='*80}")
         print(f"Base URL: {base_url}")
         print(f"Máx. páginas: {max_pages}")
+        print(f"Workers: {num_workers}")
         print(f"Config: {self.config.config_path}")
         print(f"{'='*80}\n")
         
-        self.to_visit.append(base_url)
+        self.frontier.add(base_url)
         
         async with async_playwright() as p:
             browser = await p.chromium.launch(
@@ -413,27 +675,11 @@ class ModularScraper:
             context = await browser.new_context(
                 viewport=self.config.get("scraper.viewport", {"width": 1920, "height": 1080})
             )
-            page = await context.new_page()
             
-            page_count = 0
-            while self.to_visit and page_count < max_pages:
-                url = self.to_visit.popleft()
-                
-                if url in self.visited:
-                    continue
-                
-                self.visited.add(url)
-                
-                print(f"[{page_count+1}/{max_pages}] Scrapeando: {url[:80]}...", end=" ", flush=True)
-                
-                success = await self._scrape_page(page, url)
-                
-                if success:
-                    print("✅")
-                    page_count += 1
-                else:
-                    print("❌")
-                    self.stats['pages_failed'] += 1
+            if num_workers > 1:
+                await self._crawl_concurrent(context, max_pages, num_workers)
+            else:
+                await self._crawl_sequential(await context.new_page(), max_pages)
             
             await browser.close()
         
@@ -441,11 +687,80 @@ class ModularScraper:
         self._save_documents()
         self._print_report()
     
-    async def _scrape_page(self, page, url: str) -> bool:
+    async def _crawl_sequential(self, page, max_pages: int):
+        """BFS com uma única página"""
+        page_count = 0
+        while self.frontier and page_count < max_pages:
+            url, depth = self.frontier.pop()
+            
+            print(f"[{page_count+1}/{max_pages}] Scrapeando: {url[:80]}...", end=" ", flush=True)
+            
+            success = await self._scrape_page(page, url, depth)
+            
+            if success:
+                print("✅")
+                page_count += 1
+            else:
+                print("❌")
+                self.stats['pages_failed'] += 1
+    
+    async def _crawl_concurrent(self, context, max_pages: int, num_workers: int):
+        """
+        BFS com num_workers páginas consumindo a mesma fronteira.
+        
+        Cada worker reserva uma vaga do orçamento antes de pegar uma URL
+        (pages_scraped + em andamento < max_pages) e a devolve se a página
+        falhar, então nunca passam de max_pages páginas salvas. Com a
+        fronteira vazia, o worker espera enquanto outros ainda podem
+        descobrir links; termina quando nada está em andamento.
+        """
+        changed = asyncio.Condition()
+        in_flight = 0
+        
+        async def worker():
+            nonlocal in_flight
+            page = await context.new_page()
+            try:
+                while True:
+                    async with changed:
+                        while True:
+                            has_budget = self.stats['pages_scraped'] + in_flight < max_pages
+                            if has_budget and self.frontier:
+                                url, depth = self.frontier.pop()
+                                in_flight += 1
+                                break
+                            if in_flight == 0:
+                                return
+                            await changed.wait()
+                    
+                    try:
+                        success = await self._scrape_page(page, url, depth)
+                    finally:
+                        async with changed:
+                            in_flight -= 1
+                            changed.notify_all()
+                    
+                    if success:
+                        print(f"[{self.stats['pages_scraped']}/{max_pages}] ✅ {url[:80]}")
+                    else:
+                        self.stats['pages_failed'] += 1
+                        print(f"[{self.stats['pages_scraped']}/{max_pages}] ❌ {url[:80]}")
+            finally:
+                await page.close()
+        
+        await asyncio.gather(*[worker() for _ in range(num_workers)])
+    
+    async def _scrape_page(self, page, url: str, depth: int = 0) -> bool:
         """Scrapa uma página individual"""
         try:
             timeout = self.config.get("scraper.timeout_ms", 30000)
-            await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            if self.rate_limiter:
+                async with self.rate_limiter.limit(url) as ticket:
+                    response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                    if response:
+                        ticket.observe(response.status, response.headers.get("retry-after"))
+            else:
+                await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
             await asyncio.sleep(0.5)
             
             # Limpa a página (remove modais, anúncios)
@@ -454,11 +769,12 @@ class ModularScraper:
             # Trata conteúdo dinâmico
             await self.js_handler.handle_dynamic_content(page)
             
-            # Extrai dados
+            # Extrai dados (um único evaluate na página)
             start_time = datetime.now()
-            title = await self.extractor.extract_title(page)
-            content = await self.extractor.extract_content(page)
-            breadcrumb = await self.extractor.extract_breadcrumb(page)
+            extracted = await self.extractor.extract_page(page)
+            title = extracted['title']
+            content = extracted['content']
+            breadcrumb = extracted['breadcrumb']
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
             
             if not content:
@@ -488,8 +804,8 @@ class ModularScraper:
             
             # Extrai links para continuação
             if self.stats['pages_scraped'] < self.config.get("scraper.max_pages", 100):
-                new_links = await self.link_extractor.extract_links(page)
-                self.to_visit.extend(new_links)
+                new_links = self.link_extractor.filter_links(extracted['links'])
+                self.frontier.extend(new_links, depth + 1)
             
             return True
         
@@ -600,7 +916,11 @@ class ModularScraper:
         print(f"{'='*80}")
         print(f"Páginas scrapeadas: {self.stats['pages_scraped']}")
         print(f"Páginas com erro: {self.stats['pages_failed']}")
-        print(f"Total de links visitados: {len(self.visited)}")
+        frontier = self.frontier.get_stats()
+        visited = frontier['seen'] - frontier['pending']
+        print(f"Total de links visitados: {visited}")
+        print(f"Fronteira: {frontier['seen']} URLs distintas | {frontier['pending']} pendentes | "
+              f"{frontier['duplicates']} duplicatas descartadas | ~{frontier['memory_bytes'] / 1024:.0f} KB")
         print(f"Conteúdo total extraído: {self.stats['total_content_length']:,} caracteres")
         print(f"Tempo total: {duration:.2f}s")
         
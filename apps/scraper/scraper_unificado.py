@@ -19,28 +19,455 @@ Output:
 - docs_estruturado/: Documentação organizada em pastas
 - docs_indexacao.jsonl: Arquivo JSONL para indexadores
 - docs_metadata.json: Metadados e análise completa
+- data/crawl_frontier.sqlite3: Fronteira persistente do crawl (checkpoint/resume)
+- docs_changes.json: Manifesto added/changed/removed do recrawl incremental
+- data/asset_cache/: Cache de CSS/JS/imagens entre execuções (--asset-cache)
+
+Uso:
+    python scraper_unificado.py [--save-html] [--resume] [--incremental] [--profile=index-only|archive|full]
+                                [--asset-cache[=DIR]] [--compress-html]
+
+Com --compress-html o HTML original é gravado como page.html.zst (zstd, com
+o dicionário do módulo em data/compression_dicts/ se houver) ou
+page.html.gz quando zstandard não está instalado.
 """
 
 import asyncio
+import contextlib
+import hashlib
 import json
+import os
+import queue
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urljoin, urlparse, unquote
 import re
-from typing import Dict, List, Optional, Tuple
+import sys
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
+
+# Permite importar libs/ quando executado como script (python apps/scraper/scraper_unificado.py)
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+try:
+    from libs.scrapers.adapters.url_resolver import UrlResolver
+except ImportError:
+    UrlResolver = None
+
+try:
+    from libs.scrapers.adapters.adaptive_host_limiter import AdaptiveHostLimiter
+    from libs.scrapers.ports.rate_limiter import rate_limited
+except ImportError:
+    AdaptiveHostLimiter = None
+    rate_limited = None
+
+try:
+    from libs.scrapers.adapters.asset_cache import AssetCache
+except ImportError:
+    AssetCache = None
+
+try:
+    from libs.scrapers.adapters.field_compression import FieldCompressor
+except ImportError:
+    FieldCompressor = None
+
+
+# Perfis de extração: definem o que page.evaluate devolve pelo protocolo DevTools.
+# Texto é normalizado e truncado no navegador; estrutura completa só no perfil "full".
+EXTRACTION_PROFILES = {
+    # Apenas o que o JSONL de indexação usa
+    'index-only': {'html': False, 'structure': False, 'max_text': 50000, 'max_headers': 50,
+                   'max_html': 0, 'max_items': 0},
+    # Indexação + HTML original (--save-html)
+    'archive': {'html': True, 'structure': False, 'max_text': 50000, 'max_headers': 50,
+                'max_html': 2000000, 'max_items': 0},
+    # Tudo, inclusive parágrafos, listas e links (depuração/análise)
+    'full': {'html': True, 'structure': True, 'max_text': 200000, 'max_headers': 200,
+             'max_html': 5000000, 'max_items': 500},
+}
+
+
+class CrawlFrontier:
+    """
+    Fronteira persistente do crawl em SQLite.
+    
+    Registra o estado de cada URL (descoberta, em andamento, concluída, falha)
+    e o documento já extraído das URLs concluídas. Cada transição é gravada
+    imediatamente, então um crawl interrompido pode ser retomado com --resume
+    sem buscar novamente as páginas já concluídas.
+    
+    As linhas sobrevivem entre execuções (status 'stale') com ETag,
+    Last-Modified e hash do conteúdo, usados pelo recrawl incremental.
+    """
+    
+    DISCOVERED = 'discovered'
+    IN_FLIGHT = 'in_flight'
+    DONE = 'done'
+    FAILED = 'failed'
+    STALE = 'stale'
+    
+    # Colunas adicionadas depois da primeira versão do schema
+    _EXTRA_COLUMNS = {
+        'parent_url': 'TEXT',
+        'breadcrumb': 'TEXT',
+        'etag': 'TEXT',
+        'last_modified': 'TEXT',
+        'content_hash': 'TEXT',
+    }
+    
+    def __init__(self, db_path: Path = Path("data") / "crawl_frontier.sqlite3"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                module TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                document TEXT,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(frontier)")}
+        for column, column_type in self._EXTRA_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE frontier ADD COLUMN {column} {column_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_status ON frontier(status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_parent ON frontier(parent_url)")
+        self.conn.commit()
+    
+    def start(self, resume: bool = False):
+        """Prepara a fronteira: nova execução (tudo vira 'stale') ou resume"""
+        if resume:
+            # URLs que estavam em andamento quando o processo caiu voltam para a fila
+            self.conn.execute(
+                "UPDATE frontier SET status = ? WHERE status = ?",
+                (self.DISCOVERED, self.IN_FLIGHT)
+            )
+        else:
+            # Mantém validadores e documentos da execução anterior para o modo incremental
+            self.conn.execute("UPDATE frontier SET status = ?", (self.STALE,))
+        self.conn.commit()
+    
+    def add_discovered(self, urls: List[str], module: str, parent_url: Optional[str] = None):
+        """Registra URLs descobertas (URLs conhecidas de execuções anteriores voltam para a fila)"""
+        now = datetime.now().isoformat()
+        self.conn.executemany("""
+            INSERT INTO frontier (url, module, status, parent_url, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                status = CASE WHEN frontier.status = 'stale' THEN excluded.status ELSE frontier.status END,
+                parent_url = COALESCE(excluded.parent_url, frontier.parent_url)
+        """, [(url, module, self.DISCOVERED, parent_url, now) for url in urls])
+        self.conn.commit()
+    
+    def is_done(self, url: str) -> bool:
+        """Retorna True se a URL já foi concluída"""
+        row = self.conn.execute("SELECT status FROM frontier WHERE url = ?", (url,)).fetchone()
+        return bool(row) and row[0] == self.DONE
+    
+    def get_state(self, url: str) -> Optional[Dict]:
+        """Retorna validadores e documento gravados para a URL"""
+        row = self.conn.execute(
+            "SELECT etag, last_modified, content_hash, document FROM frontier WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'content_hash': row[2],
+            'document': json.loads(row[3]) if row[3] else None,
+        }
+    
+    def children(self, parent_url: str) -> List[Dict]:
+        """Retorna subpáginas conhecidas de uma página (com o breadcrumb gravado)"""
+        rows = self.conn.execute(
+            "SELECT url, breadcrumb FROM frontier WHERE parent_url = ?", (parent_url,)
+        ).fetchall()
+        return [{'url': url, 'breadcrumb': json.loads(bc) if bc else []} for url, bc in rows]
+    
+    def mark_in_flight(self, url: str, module: str, breadcrumb: Optional[List[str]] = None,
+                       parent_url: Optional[str] = None):
+        """Marca URL como em andamento (incrementa tentativas)"""
+        now = datetime.now().isoformat()
+        self.conn.execute("""
+            INSERT INTO frontier (url, module, status, attempts, breadcrumb, parent_url, updated_at)
+            VALUES (?, ?, ?, 1, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET status = excluded.status,
+                attempts = frontier.attempts + 1,
+                breadcrumb = COALESCE(excluded.breadcrumb, frontier.breadcrumb),
+                parent_url = COALESCE(excluded.parent_url, frontier.parent_url),
+                updated_at = excluded.updated_at
+        """, (url, module, self.IN_FLIGHT,
+              json.dumps(breadcrumb, ensure_ascii=False) if breadcrumb else None,
+              parent_url, now))
+        self.conn.commit()
+    
+    def mark_done(self, url: str, document: Optional[Dict] = None, etag: Optional[str] = None,
+                  last_modified: Optional[str] = None, content_hash: Optional[str] = None):
+        """Marca URL como concluída, guardando o documento e os validadores HTTP"""
+        payload = json.dumps(document, ensure_ascii=False) if document else None
+        self.conn.execute("""
+            UPDATE frontier SET status = ?, document = ?, error = NULL,
+                etag = COALESCE(?, etag),
+                last_modified = COALESCE(?, last_modified),
+                content_hash = COALESCE(?, content_hash),
+                updated_at = ?
+            WHERE url = ?
+        """, (self.DONE, payload, etag, last_modified, content_hash,
+              datetime.now().isoformat(), url))
+        self.conn.commit()
+    
+    def mark_failed(self, url: str, error: str = ''):
+        """Marca URL como falha"""
+        self.conn.execute(
+            "UPDATE frontier SET status = ?, error = ?, updated_at = ? WHERE url = ?",
+            (self.FAILED, error, datetime.now().isoformat(), url)
+        )
+        self.conn.commit()
+    
+    def remove_stale(self, modules: List[str]) -> List[str]:
+        """Remove e retorna URLs dos módulos processados que não foram redescobertas"""
+        if not modules:
+            return []
+        placeholders = ','.join('?' * len(modules))
+        params = (self.STALE, *modules)
+        removed = [row[0] for row in self.conn.execute(
+            f"SELECT url FROM frontier WHERE status = ? AND module IN ({placeholders})", params
+        )]
+        self.conn.execute(f"DELETE FROM frontier WHERE status = ? AND module IN ({placeholders})", params)
+        self.conn.commit()
+        return removed
+    
+    def done_documents(self) -> Iterator[Dict]:
+        """Itera sobre os documentos das URLs concluídas"""
+        cursor = self.conn.execute(
+            "SELECT document FROM frontier WHERE status = ? AND document IS NOT NULL",
+            (self.DONE,)
+        )
+        for (payload,) in cursor:
+            yield json.loads(payload)
+    
+    def counts(self) -> Dict[str, int]:
+        """Retorna número de URLs por status"""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+    
+    def close(self):
+        """Fecha a conexão"""
+        self.conn.close()
+
+
+class StreamingJsonlSink:
+    """
+    Escreve documentos de indexação no JSONL à medida que são scrapeados.
+    
+    As linhas vão para <arquivo>.tmp em lotes; close() faz fsync e renomeia
+    atomicamente para o destino, então o JSONL final nunca fica pela metade.
+    Contagem de documentos e caracteres é agregada durante a escrita.
+    """
+    
+    def __init__(self, path: Path, batch_size: int = 100):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.batch_size = batch_size
+        self.count = 0
+        self.total_chars = 0
+        self._buffer: List[str] = []
+        self._file: Optional[IO[str]] = None
+    
+    def write(self, index_doc: Dict):
+        """Adiciona um documento ao lote; grava quando o lote enche"""
+        self._buffer.append(json.dumps(index_doc, ensure_ascii=False) + '\n')
+        self.count += 1
+        self.total_chars += index_doc.get('content_length', 0)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Grava o lote pendente no arquivo temporário"""
+        if self._file is None:
+            self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        if self._buffer:
+            self._file.writelines(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+    
+    def close(self, alt_breadcrumbs: Optional[Dict[str, List[str]]] = None) -> Path:
+        """
+        Finaliza o arquivo e o move para o destino.
+        
+        alt_breadcrumbs (url -> caminhos alternativos) só é conhecido no fim do crawl;
+        se houver, o temporário é relido linha a linha para preencher o campo.
+        """
+        self.flush()
+        self._file.close()
+        self._file = None
+        
+        source = self.tmp_path
+        if alt_breadcrumbs:
+            source = self.tmp_path.with_name(self.tmp_path.name + '.aliases')
+            with open(self.tmp_path, 'r', encoding='utf-8') as src, \
+                    open(source, 'w', encoding='utf-8') as dst:
+                for line in src:
+                    index_doc = json.loads(line)
+                    aliases = alt_breadcrumbs.get(index_doc['url'])
+                    if aliases:
+                        index_doc['alt_breadcrumbs'] = aliases
+                        line = json.dumps(index_doc, ensure_ascii=False) + '\n'
+                    dst.write(line)
+            self.tmp_path.unlink()
+        
+        with open(source, 'r+', encoding='utf-8') as f:
+            os.fsync(f.fileno())
+        os.replace(source, self.path)
+        return self.path
+
+
+class BackgroundDocumentWriter:
+    """
+    Grava arquivos de documentos numa thread dedicada, fora do event loop.
+    
+    Cada item é (pasta, [(nome_arquivo, texto ou bytes), ...]). A fila é limitada para
+    que o scraping não ultrapasse o disco indefinidamente; a thread grava em
+    lotes e cria cada pasta uma única vez.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, max_pending: int = 256, batch_size: int = 32):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self.batch_size = batch_size
+        self.written = 0
+        self.errors = 0
+        self._created_dirs = set()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="doc-writer", daemon=True)
+            self._thread.start()
+    
+    async def submit(self, folder: Path, files: List[Tuple[str, Union[str, bytes]]]):
+        """Enfileira arquivos para gravação; só espera quando a fila está cheia"""
+        self._ensure_started()
+        item = (folder, files)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self.queue.put, item)
+    
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for item in batch:
+                if item is self._STOP:
+                    stop = True
+                else:
+                    self._write(*item)
+                self.queue.task_done()
+    
+    def _write(self, folder: Path, files: List[Tuple[str, Union[str, bytes]]]):
+        try:
+            if folder not in self._created_dirs:
+                folder.mkdir(parents=True, exist_ok=True)
+                self._created_dirs.add(folder)
+            for name, text in files:
+                if isinstance(text, bytes):
+                    (folder / name).write_bytes(text)
+                    continue
+                with open(folder / name, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            self.written += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"    [AVISO] Erro ao salvar {folder}: {e}")
+    
+    def flush(self):
+        """Barreira: bloqueia até todos os itens enfileirados serem gravados"""
+        if self._thread is not None:
+            self.queue.join()
+    
+    def close(self):
+        """Grava o que falta e encerra a thread"""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
 
 
 class SeniorDocScraper:
     """Scraper unificado para documentação Senior"""
     
-    def __init__(self, save_html: bool = False):
+    def __init__(self, save_html: bool = False, resume: bool = False,
+                 frontier_path: Optional[Path] = None, incremental: bool = False,
+                 profile: Optional[str] = None, asset_cache_dir: Optional[Path] = None,
+                 compress_html: bool = False):
         self.output_dir = Path("docs_estruturado")
         self.output_dir.mkdir(exist_ok=True)
         self.save_html = save_html
-        self.documents = []
+        # Sem perfil explícito: HTML só trafega do navegador quando vai ser salvo
+        self.profile = profile or ('archive' if save_html else 'index-only')
+        if self.profile not in EXTRACTION_PROFILES:
+            raise ValueError(f"Perfil de extração inválido: {self.profile} "
+                             f"(opções: {', '.join(EXTRACTION_PROFILES)})")
+        self.resume = resume
+        self.incremental = incremental
+        # Rate limit por host compartilhado com os demais scrapers (libs/scrapers)
+        self.rate_limiter = AdaptiveHostLimiter(
+            requests_per_second=2.0, burst=4, initial_concurrency=1, max_concurrency=4,
+            latency_target=20.0
+        ) if AdaptiveHostLimiter else None
+        self.frontier_path = Path(frontier_path) if frontier_path else Path("data") / "crawl_frontier.sqlite3"
+        self.frontier: Optional[CrawlFrontier] = None
+        # Documentos vão direto para o JSONL; nada do corpus fica em memória
+        self.sink = StreamingJsonlSink(Path("docs_indexacao.jsonl"))
+        # Arquivos de docs_estruturado/ são gravados fora do event loop
+        self.writer = BackgroundDocumentWriter()
+        # Cache de assets (skins MadCap, scripts, chunks de TOC) entre execuções
+        self.asset_cache = None
+        if asset_cache_dir:
+            if AssetCache:
+                self.asset_cache = AssetCache(Path(asset_cache_dir))
+            else:
+                print("[AVISO] AssetCache indisponível (libs/ não encontrado), seguindo sem cache")
+        # page.html comprimido (zstd com dicionário por módulo, ou gzip)
+        self.html_compressor = None
+        if compress_html:
+            if FieldCompressor:
+                self.html_compressor = FieldCompressor(dictionary_dir=Path("data") / "compression_dicts")
+            else:
+                print("[AVISO] FieldCompressor indisponível (libs/ não encontrado), HTML sem compressão")
+        
+        # Deduplicação global: URL canônica -> URL do documento já scrapeado
+        self.url_resolver = UrlResolver() if UrlResolver else None
+        self.seen_urls: Dict[str, str] = {}
+        self.breadcrumb_aliases: Dict[str, List[List[str]]] = {}
+        
+        # Recrawl incremental: validadores HTTP vistos nas respostas e manifesto de mudanças
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.changes = {'added': [], 'changed': [], 'removed': [], 'unchanged': 0}
         self.metadata = {
             'timestamp': datetime.now().isoformat(),
             'save_html': save_html,
+            'compress_html': self.html_compressor.algorithm if self.html_compressor else None,
+            'extraction_profile': self.profile,
             'statistics': {
                 'total_pages': 0,
                 'total_chars': 0,
@@ -49,7 +476,10 @@ class SeniorDocScraper:
                 'navigation_stats': {
                     'successful': 0,
                     'failed': 0,
-                    'skipped': 0
+                    'skipped': 0,
+                    'resumed': 0,
+                    'not_modified': 0,
+                    'deduplicated': 0
                 }
             }
         }
@@ -89,6 +519,40 @@ class SeniorDocScraper:
         # Padroniza formato de versão (6-10-4 → 6-10-4)
         return base + '#' + anchor
     
+    def canonicalize_madcap_hash(self, url: str) -> str:
+        """
+        Remove a query do hash MadCap (TocPath etc), que só descreve o caminho no menu.
+        
+        #lsp/funcoes/gerais.htm%3FTocPath%3DTecnologia%7C... → #lsp/funcoes/gerais.htm
+        """
+        if '#' not in url:
+            return url
+        
+        base, fragment = url.split('#', 1)
+        topic = re.split(r'%3F|\?', fragment, maxsplit=1)[0]
+        return f"{base}#{topic}" if topic else base
+    
+    def canonical_url(self, url: str) -> str:
+        """
+        Chave canônica da URL para deduplicação no crawl inteiro.
+        
+        O tópico do hash MadCap vira caminho, então a forma direta e a forma
+        com hash caem na mesma chave:
+        .../5.10.4/#lsp/funcoes/gerais.htm e .../5.10.4/lsp/funcoes/gerais.htm
+        → .../5.10.4/lsp/funcoes/gerais.htm
+        
+        Não é necessariamente navegável; para a fronteira usa-se
+        canonicalize_madcap_hash, que mantém a URL utilizável.
+        """
+        url = self.canonicalize_madcap_hash(url)
+        url = re.sub(r'/index\.html?(?=#|$)', '/', url)
+        base, _, topic = url.partition('#')
+        if base.endswith('/') and re.fullmatch(r'[^#]+\.html?', topic):
+            url = base + topic.lstrip('/')
+        else:
+            url = self.normalize_anchor_url(url)
+        return self.url_resolver.normalize(url) if self.url_resolver else url
+    
     def parse_senior_doc_link(self, url: str) -> Dict[str, str]:
         """
         Parseia links diretos de documentação Senior.
@@ -386,21 +850,30 @@ class SeniorDocScraper:
         
         return seções
     
+    def _rate_limit(self, url: str):
+        """Context manager do rate limiter por host (no-op sem libs/scrapers)"""
+        if rate_limited is None:
+            return contextlib.nullcontext(None)
+        return rate_limited(self.rate_limiter, url)
+    
     async def scrape_page(self, page, url: str, base_url: str = None) -> Optional[Dict]:
         """Scrapa conteúdo de uma página com tratamento de erro para URLs inválidas e âncoras"""
         # Normalizar URL se contiver âncoras (notas de versão)
         url = self.normalize_anchor_url(url)
         
         try:
-            # Primeira tentativa com timeout estendido para iframes MadCap
-            try:
-                await page.goto(url, wait_until="networkidle", timeout=20000)
-            except Exception as timeout_err:
-                # Se timeout, tenta com wait_until="domcontentloaded" (mais rápido)
-                if "timeout" in str(timeout_err).lower():
-                    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                else:
-                    raise
+            async with self._rate_limit(url) as ticket:
+                # Primeira tentativa com timeout estendido para iframes MadCap
+                try:
+                    response = await page.goto(url, wait_until="networkidle", timeout=20000)
+                except Exception as timeout_err:
+                    # Se timeout, tenta com wait_until="domcontentloaded" (mais rápido)
+                    if "timeout" in str(timeout_err).lower():
+                        response = await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                    else:
+                        raise
+                if ticket and response:
+                    ticket.observe(response.status, response.headers.get('retry-after'))
             await asyncio.sleep(1)  # Aumentado para dar mais tempo ao iframe carregar
         except Exception as e:
             error_msg = str(e).lower()
@@ -416,7 +889,13 @@ class SeniorDocScraper:
                 return None
         
         content = await page.evaluate("""
-            () => {
+            (profile) => {
+                // Normaliza espaços sem perder quebras de linha
+                const clean = (text) => (text || '')
+                    .replace(/[ \\t\\u00a0]+/g, ' ')
+                    .replace(/ ?\\n[\\s]*/g, '\\n')
+                    .trim();
+                
                 // Função auxiliar para extrair título
                 const extractTitle = () => {
                     // Primeiro, tentar encontrar h1 dentro do iframe#topic
@@ -452,9 +931,19 @@ class SeniorDocScraper:
                     paragraphs: [],
                     lists: [],
                     links: [],
+                    headers_count: 0,
+                    paragraphs_count: 0,
+                    lists_count: 0,
+                    links_count: 0,
                     total_chars: 0
                 };
                 
+                const setText = (text) => {
+                    const normalized = clean(text);
+                    result.total_chars = normalized.length;
+                    result.text_content = normalized.slice(0, profile.max_text);
+                };
+                
                 let main = document.querySelector('iframe#topic')?.contentDocument?.body;
                 
                 if (!main) {
@@ -468,47 +957,59 @@ class SeniorDocScraper:
                 }
                 
                 if (!main) {
-                    result.text_content = document.body.textContent;
-                    result.total_chars = result.text_content.length;
+                    setText(document.body.textContent);
                     return result;
                 }
                 
-                result.text_content = main.textContent;
-                result.html_content = main.innerHTML;
-                result.total_chars = result.text_content.length;
+                setText(main.textContent);
+                if (profile.html) {
+                    result.html_content = main.innerHTML.slice(0, profile.max_html);
+                }
                 
                 main.querySelectorAll('h1, h2, h3, h4, h5, h6').forEach(h => {
-                    const text = h.textContent.trim();
-                    if (text.length > 0) result.headers.push(text);
+                    const text = clean(h.textContent);
+                    if (text.length > 0) {
+                        result.headers_count++;
+                        if (result.headers.length < profile.max_headers) result.headers.push(text);
+                    }
                 });
                 
+                // Parágrafos, listas e links: só contagens, exceto no perfil "full"
+                const keep = (list, item) => {
+                    if (profile.structure && list.length < profile.max_items) list.push(item);
+                };
+                
                 main.querySelectorAll('p').forEach(p => {
-                    const text = p.textContent.trim();
-                    if (text.length > 20) result.paragraphs.push(text);
+                    const text = clean(p.textContent);
+                    if (text.length > 20) {
+                        result.paragraphs_count++;
+                        keep(result.paragraphs, text);
+                    }
                 });
                 
                 main.querySelectorAll('ul, ol').forEach(list => {
                     const items = [];
                     list.querySelectorAll(':scope > li').forEach(li => {
-                        const text = li.textContent.trim();
+                        const text = clean(li.textContent);
                         if (text.length > 0) items.push(text);
                     });
-                    if (items.length > 0) result.lists.push(items);
+                    if (items.length > 0) {
+                        result.lists_count++;
+                        keep(result.lists, items);
+                    }
                 });
                 
                 main.querySelectorAll('a[href]').forEach(a => {
                     const href = a.getAttribute('href');
                     if (href && !href.startsWith('#')) {
-                        result.links.push({
-                            text: a.textContent.trim(),
-                            href: href
-                        });
+                        result.links_count++;
+                        keep(result.links, {text: clean(a.textContent), href: href});
                     }
                 });
                 
                 return result;
             }
-        """)
+        """, EXTRACTION_PROFILES[self.profile])
         
         return content
     
@@ -710,7 +1211,7 @@ class SeniorDocScraper:
         return all_links
     
     async def save_document(self, doc: Dict, breadcrumb: List[str]):
-        """Salva documento em hierarquia de pastas"""
+        """Salva documento em hierarquia de pastas (gravação assíncrona via self.writer)"""
         # Criar pasta com sanitização
         if not breadcrumb or len(breadcrumb) == 0:
             return None
@@ -721,45 +1222,52 @@ class SeniorDocScraper:
             if sanitized:  # Garantir que não é vazio
                 folder = folder / sanitized
         
-        folder.mkdir(parents=True, exist_ok=True)
-        
-        # Salvar conteúdo
+        # Montar conteúdo em memória; a gravação fica com o writer em background
         try:
-            content_file = folder / 'content.txt'
-            with open(content_file, 'w', encoding='utf-8') as f:
-                f.write(f"# {doc['title']}\n\n")
-                f.write(f"URL: {doc['url']}\n\n")
-                f.write("---\n\n")
-                f.write(doc['text_content'][:50000])  # Primeiros 50k chars (documentação técnica completa)
+            files = [(
+                'content.txt',
+                f"# {doc['title']}\n\n"
+                f"URL: {doc['url']}\n\n"
+                "---\n\n"
+                + doc['text_content'][:50000]  # Primeiros 50k chars (documentação técnica completa)
+            )]
             
             # Salvar HTML original se solicitado
+            html_file = None
             if self.save_html and doc.get('html_content'):
-                html_file = folder / 'page.html'
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(f"<!--\n")
-                    f.write(f"Title: {doc['title']}\n")
-                    f.write(f"URL: {doc['url']}\n")
-                    f.write(f"Scraped: {datetime.now().isoformat()}\n")
-                    f.write(f"-->\n\n")
-                    f.write(doc['html_content'])
+                html = (
+                    "<!--\n"
+                    f"Title: {doc['title']}\n"
+                    f"URL: {doc['url']}\n"
+                    f"Scraped: {datetime.now().isoformat()}\n"
+                    "-->\n\n"
+                    + doc['html_content']
+                )
+                if self.html_compressor:
+                    html_file, html = self.html_compressor.encode_file(
+                        'page.html', html, module=self.sanitize_path(breadcrumb[0])
+                    )
+                else:
+                    html_file = 'page.html'
+                files.append((html_file, html))
             
             # Salvar metadata
-            meta_file = folder / 'metadata.json'
             metadata = {
                 'title': doc['title'],
                 'url': doc['url'],
                 'breadcrumb': breadcrumb,
                 'total_chars': doc['total_chars'],
-                'headers_count': len(doc['headers']),
-                'paragraphs_count': len(doc['paragraphs']),
-                'lists_count': len(doc['lists']),
-                'links_count': len(doc['links']),
-                'has_html': self.save_html and bool(doc.get('html_content')),
+                'headers_count': doc['headers_count'],
+                'paragraphs_count': doc['paragraphs_count'],
+                'lists_count': doc['lists_count'],
+                'links_count': doc['links_count'],
+                'has_html': html_file is not None,
+                'html_file': html_file,
                 'scraped_at': datetime.now().isoformat()
             }
+            files.append(('metadata.json', json.dumps(metadata, ensure_ascii=False, indent=2)))
             
-            with open(meta_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            await self.writer.submit(folder, files)
             
             return {
                 'folder': str(folder),
@@ -818,39 +1326,39 @@ class SeniorDocScraper:
         path = "/".join(path_parts)
         return f"https://{domain}/{path}/"
     
+    def index_document(self, doc: Dict) -> Dict:
+        """Monta o documento de indexação (Meilisearch) a partir de um documento scrapeado"""
+        # Gerar URL completo a partir do breadcrumb
+        # Se doc['url'] já é completo (começa com http), usar como está
+        # Senão, construir a partir do breadcrumb
+        url = doc['url']
+        if not url.startswith('http'):
+            url = self.path_to_full_url(doc['breadcrumb'])
+        
+        return {
+            'id': url,  # URL completa como ID único
+            'title': doc['title'],
+            'url': url,  # URL completo para o cliente acessar
+            'module': doc['breadcrumb'][0] if doc['breadcrumb'] else 'unknown',
+            'category': doc['breadcrumb'][1] if len(doc['breadcrumb']) > 1 else '',
+            'subcategory': doc['breadcrumb'][2] if len(doc['breadcrumb']) > 2 else '',
+            'breadcrumb': ' > '.join(doc['breadcrumb']),
+            'content': doc['text_content'][:50000],  # Primeiros 50k chars (documentação técnica com tabelas de funções)
+            'content_length': doc['total_chars'],
+            'headers': doc['headers'][:5],  # Primeiros 5 headers
+            'tags': doc['breadcrumb'][1:],  # Tags são as categorias
+            'alt_breadcrumbs': [],  # Outros caminhos que levam à mesma página (preenchido no fim)
+            'language': 'pt-BR',
+            'indexed_at': datetime.now().isoformat()
+        }
+    
     def generate_jsonl(self):
-        """Gera arquivo JSONL para indexação com URLs completos"""
-        jsonl_file = Path("docs_indexacao.jsonl")
-        
-        with open(jsonl_file, 'w', encoding='utf-8') as f:
-            for doc in self.documents:
-                # Gerar URL completo a partir do breadcrumb
-                # Se doc['url'] já é completo (começa com http), usar como está
-                # Senão, construir a partir do breadcrumb
-                url = doc['url']
-                if not url.startswith('http'):
-                    url = self.path_to_full_url(doc['breadcrumb'])
-                
-                # Documento para Meilisearch
-                index_doc = {
-                    'id': url,  # URL completa como ID único
-                    'title': doc['title'],
-                    'url': url,  # URL completo para o cliente acessar
-                    'module': doc['breadcrumb'][0] if doc['breadcrumb'] else 'unknown',
-                    'category': doc['breadcrumb'][1] if len(doc['breadcrumb']) > 1 else '',
-                    'subcategory': doc['breadcrumb'][2] if len(doc['breadcrumb']) > 2 else '',
-                    'breadcrumb': ' > '.join(doc['breadcrumb']),
-                    'content': doc['text_content'][:50000],  # Primeiros 50k chars (documentação técnica com tabelas de funções)
-                    'content_length': doc['total_chars'],
-                    'headers': doc['headers'][:5],  # Primeiros 5 headers
-                    'tags': doc['breadcrumb'][1:],  # Tags são as categorias
-                    'language': 'pt-BR',
-                    'indexed_at': datetime.now().isoformat()
-                }
-                
-                f.write(json.dumps(index_doc, ensure_ascii=False) + '\n')
-        
-        return jsonl_file
+        """Finaliza o arquivo JSONL para indexação (os documentos já foram gravados durante o crawl)"""
+        alt_breadcrumbs = {
+            url: [' > '.join(b) for b in aliases]
+            for url, aliases in self.breadcrumb_aliases.items()
+        }
+        return self.sink.close(alt_breadcrumbs)
     
     async def scrape_direct_link(self, direct_url: str, page):
         """
@@ -890,22 +1398,12 @@ class SeniorDocScraper:
             
             # Adicionar aos documentos para JSONL
             if save_result:
-                self.documents.append({
-                    'title': content['title'],
-                    'url': direct_url,
-                    'breadcrumb': breadcrumb,
-                    'text_content': content['text_content'],
-                    'total_chars': content['total_chars'],
-                    'headers': content['headers'],
-                    'paragraphs': content['paragraphs'],
-                    'lists': content['lists'],
-                    'links': content['links']
-                })
+                self._add_document(content, direct_url, breadcrumb)
                 
                 print(f"[OK] Documento salvo com sucesso!")
                 print(f"    Título: {content['title']}")
                 print(f"    Caracteres: {content['total_chars']}")
-                print(f"    Headers: {len(content['headers'])}")
+                print(f"    Headers: {content['headers_count']}")
                 return True
             else:
                 print(f"[ERRO] Falha ao salvar documento")
@@ -915,6 +1413,201 @@ class SeniorDocScraper:
             print(f"[ERRO] Conteúdo insuficiente ({chars} caracteres)")
             return False
     
+    def _add_document(self, content: Dict, url: str, breadcrumb: List[str],
+                      module_name: Optional[str] = None) -> Dict:
+        """Grava documento scrapeado no JSONL e atualiza estatísticas"""
+        # Só o que o JSONL usa; é também o que a fronteira guarda para resume
+        document = {
+            'title': content['title'],
+            'url': url,
+            'breadcrumb': breadcrumb,
+            'text_content': content['text_content'][:50000],
+            'total_chars': content['total_chars'],
+            'headers': content['headers'][:5],
+            'paragraphs': [],
+            'lists': [],
+            'links': []
+        }
+        self.sink.write(self.index_document(document))
+        
+        if module_name:
+            self.metadata['statistics']['by_module'][module_name]['pages'] += 1
+            self.metadata['statistics']['by_module'][module_name]['total_chars'] += content['total_chars']
+            self.metadata['statistics']['navigation_stats']['successful'] += 1
+        
+        return document
+    
+    def _already_done(self, url: str) -> bool:
+        """Resume: verifica se a URL já foi concluída em execução anterior"""
+        if self.resume and self.frontier and self.frontier.is_done(url):
+            self.metadata['statistics']['navigation_stats']['resumed'] += 1
+            return True
+        return False
+    
+    def _reuse_document(self, document: Dict, module_name: str):
+        """Recrawl incremental: reaproveita documento inalterado da execução anterior"""
+        self.sink.write(self.index_document(document))
+        self.metadata['statistics']['by_module'][module_name]['pages'] += 1
+        self.metadata['statistics']['by_module'][module_name]['total_chars'] += document['total_chars']
+        self.changes['unchanged'] += 1
+    
+    def resource_url(self, url: str) -> str:
+        """
+        Retorna a URL do recurso HTTP que de fato contém o conteúdo.
+        
+        Em MadCap o tópico está no hash (#lsp/funcoes/gerais.html%3FTocPath...) e é
+        carregado no iframe a partir de base + caminho do tópico.
+        """
+        if '#' not in url:
+            return url
+        
+        base, fragment = url.split('#', 1)
+        topic = re.split(r'%3F|\?', fragment, maxsplit=1)[0]
+        if topic.endswith(('.htm', '.html')):
+            parsed = urlparse(base)
+            return urljoin(f"{parsed.scheme}://{parsed.netloc}{parsed.path}", topic)
+        return base
+    
+    def _remember_validators(self, response):
+        """Listener de respostas: guarda ETag/Last-Modified dos documentos carregados"""
+        try:
+            if response.request.resource_type != 'document':
+                return
+            headers = response.headers
+            if 'etag' in headers or 'last-modified' in headers:
+                self._validators[response.url.split('#', 1)[0]] = (
+                    headers.get('etag'), headers.get('last-modified')
+                )
+        except Exception:
+            pass
+    
+    async def _is_not_modified(self, page, url: str, state: Dict) -> bool:
+        """Faz requisição condicional (If-None-Match/If-Modified-Since) para o recurso da URL"""
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        if not headers:
+            return False
+        
+        try:
+            resource = self.resource_url(url)
+            async with self._rate_limit(resource) as ticket:
+                response = await page.request.get(
+                    resource, headers=headers, timeout=15000, fail_on_status_code=False
+                )
+                if ticket:
+                    ticket.observe(response.status, response.headers.get('retry-after'))
+            return response.status == 304
+        except Exception:
+            return False
+    
+    async def _scrape_url(self, page, url: str, base_url: str, breadcrumb: List[str],
+                          module_name: str, max_retries: int, min_chars: int,
+                          parent_url: Optional[str] = None) -> Dict:
+        """
+        Scrapa uma URL registrando-a na fronteira.
+        
+        Retorna dict com 'status' ('duplicate', 'resumed', 'not_modified', 'unchanged',
+        'scraped' ou 'failed'), 'key' (URL da fronteira, sem TocPath), 'content' e 'document'. A conclusão
+        na fronteira fica a cargo de _finish_url, para que páginas com subpáginas só
+        terminem depois delas.
+        """
+        key = self.canonicalize_madcap_hash(url)
+        dedup_key = self.canonical_url(url)
+        
+        # Mesma página já vista neste crawl (ex: função referenciada por várias tabelas):
+        # não busca de novo, só anexa o breadcrumb adicional ao documento existente
+        if dedup_key in self.seen_urls:
+            self.metadata['statistics']['navigation_stats']['deduplicated'] += 1
+            doc_url = self.seen_urls[dedup_key]
+            aliases = self.breadcrumb_aliases.setdefault(doc_url, [])
+            if breadcrumb not in aliases:
+                aliases.append(breadcrumb)
+            return {'status': 'duplicate', 'key': key, 'content': None, 'document': None}
+        self.seen_urls[dedup_key] = url
+        
+        if self._already_done(key):
+            return {'status': 'resumed', 'key': key, 'content': None, 'document': None}
+        
+        state = None
+        if self.frontier:
+            state = self.frontier.get_state(key)
+            self.frontier.mark_in_flight(key, module_name, breadcrumb, parent_url)
+        previous = state if state and state['document'] else None
+        
+        # Recrawl incremental: 304 dispensa navegação, extração e escrita em disco
+        if self.incremental and previous and await self._is_not_modified(page, url, previous):
+            self.metadata['statistics']['navigation_stats']['not_modified'] += 1
+            self._reuse_document(previous['document'], module_name)
+            return {'status': 'not_modified', 'key': key, 'content': None, 'document': previous['document']}
+        
+        content = await self.scrape_page_with_retry(page, url, base_url, max_retries)
+        if not content or content['total_chars'] < min_chars:
+            return {'status': 'failed', 'key': key, 'content': content, 'document': None}
+        
+        content_hash = hashlib.sha256(content['text_content'].encode('utf-8')).hexdigest()
+        etag, last_modified = self._validators.pop(self.resource_url(url), (None, None))
+        result = {
+            'key': key,
+            'content': content,
+            'content_hash': content_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+        
+        # Conteúdo idêntico ao da execução anterior: não regrava nem reindexa
+        if self.incremental and previous and previous['content_hash'] == content_hash:
+            self.metadata['statistics']['navigation_stats']['successful'] += 1
+            self._reuse_document(previous['document'], module_name)
+            result.update({'status': 'unchanged', 'document': previous['document']})
+            return result
+        
+        document = None
+        if await self.save_document(content, breadcrumb):
+            document = self._add_document(content, url, breadcrumb, module_name)
+            self.changes['changed' if previous else 'added'].append(url)
+        result.update({'status': 'scraped', 'document': document})
+        return result
+    
+    def _finish_url(self, result: Dict):
+        """Grava o resultado de _scrape_url na fronteira"""
+        if not self.frontier or result['status'] in ('duplicate', 'resumed'):
+            return
+        if result['status'] == 'failed':
+            self.frontier.mark_failed(result['key'], 'conteúdo insuficiente')
+            return
+        if result['document'] is None:
+            # save_document falhou: nada foi para o disco nem para o JSONL, o --resume precisa refazer
+            self.frontier.mark_failed(result['key'], 'falha ao salvar')
+            return
+        self.frontier.mark_done(
+            result['key'],
+            result['document'],
+            etag=result.get('etag'),
+            last_modified=result.get('last_modified'),
+            content_hash=result.get('content_hash'),
+        )
+    
+    def write_changes_manifest(self, modules: List[str]) -> Path:
+        """Gera manifesto changed/added/removed para os indexadores"""
+        if self.frontier:
+            self.changes['removed'] = self.frontier.remove_stale(modules)
+        
+        manifest_file = Path("docs_changes.json")
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'incremental': self.incremental,
+                'modules': modules,
+                'added': self.changes['added'],
+                'changed': self.changes['changed'],
+                'removed': self.changes['removed'],
+                'unchanged_count': self.changes['unchanged'],
+            }, f, ensure_ascii=False, indent=2)
+        return manifest_file
+    
     async def scrape_module(self, module_name: str, base_url: str, page):
         """Scrapa um módulo completo"""
         print(f"\n{'='*90}")
@@ -946,6 +1639,11 @@ class SeniorDocScraper:
         all_links = await self.flatten_menu(menu)
         print(f"    [OK] {len(all_links)} paginas encontradas\n")
         
+        # Registrar URLs descobertas na fronteira persistente
+        if self.frontier:
+            discovered = [self.build_absolute_url(base_url, link['url']) for link in all_links]
+            self.frontier.add_discovered([self.canonicalize_madcap_hash(u) for u in discovered if u], module_name)
+        
         # Scraping
         print(f"[3] Scrapando paginas...")
         
@@ -964,73 +1662,100 @@ class SeniorDocScraper:
             # Usar o doc_type da tentativa anterior (armazenado no metadata)
             doc_type = self.metadata['statistics']['by_module'][module_name]['type']
             max_retries = 3 if doc_type == 'madcap' else 1  # MadCap pode precisar de mais tentativas
-            content = await self.scrape_page_with_retry(page, absolute_url, base_url, max_retries)
+            breadcrumb = [module_name] + link['breadcrumb']
             
             # Validação melhorada: conteúdo mínimo de 100 caracteres
             # (aumentado de 50 para evitar conteúdo lixo ou placeholders)
-            if content and content['total_chars'] >= 100:
-                breadcrumb = [module_name] + link['breadcrumb']
-                
-                # Salvar documento
-                save_result = await self.save_document(content, breadcrumb)
-                
-                # Adicionar aos documentos para JSONL
-                if save_result:
-                    self.documents.append({
-                        'title': content['title'],
-                        'url': absolute_url,
-                        'breadcrumb': breadcrumb,
-                        'text_content': content['text_content'],
-                        'total_chars': content['total_chars'],
-                        'headers': content['headers'],
-                        'paragraphs': content['paragraphs'],
-                        'lists': content['lists'],
-                        'links': content['links']
-                    })
-                    
-                    # Atualizar stats
-                    self.metadata['statistics']['by_module'][module_name]['pages'] += 1
-                    self.metadata['statistics']['by_module'][module_name]['total_chars'] += content['total_chars']
-                    self.metadata['statistics']['navigation_stats']['successful'] += 1
-                
+            result = await self._scrape_url(page, absolute_url, base_url, breadcrumb,
+                                            module_name, max_retries, min_chars=100)
+            
+            if result['status'] in ('duplicate', 'resumed'):
+                continue
+            
+            if result['status'] == 'failed':
+                self.metadata['statistics']['navigation_stats']['failed'] += 1
+                self._finish_url(result)
+                continue
+            
+            if result['status'] == 'not_modified':
+                # Página não foi carregada: usa as subpáginas conhecidas da execução anterior
+                sub_links = [
+                    {'absolute_url': child['url'], 'breadcrumb': child['breadcrumb']}
+                    for child in self.frontier.children(result['key'])
+                ]
+            else:
                 # NOVO: Extrair links de artigos (tabelas de funções, etc)
                 print(f"    [LINKS] Extraindo links do artigo...")
                 article_links = await self.extract_article_links(page, absolute_url)
-                
-                if article_links:
-                    print(f"    [LINKS] Encontrados {len(article_links)} links internos")
-                    for sub_link in article_links:
-                        # Construir breadcrumb para subpágina
-                        sub_breadcrumb = breadcrumb + [sub_link['text']]
-                        
-                        # Scraping da subpágina
-                        sub_content = await self.scrape_page_with_retry(page, sub_link['absolute_url'], base_url, max_retries=2)
-                        
-                        if sub_content and sub_content['total_chars'] >= 50:  # Requisito menor para subpáginas
-                            # Salvar subpágina
-                            sub_save_result = await self.save_document(sub_content, sub_breadcrumb)
-                            
-                            if sub_save_result:
-                                self.documents.append({
-                                    'title': sub_content['title'],
-                                    'url': sub_link['absolute_url'],
-                                    'breadcrumb': sub_breadcrumb,
-                                    'text_content': sub_content['text_content'],
-                                    'total_chars': sub_content['total_chars'],
-                                    'headers': sub_content['headers'],
-                                    'paragraphs': sub_content['paragraphs'],
-                                    'lists': sub_content['lists'],
-                                    'links': sub_content['links']
-                                })
-                                
-                                self.metadata['statistics']['by_module'][module_name]['pages'] += 1
-                                self.metadata['statistics']['by_module'][module_name]['total_chars'] += sub_content['total_chars']
-                                self.metadata['statistics']['navigation_stats']['successful'] += 1
-            else:
-                self.metadata['statistics']['navigation_stats']['failed'] += 1
+                sub_links = [
+                    {'absolute_url': l['absolute_url'], 'breadcrumb': breadcrumb + [l['text']]}
+                    for l in article_links
+                ]
+                if sub_links:
+                    print(f"    [LINKS] Encontrados {len(sub_links)} links internos")
+                    if self.frontier:
+                        self.frontier.add_discovered(
+                            [self.canonicalize_madcap_hash(l['absolute_url']) for l in sub_links],
+                            module_name, parent_url=result['key']
+                        )
+            
+            for sub_link in sub_links:
+                sub_url = sub_link['absolute_url']
+                # Requisito menor para subpáginas
+                sub_result = await self._scrape_url(page, sub_url, base_url, sub_link['breadcrumb'],
+                                                    module_name, max_retries=2, min_chars=50,
+                                                    parent_url=result['key'])
+                self._finish_url(sub_result)
+            
+            # A página só é concluída depois das subpáginas, para que um resume
+            # volte a ela e continue as subpáginas que faltaram
+            self._finish_url(result)
         
         print(f"    [OK] Completo\n")
     
+    async def discover_urls(self, modules: List[Tuple[str, str]]) -> List[str]:
+        """
+        URLs das páginas do menu de cada módulo, sem scrapear o conteúdo.
+        
+        Usado pelo orchestrator multi-worker para distribuir as páginas
+        entre os workers (infra/docker/docker_entrypoint_workers.py).
+        """
+        from playwright.async_api import async_playwright
+        
+        urls: List[str] = []
+        seen = set()
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page(viewport={"width": 1920, "height": 1080})
+            try:
+                for module_name, base_url in modules:
+                    if not base_url or base_url.strip() == '':
+                        print(f"[AVISO] URL vazia para {module_name}, pulando...")
+                        continue
+                    try:
+                        await page.goto(base_url, wait_until="networkidle", timeout=30000)
+                        await asyncio.sleep(2)
+                        if await self.detect_doc_type(page) == 'astro':
+                            menu = await self.extract_astro_menu(page)
+                        else:
+                            menu = await self.extract_madcap_seções(page)
+                    except Exception as e:
+                        print(f"[AVISO] Falha ao ler o menu de {module_name}: {e}")
+                        continue
+                    
+                    found = 0
+                    for link in await self.flatten_menu(menu):
+                        url = self.build_absolute_url(base_url, link['url'])
+                        key = self.canonicalize_madcap_hash(url) if url else None
+                        if key and key not in seen:
+                            seen.add(key)
+                            urls.append(url)
+                            found += 1
+                    print(f"[OK] {module_name}: {found} paginas")
+            finally:
+                await browser.close()
+        return urls
+    
     async def run(self, modules: Optional[List[Tuple[str, str]]] = None):
         """Executa scraping para múltiplos módulos ou descobre automaticamente"""
         try:
@@ -1040,82 +1765,150 @@ class SeniorDocScraper:
             subprocess.run([sys.executable, "-m", "pip", "install", "-q", "playwright"], check=True)
             from playwright.async_api import async_playwright
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page(viewport={"width": 1920, "height": 1080})
+        # Fronteira persistente (checkpoint/resume)
+        self.frontier = CrawlFrontier(self.frontier_path)
+        self.frontier.start(resume=self.resume)
+        
+        # A fronteira marca URLs como concluídas antes de o writer gravar os arquivos:
+        # mesmo em erro/Ctrl-C o writer precisa drenar a fila, senão --resume pularia
+        # páginas que nunca chegaram ao disco
+        try:
+            if self.resume:
+                # Documentos concluídos em execuções anteriores entram direto no JSONL
+                for document in self.frontier.done_documents():
+                    self.sink.write(self.index_document(document))
+                print(f"\n[RESUME] {self.sink.count} documentos recuperados de {self.frontier_path}")
+            
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                page = await browser.new_page(viewport={"width": 1920, "height": 1080})
+                if self.asset_cache:
+                    await self.asset_cache.attach(page)
+                if self.incremental:
+                    page.on("response", self._remember_validators)
+                
+                print("\n" + "="*90)
+                print("[SCRAPER UNIFICADO] Senior Documentation")
+                print("="*90)
+                
+                for module_name, base_url in modules:
+                    if not base_url or base_url.strip() == '':
+                        print(f"\n[AVISO] URL vazia para {module_name}, pulando...")
+                        continue
+                        
+                    await self.scrape_module(module_name, base_url, page)
+                
+                await browser.close()
+            
+            if self.asset_cache:
+                stats = self.asset_cache.get_stats()
+                print(f"\n[CACHE] {stats['hits']} hits | {stats['revalidated']} revalidados | "
+                      f"{stats['misses']} misses | {stats['size_bytes'] / 1024 / 1024:.1f} MB em disco")
+                self.asset_cache.close()
+            
+            # Barreira: todos os arquivos de docs_estruturado/ gravados antes dos relatórios
+            self.writer.close()
+            if self.writer.errors:
+                print(f"\n[AVISO] {self.writer.errors} documentos não puderam ser gravados em {self.output_dir}/")
+            
+            # Manifesto de mudanças (consumido pelos indexadores)
+            processed_modules = [name for name, url in modules if url and url.strip()]
+            changes_file = self.write_changes_manifest(processed_modules)
+            print(f"\n[MUDANÇAS] {len(self.changes['added'])} novas | "
+                  f"{len(self.changes['changed'])} alteradas | "
+                  f"{self.changes['unchanged']} inalteradas | "
+                  f"{len(self.changes['removed'])} removidas -> {changes_file}")
+            
+            # Gerar JSONL
+            print(f"\n[4] Gerando arquivo JSONL para indexação...")
+            jsonl_file = self.generate_jsonl()
+            print(f"    [OK] {jsonl_file}")
+            print(f"    [OK] {self.sink.count} documentos\n")
+            
+            # Atualizar stats (agregadas pelo sink durante a escrita)
+            self.metadata['statistics']['total_pages'] = self.sink.count
+            self.metadata['statistics']['total_chars'] = self.sink.total_chars
+            self.metadata['output_jsonl'] = str(jsonl_file)
             
-            print("\n" + "="*90)
-            print("[SCRAPER UNIFICADO] Senior Documentation")
+            # Salvar metadata
+            meta_file = Path("docs_metadata.json")
+            with open(meta_file, 'w', encoding='utf-8') as f:
+                json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+            
+            # Resumo final
             print("="*90)
+            print("[RESULTADO FINAL]")
+            print("="*90)
+            print(f"\n[INFO] Documentos salvos em: {self.output_dir}/")
+            print(f"[INFO] Total de paginas: {self.metadata['statistics']['total_pages']}")
+            print(f"[INFO] Total de conteudo: {self.metadata['statistics']['total_chars']:,} caracteres")
+            print(f"[INFO] Arquivo JSONL: {jsonl_file}")
+            print(f"[INFO] Metadados: {meta_file}\n")
             
-            for module_name, base_url in modules:
-                if not base_url or base_url.strip() == '':
-                    print(f"\n[AVISO] URL vazia para {module_name}, pulando...")
-                    continue
-                    
-                await self.scrape_module(module_name, base_url, page)
+            print("[NAVEGACAO]")
+            nav_stats = self.metadata['statistics']['navigation_stats']
+            print(f"  Bem-sucedidas: {nav_stats['successful']}")
+            print(f"  Falhadas: {nav_stats['failed']}")
+            print(f"  Puladas: {nav_stats['skipped']}")
+            print(f"  Retomadas (resume): {nav_stats['resumed']}")
+            print(f"  Não modificadas (304): {nav_stats['not_modified']}")
+            print(f"  Deduplicadas: {nav_stats['deduplicated']}\n")
             
-            await browser.close()
-        
-        # Gerar JSONL
-        print(f"\n[4] Gerando arquivo JSONL para indexação...")
-        jsonl_file = self.generate_jsonl()
-        print(f"    [OK] {jsonl_file}")
-        print(f"    [OK] {len(self.documents)} documentos\n")
-        
-        # Atualizar stats
-        self.metadata['statistics']['total_pages'] = len(self.documents)
-        self.metadata['statistics']['total_chars'] = sum(d['total_chars'] for d in self.documents)
-        self.metadata['output_jsonl'] = str(jsonl_file)
-        
-        # Salvar metadata
-        meta_file = Path("docs_metadata.json")
-        with open(meta_file, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
-        
-        # Resumo final
-        print("="*90)
-        print("[RESULTADO FINAL]")
-        print("="*90)
-        print(f"\n[INFO] Documentos salvos em: {self.output_dir}/")
-        print(f"[INFO] Total de paginas: {self.metadata['statistics']['total_pages']}")
-        print(f"[INFO] Total de conteudo: {self.metadata['statistics']['total_chars']:,} caracteres")
-        print(f"[INFO] Arquivo JSONL: {jsonl_file}")
-        print(f"[INFO] Metadados: {meta_file}\n")
-        
-        print("[NAVEGACAO]")
-        nav_stats = self.metadata['statistics']['navigation_stats']
-        print(f"  Bem-sucedidas: {nav_stats['successful']}")
-        print(f"  Falhadas: {nav_stats['failed']}")
-        print(f"  Puladas: {nav_stats['skipped']}\n")
-        
-        print("[MODULOS PROCESSADOS]")
-        for mod_name, stats in self.metadata['statistics']['by_module'].items():
-            print(f"  - {mod_name}: {stats['pages']} paginas | {stats['total_chars']:,} chars ({stats['type']})")
-        
-        print("\n" + "="*90 + "\n")
+            if self.rate_limiter:
+                print("[RATE LIMIT]")
+                for host, stats in self.rate_limiter.get_stats().items():
+                    print(f"  {host}: {stats['requests']} requisições | "
+                          f"{stats['throttled']} throttled | {stats['errors']} erros")
+                print()
+            
+            print("[FRONTEIRA]")
+            for status, count in sorted(self.frontier.counts().items()):
+                print(f"  {status}: {count}")
+            print()
+            
+            print("[MODULOS PROCESSADOS]")
+            for mod_name, stats in self.metadata['statistics']['by_module'].items():
+                print(f"  - {mod_name}: {stats['pages']} paginas | {stats['total_chars']:,} chars ({stats['type']})")
+            
+            print("\n" + "="*90 + "\n")
+        finally:
+            self.writer.close()
+            self.frontier.close()
 
 
-async def main():
-    import sys
-    save_html = "--save-html" in sys.argv or "--save_html" in sys.argv
-    scraper = SeniorDocScraper(save_html=save_html)
-    
-    # Tentar carregar módulos descobertos
-    modulos_file = Path("modulos_descobertos.json")
+def load_modules(modulos_file: Path = Path("modulos_descobertos.json")) -> List[Tuple[str, str]]:
+    """Módulos (nome, URL base) descobertos; fallback fixo se o arquivo não existe"""
     if modulos_file.exists():
         with open(modulos_file, 'r', encoding='utf-8') as f:
             modulos_dict = json.load(f)
-            modules = [(name, info['url']) for name, info in modulos_dict.items()]
-    else:
-        # Fallback se arquivo não existe
-        modules = [
-            ("Gestão de Relacionamento CRM", "https://documentacao.senior.com.br/gestao-de-relacionamento-crm/6.2.4/"),
-            ("Tecnologia", "https://documentacao.senior.com.br/tecnologia/5.10.4/"),
-        ]
+            return [(name, info['url']) for name, info in modulos_dict.items()]
+    return [
+        ("Gestão de Relacionamento CRM", "https://documentacao.senior.com.br/gestao-de-relacionamento-crm/6.2.4/"),
+        ("Tecnologia", "https://documentacao.senior.com.br/tecnologia/5.10.4/"),
+    ]
+
+
+async def main():
+    import sys
+    save_html = "--save-html" in sys.argv or "--save_html" in sys.argv
+    resume = "--resume" in sys.argv
+    incremental = "--incremental" in sys.argv
+    compress_html = "--compress-html" in sys.argv
+    profile = None
+    asset_cache_dir = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--profile="):
+            profile = arg.split("=", 1)[1]
+        elif arg == "--asset-cache":
+            asset_cache_dir = Path("data") / "asset_cache"
+        elif arg.startswith("--asset-cache="):
+            asset_cache_dir = Path(arg.split("=", 1)[1])
+    scraper = SeniorDocScraper(save_html=save_html, resume=resume, incremental=incremental,
+                               profile=profile, asset_cache_dir=asset_cache_dir,
+                               compress_html=compress_html)
     
     # Executar com os módulos carregados
-    await scraper.run(modules=modules)
+    await scraper.run(modules=load_modules())
 
 
 if __name__ == "__main__":
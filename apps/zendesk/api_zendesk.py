@@ -15,6 +15,17 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, AsyncIterator
 from dataclasses import dataclass, asdict
 import hashlib
+import sys
+
+# Permite importar libs/ quando executado como script
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+try:
+    from libs.scrapers.adapters.adaptive_host_limiter import AdaptiveHostLimiter
+except ImportError:
+    AdaptiveHostLimiter = None
 
 
 @dataclass
@@ -68,14 +79,17 @@ class ZendeskSection:
 class ZendeskAPIClient:
     """Cliente para API Zendesk Help Center"""
     
-    def __init__(self, base_url: str = "https://suporte.senior.com.br/api/v2/help_center"):
+    def __init__(self, base_url: str = "https://suporte.senior.com.br/api/v2/help_center",
+                 rate_limiter=None):
         """
         Inicializa cliente Zendesk
         
         Args:
             base_url: URL base da API (sem barra final)
+            rate_limiter: Limitador por host (IRateLimiter) compartilhado, opcional
         """
         self.base_url = base_url.rstrip('/')
+        self.rate_limiter = rate_limiter
         self.session: Optional[aiohttp.ClientSession] = None
         self.timeout = aiohttp.ClientTimeout(total=30)
         self.default_locale = "pt-br"
@@ -117,12 +131,24 @@ class ZendeskAPIClient:
         self.stats['api_calls'] += 1
         
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    self.stats['errors'] += 1
-                    return {'error': f"Status {response.status}", 'url': url}
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(url)
+            started = asyncio.get_running_loop().time()
+            status, retry_after = None, None
+            try:
+                async with self.session.get(url, params=params) as response:
+                    status, retry_after = response.status, response.headers.get('Retry-After')
+                    if response.status == 200:
+                        return await response.json()
+                    else:
+                        self.stats['errors'] += 1
+                        return {'error': f"Status {response.status}", 'url': url}
+            finally:
+                if self.rate_limiter:
+                    await self.rate_limiter.release(
+                        url, status=status, retry_after=retry_after, error=status is None,
+                        latency=asyncio.get_running_loop().time() - started
+                    )
         except Exception as e:
             self.stats['errors'] += 1
             print(f"❌ Erro ao fazer request para {url}: {e}")
@@ -311,7 +337,8 @@ class ZendeskScraper:
     def __init__(self, 
                  api_url: str = "https://suporte.senior.com.br/api/v2/help_center",
                  output_dir: str = "docs_zendesk"):
-        self.client = ZendeskAPIClient(api_url)
+        rate_limiter = AdaptiveHostLimiter() if AdaptiveHostLimiter else None
+        self.client = ZendeskAPIClient(api_url, rate_limiter=rate_limiter)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.documents: List[Dict[str, Any]] = []
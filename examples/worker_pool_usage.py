@@ -8,21 +8,22 @@ import asyncio
 import logging
 from typing import List
 
-from libs.scrapers.adapters.playwright_worker_pool import PlaywrightWorkerPool
+from playwright.async_api import Page
+
+from libs.scrapers.adapters.playwright_worker_pool import PlaywrightWorkerPool, toc_first_priority
 from libs.scrapers.domain import Document, DocumentSource, DocumentType
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def scrape_url_with_worker(url: str, worker_id: int, pool: PlaywrightWorkerPool) -> Document:
+async def scrape_url_with_worker(url: str, worker_id: int, page: Page) -> Document:
     """
     Função worker que scrapa uma URL e retorna um Document.
     
-    Esta função é executada dentro de um worker do pool.
+    Esta função é executada dentro de um worker do pool, com a página
+    emprestada pelo pool durante o processamento da URL.
     """
-    page = pool.pages[worker_id]
-    
     try:
         # Navegar para a URL
         await page.goto(url, wait_until="networkidle", timeout=30000)
@@ -73,7 +74,7 @@ async def main_example_basic():
         # Processar URLs em paralelo
         results = await pool.process_urls(
             urls,
-            worker_func=lambda url, worker_id: scrape_url_with_worker(url, worker_id, pool),
+            worker_func=scrape_url_with_worker,
             show_progress=True
         )
         
@@ -111,7 +112,7 @@ async def main_example_with_retry():
         # Processar com até 3 tentativas
         results = await pool.process_urls_with_retry(
             urls,
-            worker_func=lambda url, worker_id: scrape_url_with_worker(url, worker_id, pool),
+            worker_func=scrape_url_with_worker,
             max_retries=3,
             show_progress=True
         )
@@ -137,7 +138,7 @@ async def main_example_monitoring():
         
         results = await pool.process_urls(
             urls,
-            worker_func=lambda url, worker_id: scrape_url_with_worker(url, worker_id, pool),
+            worker_func=scrape_url_with_worker,
             show_progress=True
         )
         
@@ -159,10 +160,48 @@ async def main_example_monitoring():
         await pool.close()
 
 
+async def main_example_modules():
+    """Exemplo com vários módulos no mesmo pool, páginas TOC primeiro"""
+    
+    pool = PlaywrightWorkerPool(headless=True)
+    
+    try:
+        await pool.initialize(num_workers=4)
+        
+        modules = {
+            "bpm": [
+                "https://documentacao.senior.com.br/bpm/6.0/#processos/tarefas.htm",
+                "https://documentacao.senior.com.br/bpm/6.0/",
+            ],
+            "gestaoempresarialerp": [
+                "https://documentacao.senior.com.br/gestaoempresarialerp/5.10.4/#financas/titulos.htm",
+                "https://documentacao.senior.com.br/gestaoempresarialerp/5.10.4/",
+            ],
+        }
+        
+        # Cada chamada tem sua fila; as 4 páginas são divididas entre os módulos
+        all_results = await asyncio.gather(*[
+            pool.process_urls(
+                urls,
+                worker_func=scrape_url_with_worker,
+                show_progress=False,
+                priority=toc_first_priority
+            )
+            for urls in modules.values()
+        ])
+        
+        for module, results in zip(modules, all_results):
+            logger.info(f"{module}: {sum(1 for r in results if r.success)}/{len(results)} successful")
+        
+    finally:
+        await pool.close()
+
+
 if __name__ == "__main__":
     # Descomentar para rodar exemplos
     # asyncio.run(main_example_basic())
     # asyncio.run(main_example_with_retry())
     # asyncio.run(main_example_monitoring())
+    # asyncio.run(main_example_modules())
     
     print("✅ Worker pool examples loaded. Uncomment to run.")
@@ -52,27 +52,61 @@ async def run_orchestrator():
     
     try:
         from libs.scrapers.adapters.docker_worker_orchestrator import DockerWorkerOrchestrator
-        from apps.scraper.scraper_unificado import ScraperUnificado
+        from libs.scrapers.adapters.filesystem_repository import FileSystemRepository
+        from libs.scrapers.domain import Document
+        from apps.scraper.scraper_unificado import SeniorDocScraper, load_modules
         import json
         
         num_workers = int(os.getenv("NUM_WORKERS", "3"))
         
         logger.info(f"Iniciando orchestrator com {num_workers} workers")
         
-        orchestrator = DockerWorkerOrchestrator()
+        orchestrator = DockerWorkerOrchestrator(
+            queue_port=int(os.getenv("WORKER_QUEUE_PORT", "8001")),
+            batch_size=int(os.getenv("WORKER_BATCH_SIZE", "10")),
+        )
+        
+        # Servidor da fila precisa estar no ar antes dos workers
+        await orchestrator.start_queue_server()
         
         # Escalar workers
         workers = await orchestrator.scale_workers(num_workers)
         logger.info(f"✅ {len(workers)} workers escalados")
         
-        # Executar scraper e distribuir URLs
-        logger.info("Iniciando scraper para distribuir URLs...")
+        # Descobrir as páginas dos módulos e distribuí-las na fila
+        logger.info("Descobrindo URLs dos módulos para distribuir...")
         
-        scraper = ScraperUnificado(config_path="apps/scraper/config/scraper_config.json")
+        scraper = SeniorDocScraper()
+        urls = await scraper.discover_urls(load_modules())
+        await orchestrator.distribute_urls(urls)
+        await orchestrator.close_input()
+        logger.info(f"📤 {len(urls)} URLs enfileiradas")
         
-        # Aguardar workers processarem
+        # Aguardar workers esvaziarem a fila (ack/nack de todas as URLs)
         logger.info("⏳ Aguardando processamento dos workers...")
-        await asyncio.sleep(300)  # 5 minutos
+        timeout = float(os.getenv("ORCHESTRATOR_TIMEOUT", "300"))
+        if not await orchestrator.wait_for_completion(timeout=timeout):
+            logger.warning(f"⚠️ Fila não esvaziou em {timeout:.0f}s")
+        
+        results = orchestrator.collect_results()
+        logger.info(f"📥 {len(results)} resultados recebidos dos workers")
+        
+        # Persistir os documentos devolvidos no ack (Document.to_dict() de cada URL)
+        documents = []
+        for item, payload in results:
+            try:
+                documents.append(Document.from_dict(payload))
+            except Exception as e:
+                logger.warning(f"⚠️ Resultado inválido para {item.url}: {e}")
+        repository = FileSystemRepository(
+            base_dir=os.getenv("ORCHESTRATOR_OUTPUT_DIR", "data/scraped/estruturado"),
+            encoding="compact",
+        )
+        try:
+            await repository.save_many(documents)
+        finally:
+            repository.close()
+        logger.info(f"💾 {len(documents)} documentos salvos em {repository.base_dir}")
         
         # Coletar estatísticas
         stats = await orchestrator.get_worker_stats()
@@ -80,6 +114,7 @@ async def run_orchestrator():
         
         # Cleanup
         await orchestrator.cleanup()
+        await orchestrator.stop_queue_server()
         
         logger.info("✅ ORCHESTRATOR completado com sucesso")
         
@@ -93,36 +128,56 @@ async def run_worker():
     logger.info("👷 Iniciando WORKER mode")
     
     try:
+        from libs.scrapers.adapters.lease_work_queue import run_queue_worker
+        from libs.scrapers.adapters.multiprocess_coordinator import page_document_worker
+        from libs.scrapers.adapters.playwright_worker_pool import PlaywrightWorkerPool
+        from libs.scrapers.adapters.work_queue_server import WorkQueueClient
+        from libs.scrapers.domain import Document
+        
         worker_id = int(os.getenv("WORKER_ID", "0"))
+        worker_name = os.getenv("WORKER_NAME", f"worker-{worker_id}")
         queue_host = os.getenv("WORKER_QUEUE_HOST", "localhost")
         queue_port = int(os.getenv("WORKER_QUEUE_PORT", "8001"))
+        batch_size = int(os.getenv("WORKER_BATCH_SIZE", "10"))
+        num_pages = int(os.getenv("WORKER_PAGES", "3"))
         
         logger.info(f"Worker {worker_id} conectando a {queue_host}:{queue_port}")
         
+        client = WorkQueueClient(f"http://{queue_host}:{queue_port}")
+        
         # Aguardar orchestrator
         for attempt in range(30):
-            try:
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    resp = await client.get(f"http://{queue_host}:{queue_port}/health", timeout=5)
-                    if resp.status_code == 200:
-                        logger.info("✅ Orchestrator disponível")
-                        break
-            except Exception:
-                pass
+            if await client.health():
+                logger.info("✅ Orchestrator disponível")
+                break
             
             wait_time = min(2 ** attempt, 10)
             logger.info(f"Aguardando orchestrator... (tentativa {attempt+1}/30)")
             await asyncio.sleep(wait_time)
         
-        # Processar URLs da fila
+        pool = PlaywrightWorkerPool(headless=True)
+        await pool.initialize(num_pages)
+        page_worker = page_document_worker(pool)
+        
+        async def process_batch(urls):
+            """Scrapa o lote com o pool; documentos voltam no ack"""
+            results = await pool.process_urls(urls, page_worker, show_progress=False, pass_page=True)
+            return {
+                r.url: (True, r.result.to_dict() if isinstance(r.result, Document) else r.result)
+                if r.success else (False, r.error)
+                for r in results
+            }
+        
+        # Processar URLs da fila até o orchestrator informar que esvaziou
         logger.info(f"Worker {worker_id} aguardando URLs da fila...")
         
-        # TODO: Implementar polling de URLs do orchestrator
-        # Por enquanto, apenas aguarda (será implementado com API REST)
-        await asyncio.sleep(float('inf'))
+        try:
+            stats = await run_queue_worker(client, worker_name, process_batch, batch_size=batch_size)
+        finally:
+            await pool.close()
+            await client.close()
         
-        logger.info("✅ WORKER completado")
+        logger.info(f"✅ WORKER completado: {stats}")
         
     except Exception as e:
         logger.error(f"❌ Erro no WORKER: {e}", exc_info=True)
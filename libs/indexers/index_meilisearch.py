@@ -25,6 +25,13 @@ import sys
 from urllib.parse import urljoin
 import meilisearch
 
+# Permite importar libs/ quando executado como script
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from libs.scrapers.adapters.field_compression import find_output_file
+
 
 class MeilisearchIndexer:
     """Indexador para Meilisearch"""
@@ -141,9 +148,8 @@ class MeilisearchIndexer:
                         with open(content_file, 'r', encoding='utf-8') as f:
                             content = f.read()
                     
-                    # Verificar se tem HTML
-                    html_file = doc_path.parent / "page.html"
-                    has_html = html_file.exists()
+                    # Verificar se tem HTML (page.html pode estar comprimido: --compress-html)
+                    has_html = find_output_file(doc_path.parent / "page.html") is not None
                     
                     # Extrair texto sem headers
                     content_clean = content.split("---\n\n", 1)[-1] if "---" in content else content
@@ -8,24 +8,55 @@ Adapters disponíveis:
 - PlaywrightExtractor: Extração de conteúdo web usando Playwright
 - UrlResolver: Manipulação de URLs usando urllib
 - FileSystemRepository: Persistência em sistema de arquivos
+- SqliteDocumentRepository: Persistência indexada em SQLite
+- SegmentDocumentRepository: Persistência em segmentos append-only com índice de offsets
 - SeniorDocAdapter: Scraper para documentação Senior (MadCap + Astro)
 - ZendeskAdapter: Scraper para Zendesk Help Center
+- AdaptiveHostLimiter: Rate limit + concorrência adaptativa por host
+- MultiprocessScrapeCoordinator: Scraping em K processos (um Chromium por processo)
+- LeaseWorkQueue / WorkQueueServer / WorkQueueClient: Fila de trabalho com lease para workers
+- ConsistentHashRing: Afinidade de URLs por módulo/versão entre workers
+- AssetCache: Cache em disco de CSS/JS/imagens via interceptação de rotas
+- FieldCompressor: Compressão zstd/gzip (dicionário por módulo) de campos grandes
 """
 
 from libs.scrapers.adapters.playwright_extractor import PlaywrightExtractor
 from libs.scrapers.adapters.url_resolver import UrlResolver
+from libs.scrapers.adapters.asset_cache import AssetCache
+from libs.scrapers.adapters.field_compression import CompressionError, FieldCompressor
 from libs.scrapers.adapters.filesystem_repository import FileSystemRepository
+from libs.scrapers.adapters.sqlite_repository import SqliteDocumentRepository
+from libs.scrapers.adapters.segment_repository import SegmentDocumentRepository
 from libs.scrapers.adapters.senior_doc_adapter import SeniorDocAdapter
 from libs.scrapers.adapters.zendesk_adapter import ZendeskAdapter
 from libs.scrapers.adapters.playwright_worker_pool import PlaywrightWorkerPool
 from libs.scrapers.adapters.docker_worker_orchestrator import DockerWorkerOrchestrator
+from libs.scrapers.adapters.adaptive_host_limiter import AdaptiveHostLimiter
+from libs.scrapers.adapters.multiprocess_coordinator import MultiprocessScrapeCoordinator
+from libs.scrapers.adapters.consistent_hash import ConsistentHashRing, module_shard_key, shard_urls_by_key
+from libs.scrapers.adapters.lease_work_queue import LeaseWorkQueue, run_queue_worker
+from libs.scrapers.adapters.work_queue_server import WorkQueueServer, WorkQueueClient
 
 __all__ = [
     "PlaywrightExtractor",
     "UrlResolver",
+    "AssetCache",
+    "CompressionError",
+    "FieldCompressor",
     "FileSystemRepository",
+    "SqliteDocumentRepository",
+    "SegmentDocumentRepository",
     "SeniorDocAdapter",
     "ZendeskAdapter",
     "PlaywrightWorkerPool",
     "DockerWorkerOrchestrator",
+    "AdaptiveHostLimiter",
+    "MultiprocessScrapeCoordinator",
+    "ConsistentHashRing",
+    "module_shard_key",
+    "shard_urls_by_key",
+    "LeaseWorkQueue",
+    "run_queue_worker",
+    "WorkQueueServer",
+    "WorkQueueClient",
 ]
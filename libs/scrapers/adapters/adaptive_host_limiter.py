@@ -0,0 +1,235 @@
+"""
+Adapter - Adaptive Host Limiter
+
+Implementação de IRateLimiter com controle por host:
+- Token bucket para limitar requisições por segundo
+- Janela de concorrência AIMD (aumento aditivo, redução multiplicativa)
+  guiada por latência observada e respostas 429/5xx
+- Respeita Retry-After, pausando o host inteiro
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from libs.scrapers.ports.rate_limiter import IRateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _HostState:
+    """Estado de controle de um host"""
+    tokens: float
+    window: float
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+    last_refill: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    blocked_until: float = 0.0
+    last_decrease: float = 0.0
+    latency_ewma: Optional[float] = None
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+
+
+class AdaptiveHostLimiter(IRateLimiter):
+    """
+    Limitador adaptativo compartilhado entre scrapers.
+    
+    Cada host tem seu próprio bucket e janela de concorrência. Sucessos
+    rápidos aumentam a janela em +increase_step por janela completa;
+    429, 5xx, erros de conexão ou latência acima do alvo reduzem a janela
+    pelo decrease_factor (no máximo uma vez por intervalo de latência alvo,
+    para que uma rajada de falhas não derrube a janela para o mínimo).
+    """
+    
+    def __init__(
+        self,
+        requests_per_second: float = 5.0,
+        burst: int = 10,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        latency_target: float = 3.0,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        default_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+    ):
+        """
+        Inicializa limitador.
+        
+        Args:
+            requests_per_second: Taxa sustentada por host
+            burst: Tamanho do bucket (requisições em rajada)
+            initial_concurrency: Janela inicial de requisições simultâneas
+            min_concurrency: Janela mínima
+            max_concurrency: Janela máxima
+            latency_target: Latência (s) acima da qual o host é considerado lento
+            increase_step: Aumento da janela a cada janela completa de sucessos
+            decrease_factor: Fator multiplicativo de redução da janela
+            default_backoff: Pausa (s) após 429 sem Retry-After
+            max_backoff: Pausa máxima (s) aceita de um Retry-After
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if not 1 <= min_concurrency <= initial_concurrency <= max_concurrency:
+            raise ValueError("expected 1 <= min_concurrency <= initial_concurrency <= max_concurrency")
+        
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.default_backoff = default_backoff
+        self.max_backoff = max_backoff
+        
+        self._hosts: Dict[str, _HostState] = {}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "AdaptiveHostLimiter":
+        """Cria limitador a partir de um dict de configuração (ex: seção rate_limit)"""
+        return cls(
+            requests_per_second=config.get("requests_per_second", 5.0),
+            burst=config.get("burst", 10),
+            initial_concurrency=config.get("initial_concurrency", 4),
+            min_concurrency=config.get("min_concurrency", 1),
+            max_concurrency=config.get("max_concurrency", 16),
+            latency_target=config.get("latency_target_ms", 3000) / 1000,
+            default_backoff=config.get("default_backoff_ms", 5000) / 1000,
+        )
+    
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Chave do host (netloc em minúsculas)"""
+        return urlparse(url).netloc.lower() or url
+    
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Converte Retry-After (segundos ou data HTTP) em segundos de espera"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    
+    def _state(self, url: str) -> _HostState:
+        host = self.host_key(url)
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(tokens=float(self.burst), window=float(self.initial_concurrency))
+            self._hosts[host] = state
+        return state
+    
+    def _refill(self, state: _HostState, now: float) -> None:
+        elapsed = now - state.last_refill
+        state.tokens = min(float(self.burst), state.tokens + elapsed * self.requests_per_second)
+        state.last_refill = now
+    
+    async def acquire(self, url: str) -> None:
+        """Aguarda vaga na janela, fim de Retry-After e token disponível"""
+        state = self._state(url)
+        while True:
+            async with state.condition:
+                await state.condition.wait_for(lambda: state.in_flight < int(state.window))
+                now = time.monotonic()
+                delay = state.blocked_until - now
+                if delay <= 0:
+                    self._refill(state, now)
+                    if state.tokens >= 1:
+                        state.tokens -= 1
+                        state.in_flight += 1
+                        state.requests += 1
+                        return
+                    delay = (1 - state.tokens) / self.requests_per_second
+            await asyncio.sleep(delay)
+    
+    async def release(
+        self,
+        url: str,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        retry_after: Optional[str] = None,
+        error: bool = False,
+    ) -> None:
+        """Libera a vaga e ajusta a janela conforme o resultado"""
+        state = self._state(url)
+        async with state.condition:
+            state.in_flight = max(0, state.in_flight - 1)
+            now = time.monotonic()
+            
+            if latency is not None:
+                state.latency_ewma = (
+                    latency if state.latency_ewma is None
+                    else 0.8 * state.latency_ewma + 0.2 * latency
+                )
+            
+            throttled = status == 429 or status == 503
+            failed = error or (status is not None and status >= 500)
+            slow = latency is not None and latency > self.latency_target
+            
+            if throttled or failed or slow:
+                if throttled:
+                    state.throttled += 1
+                if failed:
+                    state.errors += 1
+                self._decrease(state, now)
+            else:
+                state.window = min(
+                    float(self.max_concurrency),
+                    state.window + self.increase_step / state.window,
+                )
+            
+            wait = self.parse_retry_after(retry_after)
+            if wait is None and status == 429:
+                wait = self.default_backoff
+            if wait:
+                wait = min(wait, self.max_backoff)
+                state.blocked_until = max(state.blocked_until, now + wait)
+                logger.warning(f"Host {self.host_key(url)} throttled, pausing {wait:.1f}s")
+            
+            state.condition.notify_all()
+    
+    def _decrease(self, state: _HostState, now: float) -> None:
+        if now - state.last_decrease < self.latency_target:
+            return
+        state.window = max(float(self.min_concurrency), state.window * self.decrease_factor)
+        state.last_decrease = now
+    
+    def get_concurrency(self, url: str) -> int:
+        """Retorna janela de concorrência atual do host"""
+        return int(self._state(url).window)
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna estatísticas por host"""
+        return {
+            host: {
+                "window": round(state.window, 2),
+                "in_flight": state.in_flight,
+                "tokens": round(state.tokens, 2),
+                "latency_ewma": state.latency_ewma,
+                "requests": state.requests,
+                "throttled": state.throttled,
+                "errors": state.errors,
+            }
+            for host, state in self._hosts.items()
+        }
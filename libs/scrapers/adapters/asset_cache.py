@@ -0,0 +1,294 @@
+"""
+Adapter - Playwright Asset Cache
+
+Cache em disco de assets estáticos (CSS, JS, imagens, fontes, chunks de
+TOC do MadCap) servido por interceptação de rotas do Playwright.
+
+- Conteúdo endereçado por SHA-256 (blobs/ab/abcdef...), índice em SQLite
+- Frescor por Cache-Control max-age (ou TTL padrão); vencido, revalida
+  com If-None-Match/If-Modified-Since e reaproveita o blob em 304
+- Limite de tamanho com despejo LRU
+- Compartilhado entre contextos, workers, processos e execuções (opt-in)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_RESOURCE_TYPES = ("stylesheet", "script", "image", "font")
+CACHEABLE_EXTENSIONS = (
+    ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico",
+    ".woff", ".woff2", ".ttf", ".eot", ".xml", ".json",
+)
+# Headers de resposta que não fazem sentido ao servir o corpo já decodificado
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class AssetCache:
+    """
+    Cache de assets para contextos/páginas Playwright.
+    
+    Uso:
+        cache = AssetCache("data/asset_cache")
+        await cache.attach(context)   # ou page
+        ...
+        cache.close()
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Path = Path("data") / "asset_cache",
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 24 * 3600,
+    ):
+        """
+        Inicializa cache.
+        
+        Args:
+            cache_dir: Diretório do índice e dos blobs
+            max_bytes: Tamanho máximo dos blobs antes do despejo LRU
+            default_ttl: Frescor (s) quando a resposta não traz max-age
+        """
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "index.sqlite3"), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS assets (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_assets_access ON assets(last_access)")
+        self._conn.commit()
+        
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0, "bypassed": 0}
+    
+    async def attach(self, target: Any) -> None:
+        """Intercepta requisições de um BrowserContext ou Page"""
+        await target.route("**/*", self.handle_route)
+    
+    @staticmethod
+    def is_cacheable(request: Any) -> bool:
+        """Só GET de assets estáticos; documentos HTML sempre vão à rede"""
+        if request.method != "GET" or not request.url.startswith("http"):
+            return False
+        if request.resource_type in CACHEABLE_RESOURCE_TYPES:
+            return True
+        return urlparse(request.url).path.lower().endswith(CACHEABLE_EXTENSIONS)
+    
+    async def handle_route(self, route: Any) -> None:
+        """Handler de rota: serve do cache, revalida ou busca e armazena"""
+        request = route.request
+        if not self.is_cacheable(request):
+            await route.continue_()
+            return
+        
+        try:
+            entry = await asyncio.to_thread(self._lookup, request.url)
+            cached = await asyncio.to_thread(self._read_blob, entry["digest"]) if entry else None
+            if cached is None:
+                entry = None
+            elif entry["expires_at"] > time.time():
+                self.stats["hits"] += 1
+                await route.fulfill(status=entry["status"], headers=entry["headers"], body=cached)
+                return
+            
+            headers = dict(request.headers)
+            if entry:
+                if entry["etag"]:
+                    headers["if-none-match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["if-modified-since"] = entry["last_modified"]
+            response = await route.fetch(headers=headers)
+        except Exception as e:
+            logger.debug(f"Asset cache bypass for {request.url}: {e}")
+            self.stats["bypassed"] += 1
+            await route.continue_()
+            return
+        
+        if response.status == 304 and entry:
+            self.stats["revalidated"] += 1
+            try:
+                await asyncio.to_thread(self._refresh, request.url, response.headers)
+            except Exception as e:
+                logger.warning(f"Asset cache refresh failed for {request.url}: {e}")
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=cached)
+            return
+        
+        try:
+            body = await response.body()
+        except Exception as e:
+            logger.debug(f"Asset cache bypass for {request.url}: {e}")
+            self.stats["bypassed"] += 1
+            await route.continue_()
+            return
+        
+        self.stats["misses"] += 1
+        if response.status == 200:
+            # Falha ao gravar no cache não pode deixar a requisição sem resposta
+            try:
+                await asyncio.to_thread(self._store, request.url, response.status, response.headers, body)
+            except Exception as e:
+                logger.warning(f"Asset cache store failed for {request.url}: {e}")
+                self.stats["bypassed"] += 1
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+        await route.fulfill(status=response.status, headers=headers, body=body)
+    
+    def _ttl(self, headers: Dict[str, str]) -> Optional[float]:
+        """Frescor em segundos pelo Cache-Control; None se não deve ser armazenado"""
+        cache_control = headers.get("cache-control", "").lower()
+        if "no-store" in cache_control or "private" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return 0.0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return float(match.group(1)) if match else self.default_ttl
+    
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+    
+    def _read_blob(self, digest: str) -> Optional[bytes]:
+        try:
+            return self._blob_path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+    
+    def _lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, status, headers, etag, last_modified, expires_at FROM assets WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE assets SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        digest, status, headers, etag, last_modified, expires_at = row
+        return {
+            "digest": digest,
+            "status": status,
+            "headers": json.loads(headers),
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": expires_at,
+        }
+    
+    def _refresh(self, url: str, headers: Dict[str, str]) -> None:
+        """Renova o frescor após 304"""
+        ttl = self._ttl({k.lower(): v for k, v in headers.items()}) or 0.0
+        with self._lock:
+            self._conn.execute(
+                "UPDATE assets SET expires_at = ?, last_access = ? WHERE url = ?",
+                (time.time() + ttl, time.time(), url),
+            )
+            self._conn.commit()
+    
+    def _store(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        headers = {k.lower(): v for k, v in headers.items()}
+        ttl = self._ttl(headers)
+        if ttl is None or len(body) > self.max_bytes:
+            return
+        
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Temporário único: outro contexto/processo pode gravar o mesmo blob ao mesmo tempo
+            tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                tmp.write_bytes(body)
+                tmp.replace(path)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+                if not path.exists():
+                    raise
+        
+        kept_headers = {k: v for k, v in headers.items() if k not in _DROP_HEADERS}
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT digest FROM assets WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, len(body), status, json.dumps(kept_headers),
+                 headers.get("etag"), headers.get("last-modified"), now + ttl, now),
+            )
+            self._conn.commit()
+            if old and old[0] != digest:
+                self._drop_unreferenced(old[0])
+            self.stats["stored"] += 1
+            self._evict()
+    
+    def _drop_unreferenced(self, digest: str) -> None:
+        """Remove o blob se nenhuma URL aponta mais para ele (chamar com o lock)"""
+        in_use = self._conn.execute("SELECT 1 FROM assets WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        if not in_use:
+            self._blob_path(digest).unlink(missing_ok=True)
+    
+    def _evict(self) -> None:
+        """Despeja entradas menos usadas até caber em max_bytes (chamar com o lock)"""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM assets)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, digest FROM assets ORDER BY last_access").fetchall()
+        for url, digest in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM assets WHERE url = ?", (url,))
+            in_use = self._conn.execute(
+                "SELECT 1 FROM assets WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if not in_use:
+                size = self._blob_path(digest).stat().st_size if self._blob_path(digest).exists() else 0
+                self._blob_path(digest).unlink(missing_ok=True)
+                total -= size
+            self.stats["evicted"] += 1
+        self._conn.commit()
+    
+    def size_bytes(self) -> int:
+        """Tamanho total dos blobs indexados"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM assets)"
+            ).fetchone()[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores da execução + tamanho atual"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+        return dict(self.stats, entries=entries, size_bytes=self.size_bytes())
+    
+    def close(self) -> None:
+        """Fecha o índice"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,157 @@
+"""
+Adapter - Consistent Hash Sharding
+
+Anel de hash consistente para mapear chaves (módulo + versão) a workers.
+Páginas do mesmo módulo/versão vão para o mesmo worker, que reaproveita
+CSS/JS/TOC em cache; ao adicionar ou remover um worker, só as chaves
+daquele trecho do anel mudam de dono.
+"""
+
+import bisect
+import hashlib
+import math
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from libs.scrapers.adapters.url_resolver import UrlResolver
+
+
+_resolver = UrlResolver()
+
+
+def module_shard_key(url: str) -> str:
+    """Chave de afinidade: host + módulo + versão (ex: documentacao.senior.com.br/bpm/6.0)"""
+    host = urlparse(url).netloc.lower()
+    module = _resolver.extract_module(url)
+    version = _resolver.extract_version(url) or ""
+    return f"{host}/{module}/{version}"
+
+
+class ConsistentHashRing:
+    """
+    Anel de hash consistente com nós virtuais.
+    
+    Cada nó ocupa `replicas` posições no anel; uma chave pertence ao
+    primeiro nó no sentido horário a partir do hash dela.
+    """
+    
+    def __init__(self, nodes: Iterable[Hashable] = (), replicas: int = 64):
+        """
+        Inicializa anel.
+        
+        Args:
+            nodes: Nós iniciais (ids de worker, índices de processo)
+            replicas: Nós virtuais por nó (mais réplicas = distribuição mais uniforme)
+        """
+        self.replicas = max(1, replicas)
+        self._hashes: List[int] = []
+        self._owners: Dict[int, Hashable] = {}
+        self._nodes: set = set()
+        for node in nodes:
+            self.add_node(node)
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+    
+    @property
+    def nodes(self) -> List[Hashable]:
+        """Nós presentes no anel"""
+        return list(self._nodes)
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._nodes
+    
+    def add_node(self, node: Hashable) -> None:
+        """Adiciona nó (idempotente)"""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.replicas):
+            h = self._hash(f"{node}#{i}")
+            if h in self._owners:
+                continue
+            self._owners[h] = node
+            bisect.insort(self._hashes, h)
+    
+    def remove_node(self, node: Hashable) -> None:
+        """Remove nó (idempotente)"""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._hashes = [h for h in self._hashes if self._owners[h] != node]
+        self._owners = {h: self._owners[h] for h in self._hashes}
+    
+    def get_node(self, key: str) -> Optional[Hashable]:
+        """Nó dono da chave (None se o anel está vazio)"""
+        for node in self.iter_nodes(key):
+            return node
+        return None
+    
+    def iter_nodes(self, key: str) -> Iterator[Hashable]:
+        """Nós distintos no sentido horário a partir da chave (dono primeiro)"""
+        if not self._hashes:
+            return
+        start = bisect.bisect(self._hashes, self._hash(key))
+        seen = set()
+        for i in range(len(self._hashes)):
+            node = self._owners[self._hashes[(start + i) % len(self._hashes)]]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self._nodes):
+                    return
+
+
+def shard_urls_by_key(
+    urls: List[str],
+    num_shards: int,
+    key_func: Callable[[str], str] = module_shard_key,
+    load_factor: float = 1.25,
+    replicas: int = 64,
+) -> List[List[str]]:
+    """
+    Particiona URLs por chave de afinidade com carga limitada.
+    
+    URLs com a mesma chave vão para o dono da chave no anel; uma partição
+    não passa de ceil(load_factor * len(urls) / num_shards) URLs, e o
+    excedente segue para o próximo nó do anel. Assim um módulo grande
+    ainda usa todos os processos, mas em poucos blocos contíguos.
+    
+    Args:
+        urls: URLs para particionar (ordem relativa preservada dentro de cada chave)
+        num_shards: Número de partições
+        key_func: Função url -> chave de afinidade
+        load_factor: Folga de carga sobre a média (>= 1)
+        replicas: Nós virtuais por partição
+    
+    Returns:
+        Lista com num_shards listas de URLs
+    """
+    num_shards = max(1, num_shards)
+    shards: List[List[str]] = [[] for _ in range(num_shards)]
+    if not urls:
+        return shards
+    
+    ring = ConsistentHashRing(range(num_shards), replicas=replicas)
+    capacity = max(1, math.ceil(max(1.0, load_factor) * len(urls) / num_shards))
+    
+    groups: Dict[str, List[str]] = {}
+    for url in urls:
+        groups.setdefault(key_func(url), []).append(url)
+    
+    # Maiores grupos primeiro: ficam inteiros no dono sempre que possível
+    for key, group in sorted(groups.items(), key=lambda kv: -len(kv[1])):
+        remaining = group
+        for shard_id in ring.iter_nodes(key):
+            room = capacity - len(shards[shard_id])
+            if room <= 0:
+                continue
+            shards[shard_id].extend(remaining[:room])
+            remaining = remaining[room:]
+            if not remaining:
+                break
+    return shards
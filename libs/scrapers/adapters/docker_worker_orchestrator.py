@@ -3,17 +3,26 @@ Docker Multi-Worker Orchestrator
 
 Gerencia múltiplos containers de workers e distribui URLs entre eles.
 Permite escalar scraping horizontalmente com containers Docker.
+
+As URLs ficam numa LeaseWorkQueue servida por HTTP (WorkQueueServer);
+os workers pegam lotes por lease e devolvem resultados com ack/nack.
 """
 
 import asyncio
 import json
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
-import docker
-from docker.models.containers import Container
+
+from libs.scrapers.adapters.lease_work_queue import LeaseWorkQueue
+from libs.scrapers.ports.work_queue import WorkItem
+
+try:
+    import docker
+except ImportError:
+    docker = None
 
 logger = logging.getLogger(__name__)
 
@@ -37,22 +46,74 @@ class DockerWorkerOrchestrator:
     
     Permite:
     - Criar e gerenciar múltiplos containers workers
-    - Distribuir URLs entre workers
+    - Distribuir URLs entre workers (fila com lease servida por HTTP)
     - Monitorar saúde dos workers
     - Escalar dinamicamente
     - Coletar resultados
+    
+    O cliente Docker só é criado quando um container é manipulado, então
+    fila e servidor funcionam sem Docker (ex: workers locais em testes).
     """
     
-    def __init__(self, image_name: str = "senior-docs-scraper:latest", network_name: str = "senior-docs"):
+    def __init__(
+        self,
+        image_name: str = "senior-docs-scraper:latest",
+        network_name: str = "senior-docs",
+        queue_host: str = "scraper-orchestrator",
+        queue_port: int = 8001,
+        visibility_timeout: float = 120.0,
+        max_attempts: int = 3,
+        batch_size: int = 10,
+    ):
+        """
+        Inicializa orchestrador.
+        
+        Args:
+            image_name: Imagem dos workers
+            network_name: Rede Docker compartilhada com os workers
+            queue_host: Host da fila visto pelos workers
+            queue_port: Porta do servidor da fila
+            visibility_timeout: Prazo (s) de um lease sem heartbeat
+            max_attempts: Entregas por URL antes de ir para dead letters
+            batch_size: URLs por lease pedido pelos workers
+        """
         self.image_name = image_name
         self.network_name = network_name
+        self.queue_host = queue_host
+        self.queue_port = queue_port
+        self.batch_size = batch_size
         
-        self.client = docker.from_env()
+        self._client = None
         self.workers: Dict[str, WorkerContainer] = {}
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.queue = LeaseWorkQueue(visibility_timeout=visibility_timeout, max_attempts=max_attempts)
+        self.server = None
         
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def client(self):
+        """Cliente Docker (criado sob demanda)"""
+        if self._client is None:
+            if docker is None:
+                raise RuntimeError("docker package not installed")
+            self._client = docker.from_env()
+        return self._client
+    
+    async def start_queue_server(self, host: str = "0.0.0.0", port: Optional[int] = None):
+        """Inicia o servidor HTTP da fila (endpoint que os workers consultam)"""
+        from libs.scrapers.adapters.work_queue_server import WorkQueueServer
+        
+        self.server = WorkQueueServer(self.queue, host=host, port=self.queue_port if port is None else port)
+        await self.server.start()
+        self.queue_port = self.server.port
+        return self.server
+    
+    async def stop_queue_server(self) -> None:
+        """Encerra o servidor da fila"""
+        if self.server:
+            await self.server.stop()
+            self.server = None
+    
     async def scale_workers(self, num_workers: int) -> List[WorkerContainer]:
         """
         Escala para número especificado de workers.
@@ -100,8 +161,10 @@ class DockerWorkerOrchestrator:
                     "PYTHONUNBUFFERED": "1",
                     "SCRAPER_MODE": "worker",
                     "WORKER_ID": str(worker_id),
-                    "WORKER_QUEUE_HOST": "scraper-orchestrator",
-                    "WORKER_QUEUE_PORT": "8001",
+                    "WORKER_NAME": container_name,
+                    "WORKER_QUEUE_HOST": self.queue_host,
+                    "WORKER_QUEUE_PORT": str(self.queue_port),
+                    "WORKER_BATCH_SIZE": str(self.batch_size),
                     "LOG_LEVEL": "info",
                 },
                 network=self.network_name,
@@ -159,12 +222,44 @@ class DockerWorkerOrchestrator:
         for i in range(0, len(urls), batch_size):
             batch = urls[i:i+batch_size]
             
-            # Distribuir para próximo worker disponível
-            for url in batch:
-                await self.queue.put(url)
+            # Workers pegam os itens por lease, em lotes de self.batch_size
+            await self.queue.enqueue(batch)
         
         self.logger.info(f"📤 Distributed {len(urls)} URLs to workers")
     
+    async def close_input(self) -> None:
+        """Fecha a fila após o último distribute_urls; workers encerram quando ela esvaziar"""
+        await self.queue.close_input()
+    
+    async def wait_for_completion(self, timeout: Optional[float] = None, poll_interval: float = 1.0) -> bool:
+        """
+        Aguarda todas as URLs serem confirmadas ou irem para dead letters.
+        
+        Só retorna True depois de close_input().
+        
+        Returns:
+            True se a fila esvaziou antes do timeout
+        """
+        drained = await self.queue.join(timeout=timeout, poll_interval=poll_interval)
+        self._sync_worker_stats()
+        return drained
+    
+    def collect_results(self) -> List[Tuple[WorkItem, Any]]:
+        """Retorna (e limpa) os resultados enviados pelos workers"""
+        return self.queue.collect_results()
+    
+    def _sync_worker_stats(self) -> None:
+        """Copia contadores da fila para os WorkerContainer (worker_id = nome do container)"""
+        by_name = {w.container_name: w for w in self.workers.values()}
+        for worker_id, stats in self.queue.workers.items():
+            worker = by_name.get(worker_id)
+            if worker is None:
+                continue
+            worker.success_count = stats["succeeded"]
+            worker.error_count = stats["failed"]
+            worker.urls_processed = stats["succeeded"] + stats["failed"]
+            worker.last_heartbeat = stats["last_heartbeat"]
+    
     async def monitor_workers(self, interval: int = 10) -> None:
         """
         Monitora saúde dos workers continuamente.
@@ -187,7 +282,7 @@ class DockerWorkerOrchestrator:
                                 f"⚠️ Worker {worker.container_name} is {container.status}"
                             )
                         
-                    except docker.errors.NotFound:
+                    except docker.errors.NotFound if docker else ():
                         worker.status = "not_found"
                         self.logger.error(
                             f"❌ Worker {worker.container_name} not found (container removed?)"
@@ -201,6 +296,7 @@ class DockerWorkerOrchestrator:
     
     async def get_worker_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas dos workers"""
+        self._sync_worker_stats()
         total_urls = sum(w.urls_processed for w in self.workers.values())
         total_success = sum(w.success_count for w in self.workers.values())
         total_errors = sum(w.error_count for w in self.workers.values())
@@ -214,7 +310,8 @@ class DockerWorkerOrchestrator:
             "workers": {
                 name: asdict(worker)
                 for name, worker in self.workers.items()
-            }
+            },
+            "queue": await self.queue.get_stats(),
         }
     
     async def cleanup(self) -> None:
@@ -236,6 +333,9 @@ async def example_orchestrator():
     orchestrator = DockerWorkerOrchestrator()
     
     try:
+        # Servidor da fila antes dos workers subirem
+        await orchestrator.start_queue_server()
+        
         # Escalar para 3 workers
         workers = await orchestrator.scale_workers(3)
         print(f"✅ Scaled to {len(workers)} workers")
@@ -243,11 +343,13 @@ async def example_orchestrator():
         # Distribuir URLs
         urls = [f"https://example.com/page{i}" for i in range(1, 21)]
         await orchestrator.distribute_urls(urls, batch_size=10)
+        await orchestrator.close_input()
         
-        # Monitorar por 30s
+        # Monitorar até a fila esvaziar (no máximo 5 min)
         monitor_task = asyncio.create_task(orchestrator.monitor_workers(interval=5))
-        await asyncio.sleep(30)
+        await orchestrator.wait_for_completion(timeout=300)
         monitor_task.cancel()
+        print(f"✅ {len(orchestrator.collect_results())} results collected")
         
         # Estatísticas
         stats = await orchestrator.get_worker_stats()
@@ -255,6 +357,7 @@ async def example_orchestrator():
         
     finally:
         await orchestrator.cleanup()
+        await orchestrator.stop_queue_server()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+"""
+Adapter - Document LRU Cache
+
+Cache em memória de Documents limitado por número de entradas e por
+tamanho aproximado (caracteres de conteúdo/título/url), com despejo do
+menos usado recentemente e contadores de hit/miss.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from libs.scrapers.domain import Document
+
+
+# Custo fixo aproximado de um Document fora o texto (objeto, listas, dicts)
+_DOCUMENT_OVERHEAD_BYTES = 1024
+
+
+def approximate_size(document: Document) -> int:
+    """Tamanho aproximado em bytes de um Document em memória"""
+    return (
+        _DOCUMENT_OVERHEAD_BYTES
+        + len(document.content)
+        + len(document.title)
+        + len(document.url)
+        + sum(len(item) for item in document.breadcrumb)
+    )
+
+
+class DocumentLRUCache:
+    """
+    Cache LRU de Documents por id.
+    
+    Uso:
+        cache = DocumentLRUCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+        cache.put(doc)
+        doc = cache.get(doc_id)   # None em miss
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        """
+        Inicializa cache.
+        
+        Args:
+            max_entries: Máximo de documentos (0 desativa o cache)
+            max_bytes: Tamanho aproximado máximo (None = sem limite por bytes)
+        """
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, doc_id: str) -> Optional[Document]:
+        """Documento em cache (marca como usado) ou None"""
+        entry = self._entries.get(doc_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(doc_id)
+        self.hits += 1
+        return entry[0]
+    
+    def put(self, document: Document) -> None:
+        """Adiciona/atualiza documento e despeja os menos usados acima dos limites"""
+        if self.max_entries == 0:
+            return
+        size = approximate_size(document)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Maior que o cache inteiro: não vale despejar tudo por ele
+            self.pop(document.id)
+            return
+        
+        self.pop(document.id)
+        self._entries[document.id] = (document, size)
+        self.size_bytes += size
+        
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+    
+    def pop(self, doc_id: str) -> Optional[Document]:
+        """Remove documento do cache"""
+        entry = self._entries.pop(doc_id, None)
+        if entry is None:
+            return None
+        self.size_bytes -= entry[1]
+        return entry[0]
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de uso e ocupação"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
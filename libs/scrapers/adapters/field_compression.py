@@ -0,0 +1,288 @@
+"""
+Adapter - Field Compression
+
+Compressão transparente de campos grandes (content, metadata["html"]) dos
+documentos e de arquivos de saída do scraper (page.html).
+
+- zstd (pacote zstandard) quando instalado; senão gzip da stdlib
+- Dicionário zstd treinado por módulo: o markup MadCap repetido entre
+  páginas do mesmo módulo comprime bem melhor com ele
+- Campos comprimidos viram {"$compressed": "zstd"|"gzip", "data": base64}
+  no JSON; strings pequenas ficam como estão
+- Leitura em streaming (open_stream/open_text_file) sem descomprimir tudo
+  em memória
+
+Frames zstd carregam o id do dicionário usado, então a leitura encontra
+o dicionário certo sozinha (dictionary_dir/<id>.zdict), mesmo depois de
+retreinar.
+
+Um FieldCompressor pode ser usado de várias threads (ex: pool de escrita
+do FileSystemRepository): ZstdCompressor não é thread-safe, então cada
+thread tem os seus.
+"""
+
+import base64
+import gzip
+import io
+import json
+import logging
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_KEY = "$compressed"
+COMPRESSED_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+# Dicionários treinados por scripts/indexing/train_compression_dictionaries.py
+DEFAULT_DICTIONARY_DIR = Path("data") / "compression_dicts"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_DECOMPRESS_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+class CompressionError(RuntimeError):
+    """Campo ou arquivo comprimido que não pôde ser lido (dicionário ausente, dado corrompido)"""
+
+
+class FieldCompressor:
+    """
+    Compressor de campos de documentos e arquivos de saída.
+    
+    Uso:
+        compressor = FieldCompressor(dictionary_dir="data/compression_dicts")
+        compressor.train_dictionary("crm", samples)        # opcional (zstd)
+        value = compressor.compress_text(html, module="crm")
+        html = compressor.decompress_value(value)
+    """
+    
+    def __init__(
+        self,
+        min_size: int = 4096,
+        algorithm: Optional[str] = None,
+        level: Optional[int] = None,
+        dictionary_dir: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Inicializa compressor.
+        
+        Args:
+            min_size: Campos com menos caracteres que isso não são comprimidos
+            algorithm: "zstd" ou "gzip" (padrão: zstd se instalado)
+            level: Nível de compressão (padrão: 9 para zstd, 6 para gzip)
+            dictionary_dir: Diretório dos dicionários por módulo (zstd)
+        """
+        if algorithm not in (None, "zstd", "gzip"):
+            raise ValueError(f"algorithm must be 'zstd' or 'gzip', got {algorithm!r}")
+        if algorithm == "zstd" and zstandard is None:
+            logger.warning("zstandard não instalado; usando gzip")
+            algorithm = "gzip"
+        self.algorithm = algorithm or ("zstd" if zstandard else "gzip")
+        self.level = level if level is not None else (9 if self.algorithm == "zstd" else 6)
+        self.min_size = min_size
+        self.dictionary_dir = Path(dictionary_dir) if dictionary_dir else None
+        
+        self._dictionaries: Dict[int, Any] = {}
+        # ZstdCompressor por thread e por dicionário
+        self._local = threading.local()
+        self._module_dicts: Dict[str, int] = {}
+        if self.dictionary_dir and (self.dictionary_dir / "modules.json").exists():
+            self._module_dicts = json.loads((self.dictionary_dir / "modules.json").read_text(encoding="utf-8"))
+    
+    @property
+    def suffix(self) -> str:
+        """Extensão dos arquivos gerados por encode_file"""
+        return COMPRESSED_SUFFIXES[self.algorithm]
+    
+    def train_dictionary(self, module: str, samples: Iterable[str], dict_size: int = 112640) -> int:
+        """
+        Treina e grava o dicionário zstd de um módulo.
+        
+        Args:
+            module: Nome do módulo
+            samples: Textos de exemplo do módulo (HTML/conteúdo de páginas)
+            dict_size: Tamanho máximo do dicionário em bytes
+        
+        Returns:
+            int: Id do dicionário
+        """
+        if zstandard is None:
+            raise RuntimeError("Treinar dicionários requer o pacote zstandard")
+        if self.dictionary_dir is None:
+            raise ValueError("dictionary_dir não configurado")
+        
+        encoded = [sample.encode("utf-8") for sample in samples if sample]
+        try:
+            dictionary = zstandard.train_dictionary(dict_size, encoded, level=self.level)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Amostras insuficientes para treinar o dicionário de {module}: {e}")
+        
+        dict_id = dictionary.dict_id()
+        self.dictionary_dir.mkdir(parents=True, exist_ok=True)
+        (self.dictionary_dir / f"{dict_id}.zdict").write_bytes(dictionary.as_bytes())
+        self._dictionaries[dict_id] = dictionary
+        self._module_dicts[module] = dict_id
+        (self.dictionary_dir / "modules.json").write_text(
+            json.dumps(self._module_dicts, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        return dict_id
+    
+    def _dictionary(self, dict_id: int) -> Any:
+        if dict_id not in self._dictionaries:
+            path = self.dictionary_dir / f"{dict_id}.zdict" if self.dictionary_dir else None
+            if path is None or not path.exists():
+                raise CompressionError(f"Dicionário zstd {dict_id} não encontrado em {self.dictionary_dir}")
+            self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(path.read_bytes())
+        return self._dictionaries[dict_id]
+    
+    def _zstd_compressor(self, module: Optional[str]) -> Any:
+        dict_id = self._module_dicts.get(module) if module else None
+        compressors = getattr(self._local, "compressors", None)
+        if compressors is None:
+            compressors = self._local.compressors = {}
+        if dict_id not in compressors:
+            dictionary = self._dictionary(dict_id) if dict_id else None
+            compressors[dict_id] = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+        return compressors[dict_id]
+    
+    def _zstd_decompressor(self, header: bytes) -> Any:
+        if zstandard is None:
+            raise CompressionError("Dado comprimido com zstd: instale o pacote zstandard")
+        dict_id = zstandard.get_frame_parameters(header).dict_id
+        return zstandard.ZstdDecompressor(dict_data=self._dictionary(dict_id) if dict_id else None)
+    
+    def compress_bytes(self, raw: bytes, module: Optional[str] = None) -> bytes:
+        """Comprime com o algoritmo configurado (e o dicionário do módulo)"""
+        if self.algorithm == "zstd":
+            return self._zstd_compressor(module).compress(raw)
+        return gzip.compress(raw, compresslevel=self.level, mtime=0)
+    
+    def decompress_bytes(self, data: bytes) -> bytes:
+        """Descomprime zstd ou gzip (detectado pelo cabeçalho); CompressionError se falhar"""
+        try:
+            if data.startswith(_ZSTD_MAGIC):
+                return self._zstd_decompressor(data[:18]).decompress(data)
+            return gzip.decompress(data)
+        except _DECOMPRESS_ERRORS as e:
+            raise CompressionError(f"Falha ao descomprimir: {e}") from e
+    
+    def open_bytes_stream(self, stream: IO[bytes]) -> IO[bytes]:
+        """Envolve um stream comprimido (zstd ou gzip) em um leitor que descomprime sob demanda"""
+        stream = io.BufferedReader(stream) if not hasattr(stream, "peek") else stream
+        header = stream.peek(18)[:18]
+        if header.startswith(_ZSTD_MAGIC):
+            return self._zstd_decompressor(header).stream_reader(stream)
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    
+    def compress_text(self, text: str, module: Optional[str] = None) -> Union[str, Dict[str, str]]:
+        """Valor comprimido para o JSON, ou o próprio texto se for pequeno"""
+        if not isinstance(text, str) or len(text) < self.min_size:
+            return text
+        data = self.compress_bytes(text.encode("utf-8"), module)
+        return {COMPRESSED_KEY: self.algorithm, "data": base64.b64encode(data).decode("ascii")}
+    
+    def decompress_value(self, value: Any) -> Any:
+        """Texto original de um valor gravado por compress_text (outros valores passam direto)"""
+        if not is_compressed(value):
+            return value
+        return self.decompress_bytes(base64.b64decode(value["data"])).decode("utf-8")
+    
+    def open_stream(self, value: Any) -> IO[str]:
+        """Leitor de texto em streaming para um valor (comprimido ou não)"""
+        if not is_compressed(value):
+            return io.StringIO(value or "")
+        raw = io.BytesIO(base64.b64decode(value["data"]))
+        return io.TextIOWrapper(self.open_bytes_stream(raw), encoding="utf-8")
+    
+    def compress_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Cópia de Document.to_dict() com content e metadata["html"] comprimidos"""
+        module = data.get("module")
+        data = dict(data, content=self.compress_text(data.get("content", ""), module))
+        metadata = data.get("metadata") or {}
+        if "html" in metadata:
+            data["metadata"] = dict(metadata, html=self.compress_text(metadata["html"], module))
+        return data
+    
+    def decompress_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Inverso de compress_document (dicts sem campos comprimidos passam direto)"""
+        if is_compressed(data.get("content")):
+            data["content"] = self.decompress_value(data["content"])
+        metadata = data.get("metadata") or {}
+        if is_compressed(metadata.get("html")):
+            metadata["html"] = self.decompress_value(metadata["html"])
+        return data
+    
+    def encode_file(self, name: str, text: str, module: Optional[str] = None) -> tuple:
+        """(nome com extensão, bytes comprimidos) para gravar um arquivo de saída"""
+        return name + self.suffix, self.compress_bytes(text.encode("utf-8"), module)
+
+
+_default_compressor: Optional[FieldCompressor] = None
+
+
+def _default() -> FieldCompressor:
+    global _default_compressor
+    if _default_compressor is None:
+        _default_compressor = FieldCompressor(dictionary_dir=DEFAULT_DICTIONARY_DIR)
+    return _default_compressor
+
+
+def is_compressed(value: Any) -> bool:
+    """True se o valor foi gravado por FieldCompressor.compress_text"""
+    return isinstance(value, dict) and COMPRESSED_KEY in value
+
+
+def decompress_document(data: Dict[str, Any], compressor: Optional[FieldCompressor] = None) -> Dict[str, Any]:
+    """Descomprime os campos de um documento lido (com ou sem compressor configurado)"""
+    return (compressor or _default()).decompress_document(data)
+
+
+def decompress_json_line(line: Union[str, bytes], compressor: Optional[FieldCompressor] = None) -> Union[str, bytes]:
+    """
+    Linha JSON (str ou bytes) com os campos descomprimidos.
+    
+    Sem campos comprimidos a linha volta sem parse; o tipo e a quebra de
+    linha final são preservados.
+    """
+    is_bytes = isinstance(line, bytes)
+    if (COMPRESSED_KEY.encode("utf-8") if is_bytes else COMPRESSED_KEY) not in line:
+        return line
+    data = decompress_document(json.loads(line), compressor)
+    out = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    if line.endswith(b"\n" if is_bytes else "\n"):
+        out += "\n"
+    return out.encode("utf-8") if is_bytes else out
+
+
+def open_text_file(path: Union[str, Path], compressor: Optional[FieldCompressor] = None) -> IO[str]:
+    """
+    Abre um arquivo de saída para leitura em streaming.
+    
+    Aceita o caminho sem extensão de compressão (ex: page.html): usa
+    page.html, page.html.zst ou page.html.gz, o que existir.
+    """
+    candidate = find_output_file(path)
+    if candidate is None:
+        raise FileNotFoundError(path)
+    
+    if candidate.suffix == ".gz":
+        return gzip.open(candidate, "rt", encoding="utf-8", errors="replace")
+    if candidate.suffix == ".zst":
+        stream = (compressor or _default()).open_bytes_stream(open(candidate, "rb"))
+        return io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    return open(candidate, "r", encoding="utf-8", errors="replace")
+
+
+def find_output_file(path: Union[str, Path]) -> Optional[Path]:
+    """O arquivo existente entre path, path.zst e path.gz (None se nenhum)"""
+    path = Path(path)
+    for candidate in (path, *(path.with_name(path.name + s) for s in COMPRESSED_SUFFIXES.values())):
+        if candidate.exists():
+            return candidate
+    return None
@@ -3,14 +3,54 @@ Adapter - FileSystem Repository
 
 Implementação concreta de IDocumentRepository usando sistema de arquivos.
 Salva documentos como arquivos JSON organizados por módulo.
+
+Um manifesto em base_dir/_manifest.json (id -> módulo/arquivo, url, hash
+do conteúdo, tamanho) torna find_by_id, find_by_url, exists, count e
+delete consultas O(1) em vez de varrer os diretórios. Ele é carregado
+sob demanda e reconstruído se estiver ausente ou desatualizado (mtime de
+algum diretório de módulo diferente do registrado).
+
+save_many grava os arquivos em um pool de threads limitado (save_workers)
+e os documentos podem ser gravados indentados ("pretty", padrão),
+compactos ("compact") ou compactados com gzip ("gzip", *.json.gz).
+Com um FieldCompressor, content e metadata["html"] grandes são gravados
+comprimidos dentro do JSON; a leitura descomprime sempre que encontrar
+campos comprimidos. Arquivos JSON inválidos são ignorados nas varreduras,
+mas um campo que não pode ser descomprimido levanta CompressionError.
 """
 
+import asyncio
+import gzip
 import json
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from libs.scrapers.domain import Document, DocumentMetadata
 from libs.scrapers.ports import IDocumentRepository
+from libs.scrapers.adapters.document_cache import DocumentLRUCache
+from libs.scrapers.adapters.field_compression import CompressionError, FieldCompressor, decompress_document
+
+
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 1
+DOCUMENT_ENCODINGS = ("pretty", "compact", "gzip")
+
+
+def _read_document_file(file_path: Path, compressor: Optional[FieldCompressor] = None) -> Dict[str, Any]:
+    """Lê um documento gravado em qualquer um dos encodings"""
+    raw = file_path.read_bytes()
+    if file_path.suffix == ".gz":
+        raw = gzip.decompress(raw)
+    return decompress_document(json.loads(raw), compressor)
+
+
+def _document_files(module_dir: Path):
+    """Arquivos de documento de um diretório de módulo (.json e .json.gz)"""
+    for file_path in module_dir.iterdir():
+        if file_path.name.endswith((".json", ".json.gz")):
+            yield file_path
 
 
 class FileSystemRepository(IDocumentRepository):
@@ -19,30 +59,209 @@ class FileSystemRepository(IDocumentRepository):
     
     Organiza documentos em estrutura de pastas por módulo,
     salvando cada documento como arquivo JSON individual.
+    
+    Cada entrada do manifesto é [módulo, arquivo, url, sha256 do conteúdo,
+    bytes]. Arquivos de documento são gravados via arquivo temporário +
+    rename, o que sempre altera o mtime do diretório do módulo: um
+    manifesto que não foi regravado depois de uma escrita (processo
+    interrompido, outro processo) é detectado como desatualizado.
     """
     
-    def __init__(self, base_dir: str = "data/scraped/estruturado"):
+    def __init__(
+        self,
+        base_dir: str = "data/scraped/estruturado",
+        use_manifest: bool = True,
+        manifest_flush_every: int = 100,
+        cache_max_entries: int = 1024,
+        cache_max_bytes: Optional[int] = 64 * 1024 * 1024,
+        encoding: str = "pretty",
+        save_workers: int = 8,
+        compressor: Optional[FieldCompressor] = None,
+    ):
         """
         Inicializa repositório.
         
         Args:
             base_dir: Diretório base para armazenar documentos
+            use_manifest: Mantém o índice _manifest.json
+            manifest_flush_every: Regrava o manifesto a cada N chamadas de save
+                (save_many, delete e clear regravam na hora)
+            cache_max_entries: Máximo de documentos no cache LRU (0 desativa)
+            cache_max_bytes: Tamanho aproximado máximo do cache LRU
+            encoding: "pretty" (JSON indentado), "compact" ou "gzip"
+            save_workers: Threads de escrita usadas por save_many
+            compressor: Comprime campos grandes (content, metadata["html"])
         """
+        if encoding not in DOCUMENT_ENCODINGS:
+            raise ValueError(f"encoding must be one of {DOCUMENT_ENCODINGS}, got {encoding!r}")
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.use_manifest = use_manifest
+        self.manifest_flush_every = max(1, manifest_flush_every)
+        self.encoding = encoding
+        self.save_workers = max(1, save_workers)
+        self.compressor = compressor
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Diretórios de módulo já criados (evita mkdir a cada save)
+        self._known_dirs: set = set()
+        
+        # Cache LRU em memória (limitado; varreduras em massa não passam por ele)
+        self._cache = DocumentLRUCache(cache_max_entries, cache_max_bytes)
+        
+        # Manifesto (carregado sob demanda)
+        self._manifest: Optional[Dict[str, list]] = None
+        self._url_index: Dict[str, str] = {}
+        self._pending_saves = 0
+    
+    @property
+    def manifest_path(self) -> Path:
+        return self.base_dir / MANIFEST_NAME
+    
+    def _module_mtimes(self) -> Dict[str, int]:
+        return {d.name: d.stat().st_mtime_ns for d in self.base_dir.iterdir() if d.is_dir()}
+    
+    def _load_manifest(self) -> Dict[str, list]:
+        """Manifesto em memória; lê do disco ou reconstrói na primeira chamada"""
+        if self._manifest is not None:
+            return self._manifest
         
-        # Cache em memória (opcional, para performance)
-        self._cache: Dict[str, Document] = {}
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = None
+        
+        if (
+            isinstance(data, dict)
+            and data.get("version") == MANIFEST_VERSION
+            and data.get("dir_mtimes") == self._module_mtimes()
+        ):
+            self._manifest = data["entries"]
+        else:
+            self._rebuild_manifest()
+        
+        self._url_index = {entry[2]: doc_id for doc_id, entry in self._manifest.items()}
+        return self._manifest
+    
+    def _rebuild_manifest(self) -> None:
+        """Reconstrói o manifesto lendo todos os JSON dos diretórios de módulo"""
+        entries: Dict[str, list] = {}
+        for module_dir in self.base_dir.iterdir():
+            if not module_dir.is_dir():
+                continue
+            for file_path in _document_files(module_dir):
+                try:
+                    data = _read_document_file(file_path, self.compressor)
+                    entries[data["id"]] = [
+                        module_dir.name, file_path.name, data["url"],
+                        self._content_hash(data.get("content", "")), file_path.stat().st_size,
+                    ]
+                except CompressionError:
+                    raise
+                except Exception:
+                    continue
+        self._manifest = entries
+        self._write_manifest()
+    
+    def _write_manifest(self) -> None:
+        """Grava o manifesto atomicamente (arquivo temporário + rename)"""
+        payload = {
+            "version": MANIFEST_VERSION,
+            "dir_mtimes": self._module_mtimes(),
+            "entries": self._manifest,
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding='utf-8')
+        os.replace(tmp_path, self.manifest_path)
+        self._pending_saves = 0
+    
+    def flush_manifest(self) -> None:
+        """Grava o manifesto se houver saves ainda não persistidos"""
+        if self._manifest is not None and self._pending_saves:
+            self._write_manifest()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses, despejos e ocupação do cache de documentos"""
+        return self._cache.get_stats()
+    
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _manifest_path_for(self, doc_id: str) -> Optional[Path]:
+        """Caminho do documento segundo o manifesto (None se não indexado)"""
+        entry = self._load_manifest().get(doc_id)
+        return self.base_dir / entry[0] / entry[1] if entry else None
+    
+    def _forget(self, doc_id: str) -> None:
+        """Remove o documento do manifesto e do cache"""
+        entry = self._manifest.pop(doc_id, None) if self._manifest is not None else None
+        if entry and self._url_index.get(entry[2]) == doc_id:
+            del self._url_index[entry[2]]
+        self._cache.pop(doc_id)
     
     def _get_document_path(self, doc_id: str, module: str) -> Path:
         """Retorna path do arquivo para um documento"""
         module_dir = self.base_dir / module
-        module_dir.mkdir(parents=True, exist_ok=True)
+        if module not in self._known_dirs:
+            module_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(module)
         
         # Usar hash do ID para nome de arquivo (evita caracteres inválidos)
-        filename = f"{hashlib.md5(doc_id.encode()).hexdigest()}.json"
+        suffix = ".json.gz" if self.encoding == "gzip" else ".json"
+        filename = f"{hashlib.md5(doc_id.encode()).hexdigest()}{suffix}"
         return module_dir / filename
     
+    def _encode(self, document: Document) -> bytes:
+        """Serializa o documento no encoding configurado"""
+        data = document.to_dict()
+        if self.compressor:
+            data = self.compressor.compress_document(data)
+        if self.encoding == "pretty":
+            return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        return gzip.compress(raw, compresslevel=6, mtime=0) if self.encoding == "gzip" else raw
+    
+    def _write_file(self, file_path: Path, document: Document) -> int:
+        """Grava o arquivo do documento (temporário + rename: escrita atômica); seguro em threads"""
+        raw = self._encode(document)
+        tmp_path = file_path.with_suffix(".tmp")
+        tmp_path.write_bytes(raw)
+        os.replace(tmp_path, file_path)
+        return len(raw)
+    
+    def _write_files(self, batch: List[tuple]) -> List[int]:
+        """Grava uma fatia de (path, documento) em sequência (uma tarefa do pool)"""
+        return [self._write_file(path, doc) for path, doc in batch]
+    
+    def _write_document(self, document: Document) -> None:
+        """Grava o JSON do documento e atualiza o manifesto em memória"""
+        # Carregar antes de criar o diretório do módulo (senão o manifesto parece desatualizado)
+        if self.use_manifest:
+            self._load_manifest()
+        file_path = self._get_document_path(document.id, document.module)
+        size = self._write_file(file_path, document)
+        self._record_write(document, file_path, size)
+    
+    def _record_write(self, document: Document, file_path: Path, size: int) -> None:
+        """Atualiza cache e manifesto em memória após gravar um documento"""
+        self._cache.put(document)
+        
+        manifest = self._manifest if self.use_manifest else None
+        if manifest is not None:
+            previous = manifest.get(document.id)
+            if previous and (previous[0], previous[1]) != (document.module, file_path.name):
+                # Documento mudou de módulo: remove o arquivo antigo
+                (self.base_dir / previous[0] / previous[1]).unlink(missing_ok=True)
+            if previous and self._url_index.get(previous[2]) == document.id:
+                del self._url_index[previous[2]]
+            manifest[document.id] = [
+                document.module, file_path.name, document.url,
+                self._content_hash(document.content), size,
+            ]
+            self._url_index[document.url] = document.id
+            self._pending_saves += 1
+    
     async def save(self, document: Document) -> None:
         """
         Salva um documento.
@@ -50,24 +269,46 @@ class FileSystemRepository(IDocumentRepository):
         Args:
             document: Document a ser salvo
         """
-        file_path = self._get_document_path(document.id, document.module)
-        
-        # Salvar como JSON
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(document.to_dict(), f, ensure_ascii=False, indent=2)
-        
-        # Atualizar cache
-        self._cache[document.id] = document
+        self._write_document(document)
+        if self.use_manifest and self._pending_saves >= self.manifest_flush_every:
+            self._write_manifest()
     
     async def save_many(self, documents: List[Document]) -> None:
         """
         Salva múltiplos documentos em batch.
         
+        Serialização e escrita dos arquivos rodam em até save_workers
+        threads; cache e manifesto são atualizados no event loop e o
+        manifesto é gravado uma vez no fim.
+        
         Args:
             documents: Lista de Documents
         """
-        for doc in documents:
-            await self.save(doc)
+        # Mesmo id repetido no lote: vale o último (e evita duas threads no mesmo arquivo)
+        unique = list({doc.id: doc for doc in documents}.values())
+        if not unique:
+            return
+        if self.use_manifest:
+            self._load_manifest()
+        paths = [self._get_document_path(doc.id, doc.module) for doc in unique]
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.save_workers, thread_name_prefix="fs-repo-save"
+            )
+        # Fatias contíguas (algumas por worker) em vez de uma tarefa por documento
+        pairs = list(zip(paths, unique))
+        step = max(1, -(-len(pairs) // (self.save_workers * 4)))
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, self._write_files, pairs[i:i + step])
+            for i in range(0, len(pairs), step)
+        ))
+        sizes = [size for chunk in results for size in chunk]
+        
+        for doc, path, size in zip(unique, paths, sizes):
+            self._record_write(doc, path, size)
+        self.flush_manifest()
     
     async def find_by_id(self, doc_id: str) -> Optional[Document]:
         """
@@ -80,23 +321,38 @@ class FileSystemRepository(IDocumentRepository):
             Optional[Document]: Document se encontrado
         """
         # Verificar cache primeiro
-        if doc_id in self._cache:
-            return self._cache[doc_id]
+        cached = self._cache.get(doc_id)
+        if cached is not None:
+            return cached
+        
+        if self.use_manifest:
+            file_path = self._manifest_path_for(doc_id)
+            if file_path is None:
+                return None
+            try:
+                doc = Document.from_dict(_read_document_file(file_path, self.compressor))
+            except FileNotFoundError:
+                # Removido por fora: manifesto desatualizado
+                self._forget(doc_id)
+                return None
+            self._cache.put(doc)
+            return doc
         
         # Buscar em todos os módulos
         for module_dir in self.base_dir.iterdir():
             if not module_dir.is_dir():
                 continue
             
-            for file_path in module_dir.glob("*.json"):
+            for file_path in _document_files(module_dir):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = _read_document_file(file_path, self.compressor)
                     
                     if data.get("id") == doc_id:
                         doc = Document.from_dict(data)
-                        self._cache[doc_id] = doc
+                        self._cache.put(doc)
                         return doc
+                except CompressionError:
+                    raise
                 except Exception:
                     continue
         
@@ -112,46 +368,82 @@ class FileSystemRepository(IDocumentRepository):
         Returns:
             Optional[Document]: Document se encontrado
         """
+        if self.use_manifest:
+            self._load_manifest()
+            doc_id = self._url_index.get(url)
+            return await self.find_by_id(doc_id) if doc_id else None
+        
         all_docs = await self.get_all()
         for doc in all_docs:
             if doc.url == url:
                 return doc
         return None
     
-    async def find_by_module(self, module: str) -> List[Document]:
+    async def find_by_module(self, module: str, use_cache: bool = True) -> List[Document]:
         """
         Busca todos os documentos de um módulo.
         
         Args:
             module: Nome do módulo
+            use_cache: Se False, não coloca os documentos lidos no cache
         
         Returns:
             List[Document]: Lista de documentos
         """
         documents = []
-        module_dir = self.base_dir / module
+        async for doc in self.iter_by_module(module):
+            documents.append(doc)
+            if use_cache:
+                self._cache.put(doc)
+        
+        return documents
+    
+    async def iter_by_module(self, module: str) -> AsyncIterator[Document]:
+        """
+        Itera os documentos de um módulo, um arquivo por vez (sem cache).
+        
+        Args:
+            module: Nome do módulo
         
-        if not module_dir.exists():
-            return documents
+        Yields:
+            Document: Documentos do módulo
+        """
+        module_dir = self.base_dir / module
+        if not module_dir.is_dir():
+            return
         
-        for file_path in module_dir.glob("*.json"):
+        for file_path in _document_files(module_dir):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                doc = Document.from_dict(data)
-                documents.append(doc)
-                self._cache[doc.id] = doc
-                
+                doc = Document.from_dict(_read_document_file(file_path, self.compressor))
+            except CompressionError:
+                raise
             except Exception:
                 continue
+            yield doc
+    
+    async def iter_all(self) -> AsyncIterator[Document]:
+        """
+        Itera todos os documentos, módulo a módulo, sem materializar a lista.
         
-        return documents
+        Yields:
+            Document: Documentos do repositório
+        """
+        for module_dir in self.base_dir.iterdir():
+            if not module_dir.is_dir():
+                continue
+            async for doc in self.iter_by_module(module_dir.name):
+                yield doc
     
-    async def get_all(self) -> List[Document]:
+    async def get_all(self, use_cache: bool = False) -> List[Document]:
         """
         Retorna todos os documentos.
         
+        Varredura em massa: por padrão não passa pelo cache, para não
+        despejar os documentos realmente consultados.
+        
+        Args:
+            use_cache: Se True, coloca os documentos lidos no cache
+        
         Returns:
             List[Document]: Lista de todos os documentos
         """
@@ -161,7 +453,7 @@ class FileSystemRepository(IDocumentRepository):
             if not module_dir.is_dir():
                 continue
             
-            module_docs = await self.find_by_module(module_dir.name)
+            module_docs = await self.find_by_module(module_dir.name, use_cache=use_cache)
             documents.extend(module_docs)
         
         return documents
@@ -176,19 +468,39 @@ class FileSystemRepository(IDocumentRepository):
         Returns:
             bool: True se removido
         """
+        if self.use_manifest:
+            file_path = self._manifest_path_for(doc_id)
+            if file_path is None:
+                return False
+            self._forget(doc_id)
+            try:
+                file_path.unlink()
+                return True
+            except FileNotFoundError:
+                return False
+            finally:
+                self._write_manifest()
+        
         doc = await self.find_by_id(doc_id)
         if not doc:
             return False
         
         file_path = self._get_document_path(doc_id, doc.module)
+        # O documento pode ter sido gravado com outro encoding (.json / .json.gz)
+        stem = file_path.name.split(".", 1)[0]
+        candidates = [file_path.with_name(f"{stem}.json"), file_path.with_name(f"{stem}.json.gz")]
         
-        try:
-            file_path.unlink()
-            if doc_id in self._cache:
-                del self._cache[doc_id]
-            return True
-        except Exception:
-            return False
+        removed = False
+        for candidate in candidates:
+            try:
+                candidate.unlink()
+                removed = True
+            except FileNotFoundError:
+                continue
+            except Exception:
+                return False
+        self._cache.pop(doc_id)
+        return removed
     
     async def exists(self, doc_id: str) -> bool:
         """
@@ -200,6 +512,8 @@ class FileSystemRepository(IDocumentRepository):
         Returns:
             bool: True se existe
         """
+        if self.use_manifest:
+            return doc_id in self._load_manifest()
         return await self.find_by_id(doc_id) is not None
     
     async def count(self) -> int:
@@ -209,10 +523,13 @@ class FileSystemRepository(IDocumentRepository):
         Returns:
             int: Número de documentos
         """
+        if self.use_manifest:
+            return len(self._load_manifest())
+        
         count = 0
         for module_dir in self.base_dir.iterdir():
             if module_dir.is_dir():
-                count += len(list(module_dir.glob("*.json")))
+                count += sum(1 for _ in _document_files(module_dir))
         return count
     
     async def save_metadata(self, metadata: DocumentMetadata) -> None:
@@ -243,11 +560,7 @@ class FileSystemRepository(IDocumentRepository):
         try:
             with open(metadata_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
-            # Criar DocumentMetadata a partir do dict
-            # (simplificado, pode precisar de from_dict personalizado)
-            return None  # TODO: implementar from_dict em DocumentMetadata
-            
+            return DocumentMetadata.from_dict(data)
         except Exception:
             return None
     
@@ -261,17 +574,18 @@ class FileSystemRepository(IDocumentRepository):
         Returns:
             int: Número de documentos exportados
         """
-        documents = await self.get_all()
-        
         output_path = Path(filepath)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Streaming: um documento por vez em memória
+        count = 0
         with open(output_path, 'w', encoding='utf-8') as f:
-            for doc in documents:
+            async for doc in self.iter_all():
                 json.dump(doc.to_dict(), f, ensure_ascii=False)
                 f.write('\n')
+                count += 1
         
-        return len(documents)
+        return count
     
     async def clear(self) -> None:
         """
@@ -286,3 +600,16 @@ class FileSystemRepository(IDocumentRepository):
             self.base_dir.mkdir(parents=True, exist_ok=True)
         
         self._cache.clear()
+        self._known_dirs.clear()
+        self._url_index.clear()
+        self._manifest = None
+        if self.use_manifest:
+            self._manifest = {}
+            self._write_manifest()
+    
+    def close(self) -> None:
+        """Grava o manifesto pendente e encerra o pool de escrita"""
+        self.flush_manifest()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,399 @@
+"""
+Adapter - Lease Work Queue
+
+Implementação em memória de IWorkQueue com leases e visibility timeout,
+usada pelo servidor da fila (orchestrator) e diretamente em testes.
+Itens são agrupados por módulo/versão e entregues preferencialmente ao
+worker dono da chave num anel de hash consistente (afinidade de cache).
+Inclui o loop de worker genérico (run_queue_worker), que funciona tanto
+com a fila local quanto com o cliente HTTP.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from libs.scrapers.adapters.consistent_hash import ConsistentHashRing, module_shard_key
+from libs.scrapers.ports.work_queue import IWorkQueue, Lease, WorkItem
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ActiveLease:
+    """Lease em andamento: itens ainda sem ack/nack e prazo de expiração"""
+    
+    def __init__(self, lease_id: str, worker_id: str, item_ids: List[str], timeout: float):
+        self.lease_id = lease_id
+        self.worker_id = worker_id
+        self.outstanding = set(item_ids)
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+
+
+class LeaseWorkQueue(IWorkQueue):
+    """
+    Fila de trabalho em memória com lease.
+    
+    Características:
+    - Lotes entregues por lease, invisíveis para outros workers até expirar
+    - Heartbeat renova o lease; lease expirado devolve os itens pendentes
+      para o início da fila
+    - nack (ou expiração) conta uma tentativa; após max_attempts o item
+      vai para dead_letters
+    - Resultados confirmados ficam em results até collect_results()
+    - A fila só esvazia (drained) depois de close_input(): workers que
+      chegam antes das URLs aguardam em vez de encerrar
+    - Afinidade: cada chave (módulo + versão) tem um worker dono no anel
+      de hash consistente; sem itens próprios, o worker rouba do maior
+      grupo pendente. Workers entram no anel ao pedir lease e saem após
+      worker_ttl sem contato, movendo só as chaves deles
+    """
+    
+    def __init__(
+        self,
+        visibility_timeout: float = 60.0,
+        max_attempts: int = 3,
+        affinity: bool = True,
+        key_func: Callable[[str], str] = module_shard_key,
+        worker_ttl: Optional[float] = None,
+    ):
+        """
+        Inicializa fila.
+        
+        Args:
+            visibility_timeout: Prazo padrão (s) de um lease sem heartbeat
+            max_attempts: Entregas por item antes de ir para dead letters
+            affinity: Se entrega itens da mesma chave ao mesmo worker
+            key_func: Função url -> chave de afinidade
+            worker_ttl: Segundos sem contato até o worker sair do anel
+                (padrão: 2x visibility_timeout)
+        """
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.affinity = affinity
+        self.key_func = key_func
+        self.worker_ttl = worker_ttl or 2 * visibility_timeout
+        
+        self._ids = itertools.count(1)
+        self._items: Dict[str, WorkItem] = {}
+        self._item_keys: Dict[str, str] = {}
+        # Itens prontos agrupados por chave de afinidade (ordem de chegada)
+        self._ready: Dict[str, Deque[str]] = {}
+        self._leases: Dict[str, _ActiveLease] = {}
+        self._ring = ConsistentHashRing()
+        self._worker_seen: Dict[str, float] = {}
+        self.stolen = 0
+        self.input_closed = False
+        
+        self.results: List[Tuple[WorkItem, Any]] = []
+        self.dead_letters: List[WorkItem] = []
+        self.completed = 0
+        self.expired_leases = 0
+        self.workers: Dict[str, Dict[str, Any]] = {}
+    
+    def qsize(self) -> int:
+        """Itens prontos para serem entregues"""
+        return sum(len(bucket) for bucket in self._ready.values())
+    
+    def in_flight(self) -> int:
+        """Itens entregues e ainda sem ack/nack"""
+        return sum(len(lease.outstanding) for lease in self._leases.values())
+    
+    def is_drained(self) -> bool:
+        """Entrada fechada, fila vazia e nenhum lease pendente"""
+        self._reclaim_expired()
+        return self.input_closed and not self._ready and not self._leases
+    
+    def _worker_stats(self, worker_id: str) -> Dict[str, Any]:
+        return self.workers.setdefault(worker_id, {
+            "leased": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "last_heartbeat": None,
+        })
+    
+    def _touch(self, worker_id: str) -> None:
+        self._worker_stats(worker_id)["last_heartbeat"] = datetime.now()
+        self._worker_seen[worker_id] = time.monotonic()
+        self._ring.add_node(worker_id)
+    
+    def _push(self, item_id: str, front: bool = False) -> None:
+        bucket = self._ready.setdefault(self._item_keys[item_id], deque())
+        if front:
+            bucket.appendleft(item_id)
+        else:
+            bucket.append(item_id)
+    
+    def _forget(self, item_id: str) -> WorkItem:
+        self._item_keys.pop(item_id, None)
+        return self._items.pop(item_id)
+    
+    def _take(self, worker_id: str, max_items: int) -> List[WorkItem]:
+        """Retira itens prontos: primeiro chaves do worker, depois rouba do maior grupo"""
+        own = [key for key in self._ready if self._ring.get_node(key) == worker_id]
+        own_keys = set(own)
+        others = sorted(
+            (key for key in self._ready if key not in own_keys),
+            key=lambda key: -len(self._ready[key]),
+        )
+        items = []
+        for key in own + others:
+            bucket = self._ready[key]
+            while bucket and len(items) < max_items:
+                items.append(self._items[bucket.popleft()])
+                if key not in own_keys:
+                    self.stolen += 1
+            if not bucket:
+                del self._ready[key]
+            if len(items) >= max_items:
+                break
+        return items
+    
+    def _retry_or_dead(self, item: WorkItem, error: Optional[str], front: bool = False) -> None:
+        item.last_error = error
+        if item.attempts >= self.max_attempts:
+            self.dead_letters.append(item)
+            self._forget(item.item_id)
+            logger.warning(f"Dead letter after {item.attempts} attempts: {item.url} ({error})")
+        else:
+            self._push(item.item_id, front=front)
+    
+    def _prune_workers(self, now: float) -> None:
+        """Tira do anel workers sem contato há worker_ttl e sem leases ativos"""
+        active = {lease.worker_id for lease in self._leases.values()}
+        for worker_id, seen in list(self._worker_seen.items()):
+            if now - seen > self.worker_ttl and worker_id not in active:
+                del self._worker_seen[worker_id]
+                self._ring.remove_node(worker_id)
+                logger.info(f"Worker {worker_id} left the hash ring")
+    
+    def _reclaim_expired(self) -> None:
+        """Devolve à fila os itens de leases vencidos"""
+        now = time.monotonic()
+        for lease in [l for l in self._leases.values() if l.deadline <= now]:
+            del self._leases[lease.lease_id]
+            self.expired_leases += 1
+            logger.warning(
+                f"Lease {lease.lease_id} of {lease.worker_id} expired, "
+                f"requeueing {len(lease.outstanding)} items"
+            )
+            for item_id in sorted(lease.outstanding, key=int, reverse=True):
+                self._retry_or_dead(self._items[item_id], "lease expired", front=True)
+        self._prune_workers(now)
+    
+    def _release_item(self, lease_id: str, item_id: str) -> Optional[_ActiveLease]:
+        """Remove o item do lease; None se lease/item não são mais válidos"""
+        self._reclaim_expired()
+        lease = self._leases.get(lease_id)
+        if lease is None or item_id not in lease.outstanding:
+            return None
+        lease.outstanding.discard(item_id)
+        if not lease.outstanding:
+            del self._leases[lease_id]
+        return lease
+    
+    async def enqueue(self, urls: List[str], metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Adiciona URLs à fila (RuntimeError depois de close_input)"""
+        if self.input_closed:
+            raise RuntimeError("Fila fechada para novas URLs (close_input já foi chamado)")
+        item_ids = []
+        for url in urls:
+            item = WorkItem(item_id=str(next(self._ids)), url=url, metadata=dict(metadata or {}))
+            self._items[item.item_id] = item
+            self._item_keys[item.item_id] = self.key_func(url) if self.affinity else ""
+            self._push(item.item_id)
+            item_ids.append(item.item_id)
+        return item_ids
+    
+    async def close_input(self) -> None:
+        """Sinaliza que não haverá mais enqueue"""
+        self.input_closed = True
+    
+    async def lease(
+        self,
+        worker_id: str,
+        max_items: int = 10,
+        visibility_timeout: Optional[float] = None
+    ) -> Lease:
+        """Entrega até max_items itens prontos ao worker"""
+        self._reclaim_expired()
+        self._touch(worker_id)
+        timeout = visibility_timeout or self.visibility_timeout
+        
+        items = self._take(worker_id, max_items)
+        for item in items:
+            item.attempts += 1
+        
+        if not items:
+            return Lease(lease_id="", worker_id=worker_id, drained=self.input_closed and not self._leases)
+        
+        lease = _ActiveLease(uuid.uuid4().hex[:12], worker_id, [i.item_id for i in items], timeout)
+        self._leases[lease.lease_id] = lease
+        self._worker_stats(worker_id)["leased"] += len(items)
+        return Lease(
+            lease_id=lease.lease_id,
+            worker_id=worker_id,
+            items=[WorkItem.from_dict(item.to_dict()) for item in items],
+            expires_in=timeout,
+        )
+    
+    async def heartbeat(self, lease_id: str) -> bool:
+        """Renova o prazo do lease"""
+        self._reclaim_expired()
+        lease = self._leases.get(lease_id)
+        if lease is None:
+            return False
+        lease.deadline = time.monotonic() + lease.timeout
+        self._touch(lease.worker_id)
+        return True
+    
+    async def ack(self, lease_id: str, item_id: str, result: Any = None) -> bool:
+        """Confirma item processado e guarda o resultado"""
+        lease = self._release_item(lease_id, item_id)
+        if lease is None:
+            return False
+        item = self._forget(item_id)
+        self.results.append((item, result))
+        self.completed += 1
+        self._worker_stats(lease.worker_id)["succeeded"] += 1
+        self._touch(lease.worker_id)
+        return True
+    
+    async def nack(self, lease_id: str, item_id: str, error: Optional[str] = None) -> bool:
+        """Devolve item que falhou para o fim da fila (ou dead letters)"""
+        lease = self._release_item(lease_id, item_id)
+        if lease is None:
+            return False
+        self._worker_stats(lease.worker_id)["failed"] += 1
+        self._touch(lease.worker_id)
+        self._retry_or_dead(self._items[item_id], error)
+        return True
+    
+    def collect_results(self) -> List[Tuple[WorkItem, Any]]:
+        """Retorna e limpa os resultados confirmados até agora"""
+        results, self.results = self.results, []
+        return results
+    
+    async def join(self, timeout: Optional[float] = None, poll_interval: float = 0.5) -> bool:
+        """
+        Aguarda a fila esvaziar (inclusive leases em andamento) depois
+        de close_input().
+        
+        Returns:
+            True se esvaziou, False se o timeout venceu antes
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_drained():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll_interval)
+        return True
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores da fila e por worker"""
+        self._reclaim_expired()
+        return {
+            "ready": self.qsize(),
+            "in_flight": self.in_flight(),
+            "leases": len(self._leases),
+            "completed": self.completed,
+            "dead_letters": len(self.dead_letters),
+            "expired_leases": self.expired_leases,
+            "stolen": self.stolen,
+            "input_closed": self.input_closed,
+            "ring_workers": len(self._ring),
+            "ready_keys": len(self._ready),
+            "workers": {
+                worker_id: dict(stats, last_heartbeat=(
+                    stats["last_heartbeat"].isoformat() if stats["last_heartbeat"] else None
+                ))
+                for worker_id, stats in self.workers.items()
+            },
+        }
+
+
+async def run_queue_worker(
+    queue: IWorkQueue,
+    worker_id: str,
+    process_func: Callable[[List[str]], Awaitable[Dict[str, Tuple[bool, Any]]]],
+    batch_size: int = 10,
+    visibility_timeout: Optional[float] = None,
+    heartbeat_interval: float = 10.0,
+    poll_interval: float = 2.0,
+    stop_when_drained: bool = True,
+) -> Dict[str, int]:
+    """
+    Loop de worker: lease de um lote, processa, ack/nack por item.
+    
+    Um heartbeat em paralelo mantém o lease vivo enquanto o lote é
+    processado (lotes longos não expiram).
+    
+    Args:
+        queue: Fila local (LeaseWorkQueue) ou cliente HTTP
+        worker_id: Identificador do worker
+        process_func: Recebe as URLs do lote e devolve {url: (sucesso, resultado ou erro)}
+        batch_size: Itens por lease
+        visibility_timeout: Prazo do lease (padrão da fila se None)
+        heartbeat_interval: Intervalo (s) entre heartbeats
+        poll_interval: Espera (s) quando não há itens prontos
+        stop_when_drained: Encerra quando a fila informar que esvaziou
+            (entrada fechada, sem itens nem leases)
+    
+    Returns:
+        Contadores do worker (leases, succeeded, failed, lost = ack/nack
+        recusado porque o lease expirou)
+    """
+    stats = {"leases": 0, "succeeded": 0, "failed": 0, "lost": 0}
+    
+    async def keep_alive(lease_id: str) -> None:
+        while True:
+            await asyncio.sleep(heartbeat_interval)
+            if not await queue.heartbeat(lease_id):
+                logger.warning(f"Worker {worker_id}: lease {lease_id} lost")
+                return
+    
+    while True:
+        lease = await queue.lease(worker_id, batch_size, visibility_timeout)
+        if not lease.items:
+            if lease.drained and stop_when_drained:
+                break
+            await asyncio.sleep(poll_interval)
+            continue
+        
+        stats["leases"] += 1
+        heartbeat_task = asyncio.create_task(keep_alive(lease.lease_id))
+        try:
+            try:
+                outcomes = await process_func([item.url for item in lease.items])
+            except Exception as e:
+                outcomes = {item.url: (False, str(e)) for item in lease.items}
+            
+            for item in lease.items:
+                success, payload = outcomes.get(item.url, (False, "no result"))
+                if success:
+                    accepted = await queue.ack(lease.lease_id, item.item_id, payload)
+                else:
+                    accepted = await queue.nack(lease.lease_id, item.item_id, str(payload))
+                if not accepted:
+                    # Lease expirou: o item já voltou para a fila e será entregue de novo
+                    logger.warning(f"Worker {worker_id}: lease {lease.lease_id} lost, {item.url} not confirmed")
+                    stats["lost"] += 1
+                elif success:
+                    stats["succeeded"] += 1
+                else:
+                    stats["failed"] += 1
+        finally:
+            heartbeat_task.cancel()
+            await asyncio.gather(heartbeat_task, return_exceptions=True)
+    
+    logger.info(
+        f"✅ Worker {worker_id} finished: {stats['succeeded']} succeeded, "
+        f"{stats['failed']} failed, {stats['lost']} lost in {stats['leases']} leases"
+    )
+    return stats
@@ -0,0 +1,328 @@
+"""
+Adapter - Multiprocess Scrape Coordinator
+
+Implementação de IScrapeCoordinator que distribui URLs entre K processos.
+Cada processo tem seu próprio Chromium e PlaywrightWorkerPool; documentos
+voltam por uma multiprocessing.Queue à medida que ficam prontos e são
+consolidados num único ScrapingResult.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from libs.scrapers.adapters.consistent_hash import shard_urls_by_key
+from libs.scrapers.domain import Document, DocumentSource, DocumentType, ScrapingResult
+from libs.scrapers.ports.scrape_coordinator import IScrapeCoordinator
+
+
+logger = logging.getLogger(__name__)
+
+# Fábrica de worker: recebe o pool do processo e devolve worker_func(url, worker_id)
+WorkerFactory = Callable[[Any], Callable[..., Awaitable[Any]]]
+
+DEFAULT_POOL_FACTORY = "libs.scrapers.adapters.playwright_worker_pool:PlaywrightWorkerPool"
+DEFAULT_WORKER_FACTORY = "libs.scrapers.adapters.multiprocess_coordinator:page_document_worker"
+
+
+def resolve_callable(target: Union[str, Callable]) -> Callable:
+    """
+    Resolve "pacote.modulo:atributo" para o objeto.
+    
+    Processos spawn não herdam closures; fábricas devem ser importáveis
+    (função de módulo ou caminho em string).
+    """
+    if callable(target):
+        return target
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def shard_urls(urls: List[str], num_shards: int) -> List[List[str]]:
+    """Distribui URLs em num_shards partições (round-robin, preserva ordem relativa)"""
+    num_shards = max(1, num_shards)
+    return [urls[i::num_shards] for i in range(num_shards)]
+
+
+def page_document_worker(pool: Any) -> Callable[..., Awaitable[Document]]:
+    """Worker padrão: navega com a página emprestada e monta um Document com o texto visível"""
+    async def worker(url: str, worker_id: int, page: Any = None) -> Document:
+        page = page or pool.pages[worker_id]
+        started = time.time()
+        await page.goto(url, wait_until="domcontentloaded")
+        title = (await page.title()) or url
+        content = await page.evaluate("() => document.body ? document.body.innerText : ''")
+        
+        parsed = urlparse(url)
+        path_parts = [p for p in parsed.path.split("/") if p]
+        if "documentacao.senior.com.br" in parsed.netloc:
+            source = DocumentSource.SENIOR_MADCAP if parsed.fragment else DocumentSource.SENIOR_ASTRO
+        else:
+            source = DocumentSource.UNKNOWN
+        
+        return Document(
+            id=hashlib.md5(url.encode()).hexdigest()[:16],
+            url=url,
+            title=title,
+            content=content,
+            module=path_parts[0] if path_parts else "unknown",
+            doc_type=DocumentType.TECHNICAL_DOC,
+            source=source,
+            processed_by_worker=worker_id,
+            scraping_duration_seconds=time.time() - started,
+        )
+    
+    return worker
+
+
+async def _put_message(out_queue: Any, message: Tuple[str, int, Any]) -> None:
+    """Envia message sem travar o event loop quando out_queue (limitada) está cheia"""
+    await asyncio.to_thread(out_queue.put, message)
+
+
+async def run_shard(
+    shard_id: int,
+    urls: List[str],
+    out_queue: Any,
+    worker_factory: Union[str, WorkerFactory] = DEFAULT_WORKER_FACTORY,
+    pool_factory: Union[str, Callable] = DEFAULT_POOL_FACTORY,
+    pool_kwargs: Optional[Dict[str, Any]] = None,
+    pages: int = 3,
+    max_retries: int = 2,
+) -> None:
+    """
+    Processa uma partição de URLs com um pool próprio.
+    
+    Mensagens enviadas em out_queue:
+    - ("document", shard_id, dict)  a cada documento concluído
+    - ("error", shard_id, str)      para cada URL que falhou em todas as tentativas
+    - ("done", shard_id, stats)     ao final da partição
+    """
+    pool = resolve_callable(pool_factory)(**(pool_kwargs or {}))
+    stats: Dict[str, Any] = {"urls": len(urls), "documents": 0, "failed": 0}
+    
+    try:
+        await pool.initialize(max(1, min(pages, len(urls))))
+        page_worker = resolve_callable(worker_factory)(pool)
+        
+        async def streaming_worker(url: str, worker_id: int) -> None:
+            doc = await page_worker(url, worker_id)
+            if isinstance(doc, Document):
+                doc.metadata.setdefault("shard", shard_id)
+                doc = doc.to_dict()
+            # Documento sai do processo imediatamente; nada acumula no pool
+            await _put_message(out_queue, ("document", shard_id, doc))
+            stats["documents"] += 1
+        
+        results = await pool.process_urls_with_retry(
+            urls, streaming_worker, max_retries=max_retries, show_progress=False
+        )
+        
+        succeeded = {r.url for r in results if r.success}
+        last_error: Dict[str, str] = {}
+        for r in results:
+            if not r.success:
+                last_error[r.url] = r.error or "unknown error"
+        for url, error in last_error.items():
+            if url not in succeeded:
+                await _put_message(out_queue, ("error", shard_id, f"Failed to scrape {url}: {error}"))
+                stats["failed"] += 1
+        
+        if hasattr(pool, "get_recycle_stats"):
+            stats["recycle"] = pool.get_recycle_stats()
+    except Exception as e:
+        # Falha do pool (ex: Chromium não inicia): o que não virou documento conta como falha
+        stats["crashed"] = True
+        stats["failed"] = len(urls) - stats["documents"]
+        await _put_message(out_queue, ("error", shard_id, f"Shard {shard_id} crashed: {e}"))
+    finally:
+        try:
+            await pool.close()
+        finally:
+            await _put_message(out_queue, ("done", shard_id, stats))
+
+
+def _process_main(shard_id: int, urls: List[str], out_queue: Any, options: Dict[str, Any]) -> None:
+    """Ponto de entrada do processo filho"""
+    asyncio.run(run_shard(shard_id, urls, out_queue, **options))
+
+
+class ResultAggregator:
+    """Consolida mensagens das partições num ScrapingResult"""
+    
+    def __init__(self, on_document: Optional[Callable[[Document], None]] = None):
+        """
+        Args:
+            on_document: Callback chamado para cada documento recebido (ex: persistir em streaming)
+        """
+        self.on_document = on_document
+        self.documents: List[Document] = []
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.shard_stats: Dict[int, Dict[str, Any]] = {}
+    
+    def add(self, message: Tuple[str, int, Any]) -> None:
+        """Registra uma mensagem ("document" | "error" | "done")"""
+        kind, shard_id, payload = message
+        if kind == "document":
+            try:
+                doc = Document.from_dict(payload)
+            except (KeyError, ValueError) as e:
+                self.errors.append(f"Invalid document from shard {shard_id}: {e}")
+                return
+            self.documents.append(doc)
+            if self.on_document:
+                self.on_document(doc)
+        elif kind == "error":
+            self.errors.append(payload)
+        elif kind == "done":
+            self.shard_stats[shard_id] = payload
+    
+    def build(self, started_at: datetime, source_urls: List[str], failed: int = 0) -> ScrapingResult:
+        """Monta o ScrapingResult final"""
+        failed += sum(stats.get("failed", 0) for stats in self.shard_stats.values())
+        return ScrapingResult(
+            documents=tuple(self.documents),
+            total_documents=len(self.documents),
+            successful_scrapes=len(self.documents),
+            failed_scrapes=failed,
+            skipped_urls=0,
+            started_at=started_at,
+            finished_at=datetime.now(),
+            source_urls=tuple(source_urls),
+            errors=tuple(self.errors),
+            warnings=tuple(self.warnings),
+            metadata={"shards": self.shard_stats},
+        )
+
+
+class MultiprocessScrapeCoordinator(IScrapeCoordinator):
+    """
+    Coordenador que escala o scraping pelos núcleos da máquina.
+    
+    Características:
+    - K processos (padrão: os.cpu_count()), cada um com Chromium e pool próprios
+    - Start method "spawn" (Playwright não é seguro com fork)
+    - Documentos chegam em streaming pela fila, com limite de tamanho (backpressure)
+    - Processo que morre sem finalizar tem suas URLs contadas como falha
+    - Particionamento por módulo/versão (hash consistente com carga limitada):
+      cada Chromium reaproveita o cache de CSS/JS/TOC do módulo
+    """
+    
+    def __init__(
+        self,
+        worker_factory: Union[str, WorkerFactory] = DEFAULT_WORKER_FACTORY,
+        num_processes: Optional[int] = None,
+        pages_per_process: int = 3,
+        pool_factory: Union[str, Callable] = DEFAULT_POOL_FACTORY,
+        pool_kwargs: Optional[Dict[str, Any]] = None,
+        max_retries: int = 2,
+        queue_maxsize: int = 1000,
+        start_method: str = "spawn",
+        on_document: Optional[Callable[[Document], None]] = None,
+        sharding: str = "module",
+    ):
+        """
+        Inicializa coordenador.
+        
+        Args:
+            worker_factory: Fábrica (ou "modulo:funcao") que recebe o pool e devolve worker_func
+            num_processes: Número de processos (padrão: núcleos disponíveis)
+            pages_per_process: Páginas Playwright por processo
+            pool_factory: Classe/fábrica do pool (ou "modulo:Classe")
+            pool_kwargs: Argumentos para o pool (headless, timeout, limites de reciclagem)
+            max_retries: Tentativas por URL dentro de cada processo
+            queue_maxsize: Tamanho máximo da fila de resultados
+            start_method: Método de criação de processos do multiprocessing
+            on_document: Callback para cada documento recebido
+            sharding: "module" (afinidade por módulo/versão) ou "round_robin"
+        """
+        if sharding not in ("module", "round_robin"):
+            raise ValueError(f"Unknown sharding strategy: {sharding}")
+        self.worker_factory = worker_factory
+        self.num_processes = num_processes or os.cpu_count() or 1
+        self.pages_per_process = pages_per_process
+        self.pool_factory = pool_factory
+        self.pool_kwargs = pool_kwargs or {}
+        self.max_retries = max_retries
+        self.queue_maxsize = queue_maxsize
+        self.start_method = start_method
+        self.on_document = on_document
+        self.sharding = sharding
+    
+    def get_num_executors(self) -> int:
+        """Retorna número de processos"""
+        return self.num_processes
+    
+    def shard(self, urls: List[str]) -> List[List[str]]:
+        """Particiona URLs entre os processos (só partições não vazias)"""
+        if self.sharding == "module":
+            shards = shard_urls_by_key(urls, self.num_processes)
+        else:
+            shards = shard_urls(urls, self.num_processes)
+        return [shard for shard in shards if shard]
+    
+    async def run(self, urls: List[str]) -> ScrapingResult:
+        """Executa as partições em processos e consolida os resultados"""
+        started_at = datetime.now()
+        shards = self.shard(urls)
+        aggregator = ResultAggregator(on_document=self.on_document)
+        if not shards:
+            return aggregator.build(started_at, urls)
+        
+        ctx = mp.get_context(self.start_method)
+        out_queue = ctx.Queue(maxsize=self.queue_maxsize)
+        options = {
+            "worker_factory": self.worker_factory,
+            "pool_factory": self.pool_factory,
+            "pool_kwargs": self.pool_kwargs,
+            "pages": self.pages_per_process,
+            "max_retries": self.max_retries,
+        }
+        processes = [
+            ctx.Process(target=_process_main, args=(shard_id, shard, out_queue, options), daemon=True)
+            for shard_id, shard in enumerate(shards)
+        ]
+        for process in processes:
+            process.start()
+        logger.info(f"✅ Started {len(processes)} scraping processes for {len(urls)} URLs")
+        
+        loop = asyncio.get_running_loop()
+        pending = set(range(len(shards)))
+        lost = 0
+        while pending:
+            try:
+                message = await loop.run_in_executor(None, out_queue.get, True, 1.0)
+            except queue.Empty:
+                # Processo morto sem "done" (OOM, kill): contabiliza a partição como perdida
+                for shard_id in list(pending):
+                    if not processes[shard_id].is_alive():
+                        pending.discard(shard_id)
+                        reported = aggregator.shard_stats.get(shard_id)
+                        if reported is None:
+                            lost += len(shards[shard_id])
+                            aggregator.errors.append(
+                                f"Shard {shard_id} exited with code {processes[shard_id].exitcode}"
+                            )
+                continue
+            aggregator.add(message)
+            if message[0] == "done":
+                pending.discard(message[1])
+        
+        for process in processes:
+            process.join(timeout=10)
+        
+        result = aggregator.build(started_at, urls, failed=lost)
+        logger.info(
+            f"✅ Multiprocess scraping finished: {result.total_documents} documents, "
+            f"{result.failed_scrapes} failed ({result.duration_seconds:.1f}s)"
+        )
+        return result
@@ -8,6 +8,7 @@ Abstrai detalhes do Playwright para o resto da aplicação.
 from typing import List, Dict, Any, Optional
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 from libs.scrapers.ports import IContentExtractor
+from libs.scrapers.adapters.asset_cache import AssetCache
 
 
 class PlaywrightExtractor(IContentExtractor):
@@ -23,6 +24,7 @@ class PlaywrightExtractor(IContentExtractor):
         headless: bool = True,
         timeout: int = 30000,
         user_agent: Optional[str] = None,
+        asset_cache: Optional[AssetCache] = None,
     ):
         """
         Inicializa extractor.
@@ -31,10 +33,12 @@ class PlaywrightExtractor(IContentExtractor):
             headless: Se True, roda browser em modo headless
             timeout: Timeout padrão em milissegundos
             user_agent: User agent customizado (opcional)
+            asset_cache: Cache em disco de CSS/JS/imagens (opcional)
         """
         self.headless = headless
         self.timeout = timeout
         self.user_agent = user_agent
+        self.asset_cache = asset_cache
         
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
@@ -54,6 +58,8 @@ class PlaywrightExtractor(IContentExtractor):
             } if self.user_agent else {}
             
             self._context = await self._browser.new_context(**context_options)
+            if self.asset_cache:
+                await self.asset_cache.attach(self._context)
         
         return self._browser
     
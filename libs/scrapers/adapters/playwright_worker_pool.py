@@ -6,18 +6,32 @@ gerenciar múltiplas páginas em paralelo e processar URLs concorrentemente.
 """
 
 import asyncio
+import itertools
+import random
 import time
 import logging
-from typing import List, Callable, Any, Optional
+from contextlib import asynccontextmanager
+from typing import List, Callable, Any, Optional, Dict, Tuple, AsyncIterator
 from datetime import datetime
+from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 
 from libs.scrapers.ports.browser_worker_pool import IBrowserWorkerPool, WorkerResult
+from libs.scrapers.ports.rate_limiter import IRateLimiter, rate_limited
+from libs.scrapers.adapters.asset_cache import AssetCache
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 
 logger = logging.getLogger(__name__)
 
+# Uso de heap JS da página (Chromium expõe performance.memory)
+JS_HEAP_SCRIPT = "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+
 
 class PlaywrightWorkerPool(IBrowserWorkerPool):
     """
@@ -26,21 +40,75 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
     Características:
     - Múltiplas páginas no mesmo contexto (compartilham cookies/cache)
     - asyncio.Semaphore para limitar concorrência
-    - asyncio.Queue para distribuição de URLs entre workers
+    - Fila de prioridade própria por chamada; páginas emprestadas de um
+      conjunto compartilhado, então chamadas concorrentes (vários módulos)
+      dividem as páginas sem roubar URLs umas das outras
+    - worker_func recebe a página emprestada (url, worker_id, page)
     - Logging detalhado de duração e erros por worker
     - Retry automático com fallback para processamento sequencial
+    - Resultados em streaming (iter_results) com retry por URL, backoff com
+      jitter e lista de dead letters
+    - Rate limit opcional por host (IRateLimiter), alimentado pelo status da navegação
+    - Reciclagem de páginas/contexto por orçamento de navegações e limites de
+      memória (heap JS da página, RSS do Chromium via psutil)
+    - Cache de assets em disco opcional (AssetCache), compartilhado entre
+      contextos recriados, workers e execuções
     """
     
-    def __init__(self, headless: bool = True, timeout: int = 30000):
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout: int = 30000,
+        rate_limiter: Optional[IRateLimiter] = None,
+        max_navigations_per_page: Optional[int] = 200,
+        max_navigations_per_context: Optional[int] = 2000,
+        max_js_heap_mb: Optional[float] = 512,
+        max_rss_mb: Optional[float] = None,
+        memory_check_interval: int = 10,
+        asset_cache: Optional[AssetCache] = None,
+    ):
         """
         Inicializa o pool.
         
         Args:
             headless: Se deve rodar Playwright em modo headless
             timeout: Timeout padrão para operações (ms)
+            rate_limiter: Limitador por host compartilhado (opcional)
+            max_navigations_per_page: URLs por página antes de recriá-la (None desativa)
+            max_navigations_per_context: URLs por contexto antes de recriá-lo (None desativa)
+            max_js_heap_mb: Heap JS da página que força recriar a página (None desativa)
+            max_rss_mb: RSS total do Chromium que força recriar o contexto (requer psutil)
+            memory_check_interval: A cada quantas URLs por página checar memória
+            asset_cache: Cache de CSS/JS/imagens servido por interceptação de rotas (opcional)
         """
         self.headless = headless
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        
+        self.max_navigations_per_page = max_navigations_per_page
+        self.max_navigations_per_context = max_navigations_per_context
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_rss_mb = max_rss_mb if psutil else None
+        self.memory_check_interval = max(1, memory_check_interval)
+        self.asset_cache = asset_cache
+        
+        # Estado de reciclagem: navegações por página/contexto e barreira do contexto
+        self._page_navigations: List[int] = []
+        self._context_navigations = 0
+        self._active_tasks = 0
+        self._recycling_context = False
+        self._context_condition: Optional[asyncio.Condition] = None
+        self.recycle_stats = {
+            'pages_recycled': 0,
+            'contexts_recycled': 0,
+            'navigation_budget': 0,
+            'js_heap_watermark': 0,
+            'rss_watermark': 0,
+        }
+        # Último status de navegação por worker: (status, Retry-After)
+        self._last_navigation: Dict[int, Tuple[int, Optional[str]]] = {}
+        # URLs que esgotaram as tentativas, somando todas as chamadas de iter_results
+        self.dead_letters: List[WorkerResult] = []
         
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
@@ -48,7 +116,9 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
         
         self.num_workers = 0
         self.semaphore: Optional[asyncio.Semaphore] = None
-        self.queue: Optional[asyncio.Queue] = None
+        # Índices das páginas livres (empréstimo) e filas das chamadas em andamento
+        self._free_pages: Optional[asyncio.Queue] = None
+        self._pending_queues: List[asyncio.Queue] = []
         
         self.logger = logging.getLogger(__name__)
     
@@ -57,21 +127,15 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
         try:
             self.num_workers = num_workers
             self.semaphore = asyncio.Semaphore(num_workers)
-            self.queue = asyncio.Queue()
+            self._free_pages = None
+            self._context_condition = asyncio.Condition()
             
             # Iniciar Playwright
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(headless=self.headless)
-            self.context = await self.browser.new_context()
-            
-            # Criar páginas (workers)
-            self.pages = [
-                await self.context.new_page() for _ in range(num_workers)
-            ]
             
-            # Configurar timeout padrão
-            for page in self.pages:
-                page.set_default_timeout(self.timeout)
+            # Criar contexto e páginas (workers)
+            await self._open_context()
             
             self.logger.info(f"✅ Initialized PlaywrightWorkerPool with {num_workers} workers")
             
@@ -79,6 +143,124 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
             self.logger.error(f"❌ Failed to initialize worker pool: {e}")
             raise
     
+    async def _new_page(self, worker_id: int) -> Page:
+        """Cria página do worker no contexto atual com timeout e listeners"""
+        page = await self.context.new_page()
+        page.set_default_timeout(self.timeout)
+        if self.rate_limiter:
+            page.on("response", self._navigation_listener(worker_id))
+        return page
+    
+    async def _open_context(self) -> None:
+        """Cria um contexto novo com uma página por worker"""
+        self.context = await self.browser.new_context()
+        if self.asset_cache:
+            await self.asset_cache.attach(self.context)
+        self.pages = [await self._new_page(i) for i in range(self.num_workers)]
+        self._page_navigations = [0] * self.num_workers
+        self._context_navigations = 0
+    
+    async def _recycle_page(self, worker_id: int) -> None:
+        """Substitui a página do worker por uma nova (chamado entre tarefas)"""
+        # Conta como tarefa ativa para não cruzar com uma reciclagem de contexto
+        await self._begin_task()
+        try:
+            old_page = self.pages[worker_id]
+            self.pages[worker_id] = await self._new_page(worker_id)
+            self._page_navigations[worker_id] = 0
+            self.recycle_stats['pages_recycled'] += 1
+        finally:
+            await self._end_task()
+        try:
+            await old_page.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing recycled page: {e}")
+    
+    async def _recycle_context(self) -> None:
+        """
+        Recria o contexto inteiro.
+        
+        Bloqueia novas tarefas e espera as tarefas em andamento terminarem;
+        URLs continuam na fila, então nenhuma perde a posição.
+        """
+        async with self._context_condition:
+            if self._recycling_context:
+                return
+            self._recycling_context = True
+            await self._context_condition.wait_for(lambda: self._active_tasks == 0)
+            
+            old_context = self.context
+            try:
+                await self._open_context()
+                self.recycle_stats['contexts_recycled'] += 1
+                self.logger.info("♻️  Browser context recycled")
+            finally:
+                self._recycling_context = False
+                self._context_condition.notify_all()
+            
+            try:
+                await old_context.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing recycled context: {e}")
+    
+    async def _begin_task(self) -> None:
+        """Aguarda fim de reciclagem de contexto e registra tarefa ativa"""
+        async with self._context_condition:
+            await self._context_condition.wait_for(lambda: not self._recycling_context)
+            self._active_tasks += 1
+    
+    async def _end_task(self) -> None:
+        async with self._context_condition:
+            self._active_tasks -= 1
+            self._context_condition.notify_all()
+    
+    async def _js_heap_mb(self, page: Page) -> float:
+        try:
+            return (await page.evaluate(JS_HEAP_SCRIPT)) / (1024 * 1024)
+        except Exception:
+            return 0.0
+    
+    def _browser_rss_mb(self) -> float:
+        """RSS somado dos processos filhos (driver + Chromium)"""
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+    
+    async def _maybe_recycle(self, worker_id: int) -> None:
+        """Após cada tarefa: aplica orçamentos de navegação e limites de memória"""
+        self._page_navigations[worker_id] += 1
+        self._context_navigations += 1
+        navigations = self._page_navigations[worker_id]
+        check_memory = navigations % self.memory_check_interval == 0
+        
+        if self.max_rss_mb and check_memory and self._browser_rss_mb() > self.max_rss_mb:
+            self.recycle_stats['rss_watermark'] += 1
+            await self._recycle_context()
+            return
+        
+        if self.max_navigations_per_context and self._context_navigations >= self.max_navigations_per_context:
+            self.recycle_stats['navigation_budget'] += 1
+            await self._recycle_context()
+            return
+        
+        if self.max_navigations_per_page and navigations >= self.max_navigations_per_page:
+            self.recycle_stats['navigation_budget'] += 1
+            await self._recycle_page(worker_id)
+            return
+        
+        if self.max_js_heap_mb and check_memory:
+            if await self._js_heap_mb(self.pages[worker_id]) > self.max_js_heap_mb:
+                self.recycle_stats['js_heap_watermark'] += 1
+                await self._recycle_page(worker_id)
+    
+    def get_recycle_stats(self) -> Dict[str, int]:
+        """Retorna contadores de reciclagem de páginas/contextos"""
+        return dict(self.recycle_stats)
+    
     async def close(self) -> None:
         """Fecha todas as páginas, contexto e browser"""
         try:
@@ -103,56 +285,116 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
         except Exception as e:
             self.logger.error(f"❌ Error closing worker pool: {e}")
     
+    def _prepare_run(self) -> None:
+        """Valida o pool e cria estado de reciclagem ausente (pool montado à mão)"""
+        if not self.pages:
+            self.logger.error("Worker pool not initialized. Call initialize() first.")
+            raise RuntimeError("Worker pool not initialized")
+        
+        if self._context_condition is None:
+            self._context_condition = asyncio.Condition()
+        if len(self._page_navigations) != len(self.pages):
+            self._page_navigations = [0] * len(self.pages)
+        if self._free_pages is None:
+            self._free_pages = asyncio.Queue()
+            for worker_id in range(len(self.pages)):
+                self._free_pages.put_nowait(worker_id)
+    
+    def _new_pending_queue(
+        self,
+        urls: List[str],
+        priority: Optional[Callable[[str], int]]
+    ) -> Tuple[asyncio.PriorityQueue, Callable[[str], int], "itertools.count"]:
+        """Cria a fila da chamada: (prioridade, ordem de chegada, url, tentativa)"""
+        priority = priority or (lambda url: 0)
+        sequence = itertools.count()
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for url in urls:
+            queue.put_nowait((priority(url), next(sequence), url, 1))
+        return queue, priority, sequence
+    
+    @asynccontextmanager
+    async def _lease_page(self) -> AsyncIterator[int]:
+        """Empresta uma página livre (índice) até o fim do bloco"""
+        worker_id = await self._free_pages.get()
+        try:
+            yield worker_id
+        finally:
+            self._free_pages.put_nowait(worker_id)
+    
+    async def _run_one(
+        self,
+        url: str,
+        worker_id: int,
+        worker_func: Callable[..., Any],
+        pass_page: bool = False,
+        attempts: int = 1
+    ) -> WorkerResult:
+        """Executa worker_func para uma URL (barreira de contexto, semáforo e rate limit)"""
+        start_time = time.time()
+        result = WorkerResult(url=url, success=False, worker_id=worker_id, attempts=attempts)
+        
+        await self._begin_task()
+        try:
+            async with self.semaphore:
+                async with rate_limited(self.rate_limiter, url) as ticket:
+                    self._last_navigation.pop(worker_id, None)
+                    if pass_page:
+                        result.result = await worker_func(url, worker_id, self.pages[worker_id])
+                    else:
+                        result.result = await worker_func(url, worker_id)
+                    result.success = True
+                    if worker_id in self._last_navigation:
+                        ticket.observe(*self._last_navigation[worker_id])
+            
+            result.duration_seconds = time.time() - start_time
+            self.logger.debug(
+                f"✅ Worker {worker_id}: {url[:50]}... "
+                f"({result.duration_seconds:.2f}s)"
+            )
+            
+        except Exception as e:
+            result.error = str(e)
+            result.duration_seconds = time.time() - start_time
+            self.logger.error(
+                f"❌ Worker {worker_id}: {url[:50]}... "
+                f"Error: {e} ({result.duration_seconds:.2f}s)"
+            )
+        
+        finally:
+            await self._end_task()
+        
+        return result
+    
     async def process_urls(
         self,
         urls: List[str],
-        worker_func: Callable[[str, int], Any],
-        show_progress: bool = True
+        worker_func: Callable[..., Any],
+        show_progress: bool = True,
+        priority: Optional[Callable[[str], int]] = None,
+        pass_page: bool = False
     ) -> List[WorkerResult]:
         """Processa URLs em paralelo usando workers"""
         
-        if not self.pages:
-            self.logger.error("Worker pool not initialized. Call initialize() first.")
-            raise RuntimeError("Worker pool not initialized")
+        self._prepare_run()
         
+        queue, _, _ = self._new_pending_queue(urls, priority)
         results = []
         completed = 0
         total = len(urls)
         
-        async def worker(worker_id: int) -> None:
-            """Worker que processa URLs da fila"""
+        async def worker() -> None:
+            """Worker que processa URLs da fila desta chamada"""
             nonlocal completed
             
             while True:
                 try:
-                    url = self.queue.get_nowait()
+                    _, _, url, _ = queue.get_nowait()
                 except asyncio.QueueEmpty:
                     break
                 
-                start_time = time.time()
-                result = WorkerResult(url=url, success=False, worker_id=worker_id)
-                
-                try:
-                    async with self.semaphore:
-                        page = self.pages[worker_id]
-                        result.result = await worker_func(url, worker_id)
-                        result.success = True
-                    
-                    result.duration_seconds = time.time() - start_time
-                    self.logger.debug(
-                        f"✅ Worker {worker_id}: {url[:50]}... "
-                        f"({result.duration_seconds:.2f}s)"
-                    )
-                    
-                except Exception as e:
-                    result.error = str(e)
-                    result.duration_seconds = time.time() - start_time
-                    self.logger.error(
-                        f"❌ Worker {worker_id}: {url[:50]}... "
-                        f"Error: {e} ({result.duration_seconds:.2f}s)"
-                    )
-                
-                finally:
+                async with self._lease_page() as worker_id:
+                    result = await self._run_one(url, worker_id, worker_func, pass_page)
                     results.append(result)
                     completed += 1
                     
@@ -163,23 +405,27 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
                             f"Last: {url[:50]}..."
                         )
                     
-                    self.queue.task_done()
-        
-        # Adicionar URLs à fila
-        for url in urls:
-            await self.queue.put(url)
-        
-        # Criar tasks para todos os workers
-        worker_tasks = [
-            asyncio.create_task(worker(i)) for i in range(self.num_workers)
-        ]
+                    # Reciclagem entre tarefas, ainda com a página emprestada
+                    try:
+                        await self._maybe_recycle(worker_id)
+                    except Exception as e:
+                        self.logger.error(f"❌ Worker {worker_id}: recycle failed: {e}")
         
-        # Aguardar todos os workers completarem
-        await asyncio.gather(*worker_tasks)
+        # Um worker por página; com chamadas concorrentes, as páginas são divididas
+        self._pending_queues.append(queue)
+        try:
+            worker_tasks = [
+                asyncio.create_task(worker()) for _ in range(min(self.num_workers, total))
+            ]
+            await asyncio.gather(*worker_tasks)
+        finally:
+            self._pending_queues.remove(queue)
         
         self.logger.info(
             f"✅ Completed processing {total} URLs "
-            f"({len([r for r in results if r.success])} successful)"
+            f"({len([r for r in results if r.success])} successful, "
+            f"{self.recycle_stats['pages_recycled']} pages / "
+            f"{self.recycle_stats['contexts_recycled']} contexts recycled)"
         )
         
         return results
@@ -187,9 +433,11 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
     async def process_urls_with_retry(
         self,
         urls: List[str],
-        worker_func: Callable[[str, int], Any],
+        worker_func: Callable[..., Any],
         max_retries: int = 3,
-        show_progress: bool = True
+        show_progress: bool = True,
+        priority: Optional[Callable[[str], int]] = None,
+        pass_page: bool = False
     ) -> List[WorkerResult]:
         """Processa URLs com retry automático"""
         
@@ -206,7 +454,9 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
             results = await self.process_urls(
                 remaining_urls,
                 worker_func,
-                show_progress=show_progress
+                show_progress=show_progress,
+                priority=priority,
+                pass_page=pass_page
             )
             
             all_results.extend(results)
@@ -229,13 +479,146 @@ class PlaywrightWorkerPool(IBrowserWorkerPool):
         
         return all_results
     
+    @staticmethod
+    def retry_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+        """Backoff exponencial com full jitter: uniforme em [0, min(max, base * 2^(n-1))]"""
+        return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+    
+    async def iter_results(
+        self,
+        urls: List[str],
+        worker_func: Callable[..., Any],
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        show_progress: bool = False,
+        priority: Optional[Callable[[str], int]] = None,
+        dead_letters: Optional[List[WorkerResult]] = None,
+        pass_page: bool = False
+    ) -> AsyncIterator[WorkerResult]:
+        """
+        Processa URLs e entrega cada resultado assim que fica pronto.
+        
+        Falhas voltam para a fila após um backoff com jitter, sem bloquear
+        as demais URLs. Só o resultado final de cada URL é entregue: sucesso
+        ou, após max_retries tentativas, a falha. Falhas definitivas vão
+        para a lista dead_letters passada pelo chamador (só desta chamada,
+        seguro com chamadas concorrentes) e para o agregado do pool
+        (get_dead_letters). Interromper a iteração cancela os workers.
+        """
+        self._prepare_run()
+        dead = dead_letters if dead_letters is not None else []
+        
+        unique_urls = list(dict.fromkeys(urls))
+        pending, priority, sequence = self._new_pending_queue(unique_urls, priority)
+        finished: asyncio.Queue = asyncio.Queue()
+        retry_tasks = set()
+        remaining = total = len(unique_urls)
+        completed = 0
+        
+        async def requeue(url: str, attempt: int, delay: float) -> None:
+            await asyncio.sleep(delay)
+            await pending.put((priority(url), next(sequence), url, attempt))
+        
+        async def worker() -> None:
+            """Worker que processa URLs (e retentativas) da fila desta chamada"""
+            while True:
+                _, _, url, attempt = await pending.get()
+                async with self._lease_page() as worker_id:
+                    result = await self._run_one(
+                        url, worker_id, worker_func, pass_page, attempts=attempt
+                    )
+                    
+                    if result.success or attempt >= max_retries:
+                        await finished.put(result)
+                    else:
+                        delay = self.retry_delay(attempt, base_delay, max_delay)
+                        self.logger.info(
+                            f"⏳ Retrying {url[:50]}... in {delay:.1f}s "
+                            f"(attempt {attempt + 1}/{max_retries})"
+                        )
+                        task = asyncio.create_task(requeue(url, attempt + 1, delay))
+                        retry_tasks.add(task)
+                        task.add_done_callback(retry_tasks.discard)
+                    
+                    try:
+                        await self._maybe_recycle(worker_id)
+                    except Exception as e:
+                        self.logger.error(f"❌ Worker {worker_id}: recycle failed: {e}")
+        
+        self._pending_queues.append(pending)
+        worker_tasks = [
+            asyncio.create_task(worker()) for _ in range(self.num_workers)
+        ]
+        
+        try:
+            while remaining:
+                result = await finished.get()
+                remaining -= 1
+                completed += 1
+                if not result.success:
+                    dead.append(result)
+                    self.dead_letters.append(result)
+                
+                if show_progress:
+                    self.logger.info(
+                        f"Progress: {completed}/{total} "
+                        f"({len(dead)} dead) - Last: {result.url[:50]}..."
+                    )
+                
+                yield result
+        finally:
+            for task in worker_tasks + list(retry_tasks):
+                task.cancel()
+            await asyncio.gather(*worker_tasks, *retry_tasks, return_exceptions=True)
+            self._pending_queues.remove(pending)
+        
+        self.logger.info(
+            f"✅ Streamed {total} URLs "
+            f"({total - len(dead)} successful, "
+            f"{len(dead)} dead letters)"
+        )
+    
+    def get_dead_letters(self) -> List[WorkerResult]:
+        """Retorna URLs que esgotaram as tentativas em todas as chamadas de iter_results"""
+        return list(self.dead_letters)
+    
+    def _navigation_listener(self, worker_id: int) -> Callable[[Any], None]:
+        """Cria listener que guarda status/Retry-After das navegações do worker"""
+        def on_response(response) -> None:
+            if response.request.is_navigation_request():
+                self._last_navigation[worker_id] = (
+                    response.status,
+                    response.headers.get("retry-after"),
+                )
+        return on_response
+    
     def get_num_workers(self) -> int:
         """Retorna número de workers"""
         return self.num_workers
     
     def get_queue_size(self) -> int:
-        """Retorna tamanho da fila (URLs pendentes)"""
-        return self.queue.qsize() if self.queue else 0
+        """Retorna URLs pendentes somando as filas de todas as chamadas em andamento"""
+        return sum(queue.qsize() for queue in self._pending_queues)
+
+
+def toc_first_priority(url: str) -> int:
+    """
+    Prioridade "TOC primeiro" para process_urls/iter_results (menor sai antes).
+    
+    Páginas índice (raiz do módulo, index.*, default.*, toc*) recebem 0;
+    tópicos recebem a profundidade do caminho (hash MadCap ou path), então
+    páginas que revelam links são visitadas antes das folhas.
+    """
+    parsed = urlparse(url)
+    if not parsed.fragment and parsed.path.endswith("/"):
+        return 0
+    topic = parsed.fragment.split("?")[0].split("%3F")[0] if parsed.fragment else parsed.path
+    topic = topic.strip("/")
+    name = topic.rsplit("/", 1)[-1].lower()
+    if not name or name.startswith(("index.", "default.", "toc")):
+        return 0
+    return 1 + topic.count("/")
 
 
 # Helper para criar uma função worker padrão
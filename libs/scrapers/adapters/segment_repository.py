@@ -0,0 +1,602 @@
+"""
+Adapter - Segment Document Repository
+
+Implementação de IDocumentRepository em poucos arquivos grandes, em vez
+de um JSON por documento.
+
+- Segmentos append-only (segment-000001.jsonl, ...): uma linha por
+  registro, com o JSON de Document.to_dict(); remoções são lápides
+  {"id": ..., "_deleted": true}
+- Índice _index.json: id -> [segmento, offset, bytes, módulo, url];
+  leitura por id é um seek + read
+- Se o índice estiver desatualizado (processo interrompido), a cauda dos
+  segmentos é reprocessada; uma linha incompleta no fim é descartada
+- Compactação regrava só os registros vivos em segmentos novos e apaga
+  os antigos (automática quando a fração de bytes mortos passa de
+  compact_ratio, ou via compact())
+- Com um FieldCompressor, content e metadata["html"] grandes são
+  gravados comprimidos dentro do registro
+- E/S de arquivo roda em thread (asyncio.to_thread), serializada por lock
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from libs.scrapers.adapters.field_compression import (
+    FieldCompressor,
+    decompress_document,
+    decompress_json_line,
+)
+from libs.scrapers.domain import Document, DocumentMetadata
+from libs.scrapers.ports import IDocumentRepository
+
+
+INDEX_NAME = "_index.json"
+INDEX_VERSION = 1
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class SegmentDocumentRepository(IDocumentRepository):
+    """
+    Adapter que implementa IDocumentRepository com segmentos append-only.
+    
+    Cada entrada do índice é [segmento, offset, bytes, módulo, url]. Um
+    registro só é considerado vivo se o índice aponta para a sua posição:
+    versões antigas e lápides viram bytes mortos até a compactação.
+    
+    Uso:
+        repo = SegmentDocumentRepository("data/scraped/segments")
+        await repo.save_many(documents)
+        async for doc in repo.iter_all():
+            ...
+        repo.close()
+    
+    Leituras e gravações rodam em thread para não bloquear o event loop;
+    o estado (índice, segmento ativo) é protegido por um único lock.
+    """
+    
+    def __init__(
+        self,
+        base_dir: str = "data/scraped/segments",
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        compact_ratio: float = 0.5,
+        index_flush_every: int = 100,
+        compressor: Optional[FieldCompressor] = None,
+        batch_size: int = 500,
+    ):
+        """
+        Inicializa repositório (carrega ou reconstrói o índice).
+        
+        Args:
+            base_dir: Diretório dos segmentos e do índice
+            segment_max_bytes: Tamanho a partir do qual um novo segmento é aberto
+            compact_ratio: Fração de bytes mortos que dispara a compactação
+                automática (0 desativa)
+            index_flush_every: Regrava o índice a cada N chamadas de save
+                (save_many, delete, clear e compact regravam na hora)
+            compressor: Comprime campos grandes (content, metadata["html"])
+            batch_size: Documentos lidos por vez em iter_all/iter_by_module
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = max(1, segment_max_bytes)
+        self.compact_ratio = compact_ratio
+        self.index_flush_every = max(1, index_flush_every)
+        self.compressor = compressor
+        self.batch_size = max(1, batch_size)
+        
+        self._lock = threading.RLock()
+        self._index: Dict[str, list] = {}
+        self._url_index: Dict[str, str] = {}
+        self._segment_sizes: Dict[int, int] = {}
+        self._dead_bytes = 0
+        self._pending_saves = 0
+        self._writer = None
+        self._load_index()
+    
+    @property
+    def index_path(self) -> Path:
+        return self.base_dir / INDEX_NAME
+    
+    def _segment_path(self, number: int) -> Path:
+        return self.base_dir / f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+    
+    def _segments_on_disk(self) -> Dict[int, int]:
+        """Número -> tamanho dos segmentos presentes no diretório"""
+        segments = {}
+        for path in self.base_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                number = int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            except ValueError:
+                continue
+            segments[number] = path.stat().st_size
+        return segments
+    
+    @property
+    def _active(self) -> int:
+        return max(self._segment_sizes, default=1)
+    
+    def _load_index(self) -> None:
+        """Lê o índice e reprocessa o que foi escrito depois dele"""
+        on_disk = self._segments_on_disk()
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        
+        recorded = None
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            recorded = {int(n): size for n, size in data["segments"].items()}
+        if recorded is not None and all(on_disk.get(n, 0) >= size for n, size in recorded.items()):
+            self._index = data["entries"]
+            self._dead_bytes = data.get("dead_bytes", 0)
+            self._segment_sizes = dict(recorded)
+            changed = False
+        else:
+            # Sem índice, ou segmentos truncados/removidos: reconstrói do zero
+            recorded = {}
+            changed = True
+        
+        newest = max(recorded, default=0)
+        for number in sorted(on_disk):
+            if number not in recorded and number < newest:
+                # Sobra de uma compactação interrompida depois de gravar o índice
+                self._segment_path(number).unlink(missing_ok=True)
+                changed = True
+            elif on_disk[number] > recorded.get(number, 0):
+                # Escrito depois da última gravação do índice
+                self._scan_segment(number, recorded.get(number, 0))
+                changed = True
+        
+        self._url_index = {entry[4]: doc_id for doc_id, entry in self._index.items()}
+        if changed:
+            self._write_index()
+    
+    def _scan_segment(self, number: int, start: int) -> None:
+        """Aplica ao índice os registros do segmento a partir de start"""
+        path = self._segment_path(number)
+        offset = start
+        with open(path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # escrita interrompida: descarta a linha incompleta
+                try:
+                    record = json.loads(line)
+                    doc_id = record["id"]
+                except (ValueError, KeyError, TypeError):
+                    self._dead_bytes += len(line)
+                    offset += len(line)
+                    continue
+                if record.get("_deleted"):
+                    self._drop(doc_id)
+                    self._dead_bytes += len(line)
+                else:
+                    self._put(doc_id, [number, offset, len(line), record.get("module", ""), record.get("url", "")])
+                offset += len(line)
+        
+        if offset < path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+        self._segment_sizes[number] = offset
+    
+    def _write_index(self) -> None:
+        """Grava o índice atomicamente (arquivo temporário + rename)"""
+        if self._writer is not None:
+            self._writer.flush()
+        payload = {
+            "version": INDEX_VERSION,
+            "segments": {str(n): size for n, size in self._segment_sizes.items()},
+            "dead_bytes": self._dead_bytes,
+            "entries": self._index,
+        }
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+        self._pending_saves = 0
+    
+    def flush_index(self) -> None:
+        """Grava o índice se houver saves ainda não persistidos"""
+        if self._pending_saves:
+            self._write_index()
+    
+    def _put(self, doc_id: str, entry: list) -> None:
+        self._drop(doc_id)
+        self._index[doc_id] = entry
+        self._url_index[entry[4]] = doc_id
+    
+    def _drop(self, doc_id: str) -> Optional[list]:
+        """Remove do índice; os bytes da versão anterior passam a ser mortos"""
+        entry = self._index.pop(doc_id, None)
+        if entry:
+            self._dead_bytes += entry[2]
+            if self._url_index.get(entry[4]) == doc_id:
+                del self._url_index[entry[4]]
+        return entry
+    
+    def _append(self, line: bytes) -> Tuple[int, int]:
+        """Acrescenta uma linha ao segmento ativo (abre outro se estiver cheio)"""
+        number = self._active
+        size = self._segment_sizes.get(number, 0)
+        if size and size + len(line) > self.segment_max_bytes:
+            self._close_writer()
+            number, size = number + 1, 0
+        if self._writer is None:
+            self._writer = open(self._segment_path(number), "ab")
+        self._writer.write(line)
+        self._segment_sizes[number] = size + len(line)
+        return number, size
+    
+    def _append_document(self, document: Document) -> None:
+        data = document.to_dict()
+        if self.compressor:
+            data = self.compressor.compress_document(data)
+        line = _encode_record(data)
+        number, offset = self._append(line)
+        self._put(document.id, [number, offset, len(line), document.module, document.url])
+    
+    def _document(self, raw: bytes) -> Document:
+        return Document.from_dict(decompress_document(json.loads(raw), self.compressor))
+    
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
+    def _read_raw(self, entries: List[list]) -> Iterator[bytes]:
+        """Linhas dos registros indicados, abrindo cada segmento uma vez"""
+        if self._writer is not None:
+            self._writer.flush()
+        handle, current = None, None
+        try:
+            for number, offset, length, _, _ in sorted(entries, key=lambda e: (e[0], e[1])):
+                if number != current:
+                    if handle:
+                        handle.close()
+                    handle, current = open(self._segment_path(number), "rb"), number
+                handle.seek(offset)
+                yield handle.read(length)
+        finally:
+            if handle:
+                handle.close()
+    
+    def _iter_live_raw(self) -> Iterator[bytes]:
+        """Varredura sequencial dos segmentos, pulando registros mortos"""
+        if self._writer is not None:
+            self._writer.flush()
+        live: Dict[int, set] = {}
+        for number, offset, _, _, _ in self._index.values():
+            live.setdefault(number, set()).add(offset)
+        
+        for number in sorted(live):
+            offsets = live[number]
+            offset = 0
+            with open(self._segment_path(number), "rb") as f:
+                for line in f:
+                    if offset in offsets:
+                        yield line
+                    offset += len(line)
+    
+    def _write(self, documents: List[Document], write_index: bool) -> None:
+        """Acrescenta os documentos; grava o índice na hora ou a cada index_flush_every saves"""
+        with self._lock:
+            for doc in documents:
+                self._append_document(doc)
+            self._writer.flush()
+            if write_index:
+                self._write_index()
+            else:
+                self._pending_saves += 1
+                if self._pending_saves >= self.index_flush_every:
+                    self._write_index()
+            self._maybe_compact()
+    
+    def _read_batch(self, raw_lines: Iterator[bytes]) -> List[Document]:
+        with self._lock:
+            return [self._document(raw) for raw in itertools.islice(raw_lines, self.batch_size)]
+    
+    async def _iter_documents(self, raw_lines: Iterator[bytes]) -> AsyncIterator[Document]:
+        """Decodifica as linhas em lotes de batch_size, cada lote lido em thread"""
+        try:
+            while True:
+                batch = await asyncio.to_thread(self._read_batch, raw_lines)
+                if not batch:
+                    return
+                for doc in batch:
+                    yield doc
+        finally:
+            with self._lock:
+                raw_lines.close()
+    
+    async def save(self, document: Document) -> None:
+        """
+        Salva um documento (acrescenta ao segmento ativo).
+        
+        Args:
+            document: Document a ser salvo
+        """
+        await asyncio.to_thread(self._write, [document], False)
+    
+    async def save_many(self, documents: List[Document]) -> None:
+        """
+        Salva múltiplos documentos (índice gravado uma vez no fim).
+        
+        Args:
+            documents: Lista de Documents
+        """
+        if documents:
+            await asyncio.to_thread(self._write, documents, True)
+    
+    async def find_by_id(self, doc_id: str) -> Optional[Document]:
+        """
+        Busca documento por ID.
+        
+        Args:
+            doc_id: ID do documento
+        
+        Returns:
+            Optional[Document]: Document se encontrado
+        """
+        def read() -> Optional[Document]:
+            with self._lock:
+                entry = self._index.get(doc_id)
+                if entry is None:
+                    return None
+                return self._document(list(self._read_raw([entry]))[0])
+        
+        return await asyncio.to_thread(read)
+    
+    async def find_by_url(self, url: str) -> Optional[Document]:
+        """
+        Busca documento por URL.
+        
+        Args:
+            url: URL do documento
+        
+        Returns:
+            Optional[Document]: Document se encontrado
+        """
+        doc_id = self._url_index.get(url)
+        return await self.find_by_id(doc_id) if doc_id else None
+    
+    async def find_by_module(self, module: str) -> List[Document]:
+        """
+        Busca todos os documentos de um módulo.
+        
+        Args:
+            module: Nome do módulo
+        
+        Returns:
+            List[Document]: Lista de documentos
+        """
+        return [doc async for doc in self.iter_by_module(module)]
+    
+    async def iter_by_module(self, module: str) -> AsyncIterator[Document]:
+        """
+        Itera os documentos de um módulo (leituras por offset do índice).
+        
+        Args:
+            module: Nome do módulo
+        
+        Yields:
+            Document: Documentos do módulo em ordem de gravação
+        """
+        entries = [entry for entry in self._index.values() if entry[3] == module]
+        async for doc in self._iter_documents(self._read_raw(entries)):
+            yield doc
+    
+    async def iter_all(self) -> AsyncIterator[Document]:
+        """
+        Itera todos os documentos em leitura sequencial dos segmentos.
+        
+        Yields:
+            Document: Documentos em ordem de gravação
+        """
+        async for doc in self._iter_documents(self._iter_live_raw()):
+            yield doc
+    
+    async def get_all(self) -> List[Document]:
+        """
+        Retorna todos os documentos.
+        
+        Returns:
+            List[Document]: Lista de todos os documentos
+        """
+        return [doc async for doc in self.iter_all()]
+    
+    async def delete(self, doc_id: str) -> bool:
+        """
+        Remove um documento por ID (grava uma lápide).
+        
+        Args:
+            doc_id: ID do documento
+        
+        Returns:
+            bool: True se removido
+        """
+        def delete_record() -> bool:
+            with self._lock:
+                if doc_id not in self._index:
+                    return False
+                line = _encode_record({"id": doc_id, "_deleted": True})
+                self._append(line)
+                self._drop(doc_id)
+                self._dead_bytes += len(line)
+                self._write_index()
+                self._maybe_compact()
+                return True
+        
+        return await asyncio.to_thread(delete_record)
+    
+    async def exists(self, doc_id: str) -> bool:
+        """
+        Verifica se documento existe.
+        
+        Args:
+            doc_id: ID do documento
+        
+        Returns:
+            bool: True se existe
+        """
+        return doc_id in self._index
+    
+    async def count(self) -> int:
+        """
+        Retorna total de documentos.
+        
+        Returns:
+            int: Número de documentos
+        """
+        return len(self._index)
+    
+    async def save_metadata(self, metadata: DocumentMetadata) -> None:
+        """
+        Salva metadados agregados.
+        
+        Args:
+            metadata: DocumentMetadata
+        """
+        data = json.dumps(metadata.to_dict(), ensure_ascii=False, indent=2)
+        await asyncio.to_thread((self.base_dir / "metadata.json").write_text, data, encoding="utf-8")
+    
+    async def get_metadata(self) -> Optional[DocumentMetadata]:
+        """
+        Recupera metadados agregados.
+        
+        Returns:
+            Optional[DocumentMetadata]: Metadados se existirem
+        """
+        try:
+            text = await asyncio.to_thread((self.base_dir / "metadata.json").read_text, encoding="utf-8")
+            data = json.loads(text)
+        except (OSError, ValueError):
+            return None
+        return DocumentMetadata.from_dict(data)
+    
+    async def export_to_jsonl(self, filepath: str) -> int:
+        """
+        Exporta todos os documentos para arquivo JSONL.
+        
+        As linhas vivas dos segmentos já são JSONL e são copiadas sem
+        reconstruir os Documents (só linhas com campos comprimidos são
+        parseadas).
+        
+        Args:
+            filepath: Caminho do arquivo de saída
+        
+        Returns:
+            int: Número de documentos exportados
+        """
+        output_path = Path(filepath)
+        
+        def export() -> int:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            count = 0
+            with self._lock, open(output_path, "wb") as f:
+                for raw in self._iter_live_raw():
+                    f.write(decompress_json_line(raw, self.compressor))
+                    count += 1
+            return count
+        
+        return await asyncio.to_thread(export)
+    
+    async def clear(self) -> None:
+        """
+        Remove todos os documentos do repositório.
+        
+        Use com cuidado!
+        """
+        def clear_all() -> None:
+            with self._lock:
+                self._close_writer()
+                for number in self._segments_on_disk():
+                    self._segment_path(number).unlink(missing_ok=True)
+                (self.base_dir / "metadata.json").unlink(missing_ok=True)
+                self._index.clear()
+                self._url_index.clear()
+                self._segment_sizes.clear()
+                self._dead_bytes = 0
+                self._write_index()
+        
+        await asyncio.to_thread(clear_all)
+    
+    def total_bytes(self) -> int:
+        """Tamanho total dos segmentos"""
+        return sum(self._segment_sizes.values())
+    
+    def _maybe_compact(self) -> None:
+        total = self.total_bytes()
+        if (
+            self.compact_ratio
+            and total >= self.segment_max_bytes
+            and self._dead_bytes > self.compact_ratio * total
+        ):
+            self._compact()
+    
+    async def compact(self) -> int:
+        """
+        Regrava os registros vivos em segmentos novos e apaga os antigos.
+        
+        O índice novo é gravado antes de apagar os segmentos antigos: se o
+        processo cair no meio, a reconstrução lê os dois conjuntos e a
+        cópia mais nova (segmento de número maior) prevalece.
+        
+        Returns:
+            int: Bytes liberados
+        """
+        def compact_locked() -> int:
+            with self._lock:
+                return self._compact()
+        
+        return await asyncio.to_thread(compact_locked)
+    
+    def _compact(self) -> int:
+        before = self.total_bytes()
+        old_segments = sorted(self._segments_on_disk())
+        live = sorted(self._index.items(), key=lambda item: (item[1][0], item[1][1]))
+        
+        self._close_writer()
+        first = max(old_segments, default=0) + 1
+        self._segment_sizes = {first: 0}
+        new_index: Dict[str, list] = {}
+        for (doc_id, entry), raw in zip(live, self._read_raw([entry for _, entry in live])):
+            number, offset = self._append(raw)
+            new_index[doc_id] = [number, offset, len(raw), entry[3], entry[4]]
+        self._close_writer()
+        self._segment_sizes = {n: size for n, size in self._segment_sizes.items() if size}
+        
+        self._index = new_index
+        self._url_index = {entry[4]: doc_id for doc_id, entry in new_index.items()}
+        self._dead_bytes = 0
+        self._write_index()
+        
+        for number in old_segments:
+            self._segment_path(number).unlink(missing_ok=True)
+        return before - self.total_bytes()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Documentos, segmentos e ocupação"""
+        total = self.total_bytes()
+        return {
+            "documents": len(self._index),
+            "segments": len(self._segment_sizes),
+            "total_bytes": total,
+            "dead_bytes": self._dead_bytes,
+            "dead_ratio": self._dead_bytes / total if total else 0.0,
+        }
+    
+    def close(self) -> None:
+        """Grava o índice pendente e fecha o segmento ativo"""
+        with self._lock:
+            self.flush_index()
+            self._close_writer()
@@ -12,7 +12,7 @@ from typing import List, Optional, AsyncIterator
 from urllib.parse import urlparse, unquote
 import re
 
-from libs.scrapers.ports import IDocumentScraper, IContentExtractor, IUrlResolver
+from libs.scrapers.ports import IDocumentScraper, IContentExtractor, IUrlResolver, IRateLimiter, rate_limited
 from libs.scrapers.domain import Document, ScrapingResult, DocumentType, DocumentSource
 
 
@@ -34,6 +34,7 @@ class SeniorDocAdapter(IDocumentScraper):
         url_resolver: IUrlResolver,
         max_retries: int = 3,
         timeout: int = 30000,
+        rate_limiter: Optional[IRateLimiter] = None,
     ):
         """
         Inicializa adapter.
@@ -43,11 +44,13 @@ class SeniorDocAdapter(IDocumentScraper):
             url_resolver: URL resolver
             max_retries: Máximo de tentativas por página
             timeout: Timeout em milissegundos
+            rate_limiter: Limitador por host compartilhado (opcional)
         """
         self.extractor = extractor
         self.url_resolver = url_resolver
         self.max_retries = max_retries
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
         
         self._visited_urls = set()
     
@@ -62,7 +65,8 @@ class SeniorDocAdapter(IDocumentScraper):
         Returns:
             Document: Documento extraído
         """
-        page = await self.extractor.navigate(url, timeout=self.timeout)
+        async with rate_limited(self.rate_limiter, url):
+            page = await self.extractor.navigate(url, timeout=self.timeout)
         
         try:
             # Detectar formato
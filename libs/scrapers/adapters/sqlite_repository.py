@@ -0,0 +1,345 @@
+"""
+Adapter - SQLite Document Repository
+
+Implementação de IDocumentRepository em um único arquivo SQLite.
+Cada documento é uma linha com o JSON de Document.to_dict() e colunas
+indexadas (id, url, module, content_hash), então buscas por id/url/módulo
+e contagens não precisam abrir nem parsear arquivos.
+
+Com um FieldCompressor, content e metadata["html"] grandes são gravados
+comprimidos dentro do JSON (content_hash continua sobre o texto original).
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from libs.scrapers.adapters.field_compression import (
+    FieldCompressor,
+    decompress_document,
+    decompress_json_line,
+)
+from libs.scrapers.domain import Document, DocumentMetadata
+from libs.scrapers.ports import IDocumentRepository
+
+
+class SqliteDocumentRepository(IDocumentRepository):
+    """
+    Adapter que implementa IDocumentRepository usando SQLite.
+    
+    - save_many grava o lote inteiro em uma transação
+    - iter_all lê em lotes (paginação por rowid) sem materializar a base inteira
+    - WAL permite leitores concorrentes enquanto o scraper escreve
+    
+    As operações de banco rodam em thread (asyncio.to_thread) para não
+    bloquear o event loop; uma única conexão é serializada por lock.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "data/scraped/documents.sqlite3",
+        batch_size: int = 500,
+        compressor: Optional[FieldCompressor] = None,
+    ):
+        """
+        Inicializa repositório.
+        
+        Args:
+            db_path: Caminho do arquivo SQLite
+            batch_size: Linhas lidas por vez em iter_all
+            compressor: Comprime campos grandes (content, metadata["html"])
+        """
+        self.db_path = Path(db_path)
+        self.compressor = compressor
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                module TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                scraped_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_url ON documents(url);
+            CREATE INDEX IF NOT EXISTS idx_documents_module ON documents(module);
+            CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """SHA-256 do conteúdo (coluna content_hash)"""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def _row(self, document: Document) -> Tuple[str, str, str, str, str, str]:
+        data = document.to_dict()
+        if self.compressor:
+            data = self.compressor.compress_document(data)
+        return (
+            document.id,
+            document.url,
+            document.module,
+            self.content_hash(document.content),
+            document.scraped_at.isoformat(),
+            json.dumps(data, ensure_ascii=False),
+        )
+    
+    def _document(self, data: str) -> Document:
+        return Document.from_dict(decompress_document(json.loads(data), self.compressor))
+    
+    def _write(self, rows: List[Tuple]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)", rows)
+    
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    async def _find_one(self, sql: str, params: Tuple) -> Optional[Document]:
+        rows = await asyncio.to_thread(self._query, sql, params)
+        return self._document(rows[0][0]) if rows else None
+    
+    async def save(self, document: Document) -> None:
+        """
+        Salva (ou substitui) um documento.
+        
+        Args:
+            document: Document a ser salvo
+        """
+        await asyncio.to_thread(self._write, [self._row(document)])
+    
+    async def save_many(self, documents: List[Document]) -> None:
+        """
+        Salva múltiplos documentos em uma única transação.
+        
+        Args:
+            documents: Lista de Documents
+        """
+        if documents:
+            await asyncio.to_thread(self._write, [self._row(doc) for doc in documents])
+    
+    async def find_by_id(self, doc_id: str) -> Optional[Document]:
+        """
+        Busca documento por ID.
+        
+        Args:
+            doc_id: ID do documento
+        
+        Returns:
+            Optional[Document]: Document se encontrado
+        """
+        return await self._find_one("SELECT data FROM documents WHERE id = ?", (doc_id,))
+    
+    async def find_by_url(self, url: str) -> Optional[Document]:
+        """
+        Busca documento por URL.
+        
+        Args:
+            url: URL do documento
+        
+        Returns:
+            Optional[Document]: Document se encontrado
+        """
+        return await self._find_one("SELECT data FROM documents WHERE url = ? LIMIT 1", (url,))
+    
+    async def find_by_content_hash(self, content_hash: str) -> List[Document]:
+        """
+        Busca documentos com o mesmo conteúdo (ex: páginas duplicadas entre versões).
+        
+        Args:
+            content_hash: SHA-256 do conteúdo (ver content_hash())
+        
+        Returns:
+            List[Document]: Documentos com esse conteúdo
+        """
+        rows = await asyncio.to_thread(
+            self._query, "SELECT data FROM documents WHERE content_hash = ?", (content_hash,)
+        )
+        return [self._document(data) for (data,) in rows]
+    
+    async def find_by_module(self, module: str) -> List[Document]:
+        """
+        Busca todos os documentos de um módulo.
+        
+        Args:
+            module: Nome do módulo
+        
+        Returns:
+            List[Document]: Lista de documentos
+        """
+        rows = await asyncio.to_thread(
+            self._query, "SELECT data FROM documents WHERE module = ? ORDER BY rowid", (module,)
+        )
+        return [self._document(data) for (data,) in rows]
+    
+    async def _iter_rows(self, column: str, where: str = "", params: Tuple = ()) -> AsyncIterator[str]:
+        """Lê uma coluna das linhas (filtradas por where) em lotes de batch_size, por rowid"""
+        last_rowid = 0
+        condition = f"rowid > ? AND ({where})" if where else "rowid > ?"
+        while True:
+            rows = await asyncio.to_thread(
+                self._query,
+                f"SELECT rowid, {column} FROM documents WHERE {condition} ORDER BY rowid LIMIT ?",
+                (last_rowid, *params, self.batch_size),
+            )
+            for _, value in rows:
+                yield value
+            if len(rows) < self.batch_size:
+                return
+            last_rowid = rows[-1][0]
+    
+    async def iter_all(self) -> AsyncIterator[Document]:
+        """
+        Itera todos os documentos sem carregá-los todos na memória.
+        
+        Yields:
+            Document: Documentos em ordem de inserção
+        """
+        async for data in self._iter_rows("data"):
+            yield self._document(data)
+    
+    async def iter_by_module(self, module: str) -> AsyncIterator[Document]:
+        """
+        Itera os documentos de um módulo em lotes (índice de module).
+        
+        Args:
+            module: Nome do módulo
+        
+        Yields:
+            Document: Documentos do módulo em ordem de inserção
+        """
+        async for data in self._iter_rows("data", "module = ?", (module,)):
+            yield self._document(data)
+    
+    async def get_all(self) -> List[Document]:
+        """
+        Retorna todos os documentos.
+        
+        Returns:
+            List[Document]: Lista de todos os documentos
+        """
+        return [doc async for doc in self.iter_all()]
+    
+    async def delete(self, doc_id: str) -> bool:
+        """
+        Remove um documento por ID.
+        
+        Args:
+            doc_id: ID do documento
+        
+        Returns:
+            bool: True se removido
+        """
+        def delete_row() -> bool:
+            with self._lock, self._conn:
+                return self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,)).rowcount > 0
+        
+        return await asyncio.to_thread(delete_row)
+    
+    async def exists(self, doc_id: str) -> bool:
+        """
+        Verifica se documento existe.
+        
+        Args:
+            doc_id: ID do documento
+        
+        Returns:
+            bool: True se existe
+        """
+        rows = await asyncio.to_thread(self._query, "SELECT 1 FROM documents WHERE id = ?", (doc_id,))
+        return bool(rows)
+    
+    async def count(self) -> int:
+        """
+        Retorna total de documentos.
+        
+        Returns:
+            int: Número de documentos
+        """
+        rows = await asyncio.to_thread(self._query, "SELECT COUNT(*) FROM documents")
+        return rows[0][0]
+    
+    async def save_metadata(self, metadata: DocumentMetadata) -> None:
+        """
+        Salva metadados agregados.
+        
+        Args:
+            metadata: DocumentMetadata
+        """
+        data = json.dumps(metadata.to_dict(), ensure_ascii=False)
+        
+        def write() -> None:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO metadata VALUES ('documents', ?)", (data,))
+        
+        await asyncio.to_thread(write)
+    
+    async def get_metadata(self) -> Optional[DocumentMetadata]:
+        """
+        Recupera metadados agregados.
+        
+        Returns:
+            Optional[DocumentMetadata]: Metadados se existirem
+        """
+        rows = await asyncio.to_thread(self._query, "SELECT data FROM metadata WHERE key = 'documents'")
+        return DocumentMetadata.from_dict(json.loads(rows[0][0])) if rows else None
+    
+    async def export_to_jsonl(self, filepath: str) -> int:
+        """
+        Exporta todos os documentos para arquivo JSONL.
+        
+        O JSON armazenado é escrito direto, sem reconstruir os Documents
+        (só linhas com campos comprimidos são parseadas).
+        
+        Args:
+            filepath: Caminho do arquivo de saída
+        
+        Returns:
+            int: Número de documentos exportados
+        """
+        output_path = Path(filepath)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        count = 0
+        with open(output_path, 'w', encoding='utf-8') as f:
+            async for data in self._iter_rows("data"):
+                f.write(decompress_json_line(data, self.compressor))
+                f.write('\n')
+                count += 1
+        
+        return count
+    
+    async def clear(self) -> None:
+        """
+        Remove todos os documentos do repositório.
+        
+        Use com cuidado!
+        """
+        def delete_all() -> None:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM documents")
+                self._conn.execute("DELETE FROM metadata")
+        
+        await asyncio.to_thread(delete_all)
+    
+    def close(self) -> None:
+        """Fecha a conexão"""
+        with self._lock:
+            self._conn.close()
@@ -131,6 +131,27 @@ class UrlResolver(IUrlResolver):
         except Exception:
             return "unknown"
     
+    def extract_version(self, url: str) -> Optional[str]:
+        """
+        Extrai versão do módulo da URL.
+        
+        Assume padrão: https://doc.senior.com.br/MODULO/5.10.4/...
+        
+        Args:
+            url: URL completa
+        
+        Returns:
+            Optional[str]: Versão (ex: "5.10.4") ou None
+        """
+        try:
+            path_parts = [p for p in urlparse(url).path.split('/') if p]
+            for part in path_parts[1:3]:
+                if re.fullmatch(r'v?\d+(\.\d+)+', part, re.IGNORECASE):
+                    return part
+            return None
+        except Exception:
+            return None
+    
     def is_valid(self, url: str) -> bool:
         """
         Valida se URL tem formato válido.
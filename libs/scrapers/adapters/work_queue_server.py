@@ -0,0 +1,203 @@
+"""
+Adapter - Work Queue HTTP Service
+
+Expõe uma LeaseWorkQueue por HTTP (aiohttp) para workers em containers
+e fornece o cliente correspondente, que implementa IWorkQueue.
+
+Endpoints (JSON):
+- GET  /health
+- GET  /stats
+- POST /enqueue    {"urls": [...], "metadata": {...}}
+- POST /lease      {"worker_id": "...", "max_items": 10, "visibility_timeout": 60}
+- POST /heartbeat  {"lease_id": "..."}
+- POST /ack        {"lease_id": "...", "item_id": "...", "result": ...}
+- POST /nack       {"lease_id": "...", "item_id": "...", "error": "..."}
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+from libs.scrapers.adapters.lease_work_queue import LeaseWorkQueue
+from libs.scrapers.ports.work_queue import IWorkQueue, Lease
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkQueueServer:
+    """
+    Servidor HTTP da fila de trabalho.
+    
+    Roda no mesmo event loop do orchestrator; port=0 escolhe uma porta
+    livre (útil em testes).
+    """
+    
+    def __init__(self, queue: LeaseWorkQueue, host: str = "0.0.0.0", port: int = 8001):
+        """
+        Inicializa servidor.
+        
+        Args:
+            queue: Fila servida
+            host: Interface de escuta
+            port: Porta (0 = qualquer porta livre)
+        """
+        self.queue = queue
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+        
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get("/health", self._health),
+            web.get("/stats", self._stats),
+            web.post("/enqueue", self._enqueue),
+            web.post("/close", self._close_input),
+            web.post("/lease", self._lease),
+            web.post("/heartbeat", self._heartbeat),
+            web.post("/ack", self._ack),
+            web.post("/nack", self._nack),
+        ])
+    
+    @property
+    def url(self) -> str:
+        """URL base do servidor"""
+        host = "127.0.0.1" if self.host == "0.0.0.0" else self.host
+        return f"http://{host}:{self.port}"
+    
+    async def start(self) -> None:
+        """Inicia o servidor"""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"✅ Work queue server listening on {self.url}")
+    
+    async def stop(self) -> None:
+        """Encerra o servidor"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+    
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(await self.queue.get_stats())
+    
+    async def _enqueue(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        item_ids = await self.queue.enqueue(body["urls"], body.get("metadata"))
+        return web.json_response({"item_ids": item_ids})
+    
+    async def _close_input(self, request: web.Request) -> web.Response:
+        await self.queue.close_input()
+        return web.json_response({"ok": True})
+    
+    async def _lease(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        lease = await self.queue.lease(
+            body["worker_id"],
+            body.get("max_items", 10),
+            body.get("visibility_timeout"),
+        )
+        return web.json_response(lease.to_dict())
+    
+    async def _heartbeat(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({"ok": await self.queue.heartbeat(body["lease_id"])})
+    
+    async def _ack(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        ok = await self.queue.ack(body["lease_id"], body["item_id"], body.get("result"))
+        return web.json_response({"ok": ok})
+    
+    async def _nack(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        ok = await self.queue.nack(body["lease_id"], body["item_id"], body.get("error"))
+        return web.json_response({"ok": ok})
+
+
+class WorkQueueClient(IWorkQueue):
+    """Cliente HTTP da fila; mesma interface da fila local"""
+    
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        """
+        Inicializa cliente.
+        
+        Args:
+            base_url: URL do servidor (ex: http://scraper-orchestrator:8001)
+            timeout: Timeout por requisição (s)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = ClientTimeout(total=timeout)
+        self._session: Optional[ClientSession] = None
+    
+    async def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(timeout=self.timeout)
+        async with self._session.request(method, f"{self.base_url}{path}", json=body) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+    
+    async def close(self) -> None:
+        """Fecha a sessão HTTP"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+    
+    async def __aenter__(self) -> "WorkQueueClient":
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+    
+    async def health(self) -> bool:
+        """Verifica se o servidor responde"""
+        try:
+            return (await self._request("GET", "/health")).get("status") == "ok"
+        except Exception:
+            return False
+    
+    async def enqueue(self, urls: List[str], metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Adiciona URLs à fila"""
+        data = await self._request("POST", "/enqueue", {"urls": urls, "metadata": metadata})
+        return data["item_ids"]
+    
+    async def close_input(self) -> None:
+        """Sinaliza que não haverá mais URLs"""
+        await self._request("POST", "/close")
+    
+    async def lease(
+        self,
+        worker_id: str,
+        max_items: int = 10,
+        visibility_timeout: Optional[float] = None
+    ) -> Lease:
+        """Pede um lote de itens"""
+        data = await self._request("POST", "/lease", {
+            "worker_id": worker_id,
+            "max_items": max_items,
+            "visibility_timeout": visibility_timeout,
+        })
+        return Lease.from_dict(data)
+    
+    async def heartbeat(self, lease_id: str) -> bool:
+        """Renova o lease"""
+        return (await self._request("POST", "/heartbeat", {"lease_id": lease_id}))["ok"]
+    
+    async def ack(self, lease_id: str, item_id: str, result: Any = None) -> bool:
+        """Confirma item com resultado"""
+        body = {"lease_id": lease_id, "item_id": item_id, "result": result}
+        return (await self._request("POST", "/ack", body))["ok"]
+    
+    async def nack(self, lease_id: str, item_id: str, error: Optional[str] = None) -> bool:
+        """Devolve item que falhou"""
+        body = {"lease_id": lease_id, "item_id": item_id, "error": error}
+        return (await self._request("POST", "/nack", body))["ok"]
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do servidor"""
+        return await self._request("GET", "/stats")
@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import List, Optional, AsyncIterator
 import aiohttp
 
-from libs.scrapers.ports import IDocumentScraper
+from libs.scrapers.ports import IDocumentScraper, IRateLimiter, rate_limited
 from libs.scrapers.domain import Document, ScrapingResult, DocumentType, DocumentSource
 
 
@@ -26,6 +26,7 @@ class ZendeskAdapter(IDocumentScraper):
         self,
         base_url: str = "https://suporte.senior.com.br/api/v2/help_center/pt-br",
         timeout: int = 30,
+        rate_limiter: Optional[IRateLimiter] = None,
     ):
         """
         Inicializa adapter.
@@ -33,9 +34,11 @@ class ZendeskAdapter(IDocumentScraper):
         Args:
             base_url: URL base da API Zendesk
             timeout: Timeout em segundos
+            rate_limiter: Limitador por host compartilhado (opcional)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _ensure_session(self):
@@ -45,6 +48,14 @@ class ZendeskAdapter(IDocumentScraper):
                 timeout=aiohttp.ClientTimeout(total=self.timeout)
             )
     
+    async def _get_json(self, api_url: str) -> dict:
+        """GET na API respeitando o rate limiter"""
+        async with rate_limited(self.rate_limiter, api_url) as ticket:
+            async with self._session.get(api_url) as response:
+                ticket.observe(response.status, response.headers.get("Retry-After"))
+                response.raise_for_status()
+                return await response.json()
+    
     async def scrape(self, url: str, **kwargs) -> Document:
         """
         Scrape um artigo específico.
@@ -67,9 +78,7 @@ class ZendeskAdapter(IDocumentScraper):
         # Buscar artigo via API
         api_url = f"{self.base_url}/articles/{article_id}"
         
-        async with self._session.get(api_url) as response:
-            response.raise_for_status()
-            data = await response.json()
+        data = await self._get_json(api_url)
         
         article = data.get("article", {})
         
@@ -125,9 +134,7 @@ class ZendeskAdapter(IDocumentScraper):
             while has_more:
                 api_url = f"{self.base_url}/articles?page={page}&per_page=100"
                 
-                async with self._session.get(api_url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+                data = await self._get_json(api_url)
                 
                 articles = data.get("articles", [])
                 
@@ -178,8 +185,10 @@ class ZendeskAdapter(IDocumentScraper):
         
         try:
             await self._ensure_session()
-            async with self._session.head(url, timeout=10) as response:
-                return response.status == 200
+            async with rate_limited(self.rate_limiter, url) as ticket:
+                async with self._session.head(url, timeout=10) as response:
+                    ticket.observe(response.status, response.headers.get("Retry-After"))
+                    return response.status == 200
         except Exception:
             return False
     
@@ -191,9 +200,7 @@ class ZendeskAdapter(IDocumentScraper):
             # Buscar primeira página para ver total
             api_url = f"{self.base_url}/articles?page=1&per_page=1"
             
-            async with self._session.get(api_url) as response:
-                response.raise_for_status()
-                data = await response.json()
+            data = await self._get_json(api_url)
             
             return data.get("count", 0)
             
@@ -8,7 +8,7 @@ frameworks ou detalhes técnicos.
 
 from libs.scrapers.domain.document import Document, DocumentType, DocumentSource
 from libs.scrapers.domain.scraping_result import ScrapingResult
-from libs.scrapers.domain.metadata import DocumentMetadata
+from libs.scrapers.domain.metadata import DocumentMetadata, MetadataAccumulator
 
 __all__ = [
     "Document",
@@ -16,4 +16,5 @@ __all__ = [
     "DocumentSource",
     "ScrapingResult",
     "DocumentMetadata",
+    "MetadataAccumulator",
 ]
@@ -63,50 +63,10 @@ class DocumentMetadata:
         Returns:
             DocumentMetadata instance
         """
-        if not documents:
-            return cls(
-                total_documents=0,
-                total_modules=0,
-                total_sources=0,
-                output_directory=output_dir,
-            )
-        
-        # Contadores
-        by_module = Counter(doc.module for doc in documents)
-        by_source = Counter(doc.source.value for doc in documents)
-        by_type = Counter(doc.doc_type.value for doc in documents)
-        
-        # Estatísticas de conteúdo
-        total_words = sum(doc.word_count() for doc in documents)
-        total_chars = sum(doc.char_count() for doc in documents)
-        
-        # Keywords agregadas
-        all_keywords = []
+        accumulator = MetadataAccumulator()
         for doc in documents:
-            all_keywords.extend(doc.keywords)
-        top_keywords = Counter(all_keywords).most_common(50)
-        
-        # Timestamps
-        scraped_times = [doc.scraped_at for doc in documents]
-        first_scraped = min(scraped_times) if scraped_times else None
-        last_scraped = max(scraped_times) if scraped_times else None
-        
-        return cls(
-            total_documents=len(documents),
-            total_modules=len(by_module),
-            total_sources=len(by_source),
-            documents_by_module=dict(by_module),
-            documents_by_source=dict(by_source),
-            documents_by_type=dict(by_type),
-            total_words=total_words,
-            total_chars=total_chars,
-            avg_words_per_doc=total_words / len(documents),
-            avg_chars_per_doc=total_chars / len(documents),
-            top_keywords=top_keywords,
-            first_scraped=first_scraped,
-            last_scraped=last_scraped,
-            output_directory=output_dir,
-        )
+            accumulator.add(doc)
+        return accumulator.build(output_dir)
     
     def get_module_statistics(self) -> Dict[str, Any]:
         """Retorna estatísticas por módulo"""
@@ -155,6 +115,29 @@ class DocumentMetadata:
             "additional_info": self.additional_info,
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DocumentMetadata":
+        """Cria metadados a partir do dicionário gerado por to_dict"""
+        return cls(
+            total_documents=data["total_documents"],
+            total_modules=data["total_modules"],
+            total_sources=data["total_sources"],
+            documents_by_module=data.get("documents_by_module", {}),
+            documents_by_source=data.get("documents_by_source", {}),
+            documents_by_type=data.get("documents_by_type", {}),
+            total_words=data.get("total_words", 0),
+            total_chars=data.get("total_chars", 0),
+            avg_words_per_doc=data.get("avg_words_per_doc", 0.0),
+            avg_chars_per_doc=data.get("avg_chars_per_doc", 0.0),
+            top_keywords=[(kw["keyword"], kw["count"]) for kw in data.get("top_keywords", [])],
+            first_scraped=datetime.fromisoformat(data["first_scraped"]) if data.get("first_scraped") else None,
+            last_scraped=datetime.fromisoformat(data["last_scraped"]) if data.get("last_scraped") else None,
+            generated_at=datetime.fromisoformat(data["generated_at"]) if data.get("generated_at") else datetime.now(),
+            output_directory=data.get("output_directory"),
+            index_name=data.get("index_name"),
+            additional_info=data.get("additional_info", {}),
+        )
+    
     def __repr__(self) -> str:
         return (
             f"DocumentMetadata("
@@ -162,3 +145,71 @@ class DocumentMetadata:
             f"modules={self.total_modules}, "
             f"sources={self.total_sources})"
         )
+
+
+class MetadataAccumulator:
+    """
+    Agrega DocumentMetadata em uma única passada, documento a documento.
+    
+    Guarda só contadores (por módulo, fonte, tipo, keyword) e totais, então
+    a memória não cresce com o conteúdo do corpus; permite gerar metadados
+    enquanto os documentos são lidos em streaming do repositório.
+    
+    Uso:
+        accumulator = MetadataAccumulator()
+        async for doc in repository.iter_all():
+            accumulator.add(doc)
+        metadata = accumulator.build(output_dir)
+    """
+    
+    def __init__(self):
+        self.total_documents = 0
+        self.by_module: Counter = Counter()
+        self.by_source: Counter = Counter()
+        self.by_type: Counter = Counter()
+        self.keywords: Counter = Counter()
+        self.total_words = 0
+        self.total_chars = 0
+        self.first_scraped: Optional[datetime] = None
+        self.last_scraped: Optional[datetime] = None
+    
+    def add(self, doc) -> None:
+        """Contabiliza um Document"""
+        self.total_documents += 1
+        self.by_module[doc.module] += 1
+        self.by_source[doc.source.value] += 1
+        self.by_type[doc.doc_type.value] += 1
+        self.keywords.update(doc.keywords)
+        self.total_words += doc.word_count()
+        self.total_chars += doc.char_count()
+        if self.first_scraped is None or doc.scraped_at < self.first_scraped:
+            self.first_scraped = doc.scraped_at
+        if self.last_scraped is None or doc.scraped_at > self.last_scraped:
+            self.last_scraped = doc.scraped_at
+    
+    def build(self, output_dir: str = None) -> DocumentMetadata:
+        """Gera DocumentMetadata com o que foi contabilizado até agora"""
+        if not self.total_documents:
+            return DocumentMetadata(
+                total_documents=0,
+                total_modules=0,
+                total_sources=0,
+                output_directory=output_dir,
+            )
+        
+        return DocumentMetadata(
+            total_documents=self.total_documents,
+            total_modules=len(self.by_module),
+            total_sources=len(self.by_source),
+            documents_by_module=dict(self.by_module),
+            documents_by_source=dict(self.by_source),
+            documents_by_type=dict(self.by_type),
+            total_words=self.total_words,
+            total_chars=self.total_chars,
+            avg_words_per_doc=self.total_words / self.total_documents,
+            avg_chars_per_doc=self.total_chars / self.total_documents,
+            top_keywords=self.keywords.most_common(50),
+            first_scraped=self.first_scraped,
+            last_scraped=self.last_scraped,
+            output_directory=output_dir,
+        )
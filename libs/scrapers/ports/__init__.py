@@ -15,6 +15,9 @@ from libs.scrapers.ports.document_repository import IDocumentRepository
 from libs.scrapers.ports.content_extractor import IContentExtractor
 from libs.scrapers.ports.url_resolver import IUrlResolver
 from libs.scrapers.ports.browser_worker_pool import IBrowserWorkerPool, WorkerResult
+from libs.scrapers.ports.rate_limiter import IRateLimiter, RequestTicket, rate_limited
+from libs.scrapers.ports.scrape_coordinator import IScrapeCoordinator
+from libs.scrapers.ports.work_queue import IWorkQueue, Lease, WorkItem
 
 __all__ = [
     "IDocumentScraper",
@@ -23,4 +26,11 @@ __all__ = [
     "IUrlResolver",
     "IBrowserWorkerPool",
     "WorkerResult",
+    "IRateLimiter",
+    "RequestTicket",
+    "rate_limited",
+    "IScrapeCoordinator",
+    "IWorkQueue",
+    "Lease",
+    "WorkItem",
 ]
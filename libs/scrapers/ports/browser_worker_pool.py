@@ -6,7 +6,7 @@ usando múltiplas páginas do Playwright.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Callable, Any, Optional
+from typing import List, Callable, Any, Optional, AsyncIterator
 from dataclasses import dataclass
 
 
@@ -19,6 +19,7 @@ class WorkerResult:
     error: Optional[str] = None
     worker_id: int = -1
     duration_seconds: float = 0.0
+    attempts: int = 1
 
 
 class IBrowserWorkerPool(ABC):
@@ -48,16 +49,24 @@ class IBrowserWorkerPool(ABC):
     async def process_urls(
         self,
         urls: List[str],
-        worker_func: Callable[[str, int], Any],
-        show_progress: bool = True
+        worker_func: Callable[..., Any],
+        show_progress: bool = True,
+        priority: Optional[Callable[[str], int]] = None,
+        pass_page: bool = False
     ) -> List[WorkerResult]:
         """
         Processa lista de URLs em paralelo.
         
+        Cada chamada tem sua própria fila; chamadas concorrentes dividem
+        as páginas do pool.
+        
         Args:
             urls: Lista de URLs para processar
-            worker_func: Função async que processa cada URL (recebe url, worker_id)
+            worker_func: Função async que processa cada URL
+                (recebe url, worker_id e, com pass_page, a página emprestada)
             show_progress: Se deve mostrar barra de progresso
+            priority: Função url -> prioridade (menor é processada antes)
+            pass_page: Chama worker_func(url, worker_id, page) com a página emprestada
             
         Returns:
             Lista de WorkerResult com resultados de cada URL
@@ -68,9 +77,11 @@ class IBrowserWorkerPool(ABC):
     async def process_urls_with_retry(
         self,
         urls: List[str],
-        worker_func: Callable[[str, int], Any],
+        worker_func: Callable[..., Any],
         max_retries: int = 3,
-        show_progress: bool = True
+        show_progress: bool = True,
+        priority: Optional[Callable[[str], int]] = None,
+        pass_page: bool = False
     ) -> List[WorkerResult]:
         """
         Processa URLs com retry automático em caso de falha.
@@ -78,14 +89,50 @@ class IBrowserWorkerPool(ABC):
         Args:
             urls: Lista de URLs para processar
             worker_func: Função async que processa cada URL
+                (recebe url, worker_id e, com pass_page, a página emprestada)
             max_retries: Número máximo de tentativas por URL
             show_progress: Se deve mostrar barra de progresso
+            priority: Função url -> prioridade (menor é processada antes)
+            pass_page: Chama worker_func(url, worker_id, page) com a página emprestada
             
         Returns:
             Lista de WorkerResult
         """
         pass
     
+    @abstractmethod
+    def iter_results(
+        self,
+        urls: List[str],
+        worker_func: Callable[..., Any],
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        show_progress: bool = False,
+        priority: Optional[Callable[[str], int]] = None,
+        dead_letters: Optional[List[WorkerResult]] = None,
+        pass_page: bool = False
+    ) -> AsyncIterator[WorkerResult]:
+        """
+        Processa URLs entregando cada resultado assim que fica pronto.
+        
+        Args:
+            urls: Lista de URLs para processar
+            worker_func: Função async que processa cada URL
+                (recebe url, worker_id e, com pass_page, a página emprestada)
+            max_retries: Número máximo de tentativas por URL
+            base_delay: Atraso base (s) do backoff exponencial
+            max_delay: Atraso máximo (s) entre tentativas
+            show_progress: Se deve registrar o progresso
+            priority: Função url -> prioridade (menor é processada antes)
+            dead_letters: Lista que recebe as falhas definitivas desta chamada
+            pass_page: Chama worker_func(url, worker_id, page) com a página emprestada
+            
+        Yields:
+            WorkerResult final de cada URL (sucesso ou falha definitiva)
+        """
+        pass
+    
     @abstractmethod
     def get_num_workers(self) -> int:
         """Retorna número de workers ativos"""
@@ -93,5 +140,5 @@ class IBrowserWorkerPool(ABC):
     
     @abstractmethod
     def get_queue_size(self) -> int:
-        """Retorna número de URLs ainda na fila"""
+        """Retorna número de URLs ainda nas filas das chamadas em andamento"""
         pass
@@ -6,7 +6,7 @@ Pode ser implementado como FileSystem, Database, S3, etc.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from libs.scrapers.domain import Document, DocumentMetadata
 
 
@@ -93,6 +93,32 @@ class IDocumentRepository(ABC):
         """
         pass
     
+    async def iter_all(self) -> AsyncIterator[Document]:
+        """
+        Itera todos os documentos sem materializar a lista inteira.
+        
+        A implementação padrão usa get_all(); adapters devem sobrescrever
+        lendo um documento (ou lote) por vez.
+        
+        Yields:
+            Document: Documentos do repositório
+        """
+        for document in await self.get_all():
+            yield document
+    
+    async def iter_by_module(self, module: str) -> AsyncIterator[Document]:
+        """
+        Itera os documentos de um módulo sem materializar a lista.
+        
+        Args:
+            module: Nome do módulo
+        
+        Yields:
+            Document: Documentos do módulo
+        """
+        for document in await self.find_by_module(module):
+            yield document
+    
     @abstractmethod
     async def delete(self, doc_id: str) -> bool:
         """
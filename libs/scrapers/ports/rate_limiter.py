@@ -0,0 +1,114 @@
+"""
+Port - Rate Limiter Interface
+
+Define o contrato para controle de taxa e concorrência por host,
+compartilhado entre scrapers, worker pools e clientes HTTP.
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+import time
+
+
+@dataclass
+class RequestTicket:
+    """
+    Resultado de uma requisição feita dentro de IRateLimiter.limit().
+    
+    O chamador preenche status/retry_after quando conhece a resposta;
+    a latência é medida automaticamente.
+    """
+    url: str
+    status: Optional[int] = None
+    retry_after: Optional[str] = None
+    error: bool = False
+    
+    def observe(self, status: Optional[int], retry_after: Optional[str] = None) -> None:
+        """Registra status HTTP e header Retry-After da resposta"""
+        self.status = status
+        self.retry_after = retry_after
+
+
+class IRateLimiter(ABC):
+    """
+    Interface para limitador de requisições por host.
+    
+    Uso típico:
+        async with limiter.limit(url) as ticket:
+            response = await fetch(url)
+            ticket.observe(response.status, response.headers.get("Retry-After"))
+    """
+    
+    @abstractmethod
+    async def acquire(self, url: str) -> None:
+        """
+        Aguarda permissão para fazer uma requisição ao host da URL.
+        
+        Args:
+            url: URL que será requisitada
+        """
+        pass
+    
+    @abstractmethod
+    async def release(
+        self,
+        url: str,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        retry_after: Optional[str] = None,
+        error: bool = False,
+    ) -> None:
+        """
+        Devolve a permissão e informa o resultado da requisição.
+        
+        Args:
+            url: URL requisitada
+            status: Status HTTP (None se desconhecido)
+            latency: Duração da requisição em segundos
+            retry_after: Valor do header Retry-After, se houver
+            error: Se a requisição falhou sem resposta (timeout, conexão)
+        """
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna estatísticas por host"""
+        pass
+    
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[RequestTicket]:
+        """Context manager que faz acquire/release medindo a latência"""
+        await self.acquire(url)
+        ticket = RequestTicket(url=url)
+        started = time.monotonic()
+        try:
+            yield ticket
+        except BaseException:
+            # Sem resposta observada (timeout, conexão): conta como erro do host
+            if ticket.status is None:
+                ticket.error = True
+            raise
+        finally:
+            await self.release(
+                url,
+                status=ticket.status,
+                latency=time.monotonic() - started,
+                retry_after=ticket.retry_after,
+                error=ticket.error,
+            )
+
+
+@asynccontextmanager
+async def rate_limited(limiter: Optional[IRateLimiter], url: str) -> AsyncIterator[RequestTicket]:
+    """
+    Aplica o limitador se houver um; sem limitador apenas entrega um ticket.
+    
+    Permite que adapters aceitem rate_limiter opcional sem duplicar código.
+    """
+    if limiter is None:
+        yield RequestTicket(url=url)
+        return
+    async with limiter.limit(url) as ticket:
+        yield ticket
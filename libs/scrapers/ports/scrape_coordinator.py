@@ -0,0 +1,38 @@
+"""
+Port - Scrape Coordinator Interface
+
+Define o contrato para coordenadores que distribuem URLs entre vários
+executores (processos, containers) e consolidam o resultado.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List
+
+from libs.scrapers.domain import ScrapingResult
+
+
+class IScrapeCoordinator(ABC):
+    """
+    Interface para coordenador de scraping distribuído.
+    
+    Implementações particionam as URLs, executam cada partição de forma
+    independente e devolvem um único ScrapingResult.
+    """
+    
+    @abstractmethod
+    async def run(self, urls: List[str]) -> ScrapingResult:
+        """
+        Executa scraping distribuído das URLs.
+        
+        Args:
+            urls: Lista de URLs para processar
+        
+        Returns:
+            ScrapingResult consolidado de todas as partições
+        """
+        pass
+    
+    @abstractmethod
+    def get_num_executors(self) -> int:
+        """Retorna número de executores (processos, containers) usados"""
+        pass
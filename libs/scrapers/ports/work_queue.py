@@ -0,0 +1,129 @@
+"""
+Port - Work Queue Interface
+
+Define o contrato para a fila de trabalho distribuída: workers (containers
+ou processos) pegam lotes de URLs por lease, renovam o lease com heartbeat
+e confirmam (ack) ou devolvem (nack) cada item. Itens cujo lease expira
+voltam para a fila (visibility timeout).
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class WorkItem:
+    """Item da fila (uma URL) e quantas vezes já foi entregue"""
+    item_id: str
+    url: str
+    attempts: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    last_error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkItem":
+        return cls(**data)
+
+
+@dataclass
+class Lease:
+    """
+    Lote de itens entregue a um worker.
+    
+    Os itens ficam invisíveis para outros workers até expires_in segundos
+    sem heartbeat. drained indica que a entrada foi fechada e a fila está
+    vazia e sem leases pendentes (o worker pode encerrar).
+    """
+    lease_id: str
+    worker_id: str
+    items: List[WorkItem] = field(default_factory=list)
+    expires_in: float = 0.0
+    drained: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["items"] = [item.to_dict() for item in self.items]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Lease":
+        data = dict(data)
+        data["items"] = [WorkItem.from_dict(item) for item in data.get("items", [])]
+        return cls(**data)
+
+
+class IWorkQueue(ABC):
+    """
+    Interface para fila de trabalho com lease.
+    
+    Implementada em memória (servidor/testes) e por um cliente HTTP
+    (workers em containers), para que o loop do worker seja o mesmo.
+    """
+    
+    @abstractmethod
+    async def enqueue(self, urls: List[str], metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Adiciona URLs à fila.
+        
+        Args:
+            urls: URLs para processar
+            metadata: Metadados copiados para cada item
+        
+        Returns:
+            IDs dos itens criados
+        """
+        pass
+    
+    @abstractmethod
+    async def close_input(self) -> None:
+        """
+        Sinaliza que não haverá mais enqueue.
+        
+        Só depois disso uma fila vazia é informada como drained; antes,
+        workers sem itens continuam aguardando novas URLs.
+        """
+        pass
+    
+    @abstractmethod
+    async def lease(
+        self,
+        worker_id: str,
+        max_items: int = 10,
+        visibility_timeout: Optional[float] = None
+    ) -> Lease:
+        """
+        Entrega até max_items itens ao worker.
+        
+        Args:
+            worker_id: Identificador do worker
+            max_items: Tamanho máximo do lote
+            visibility_timeout: Segundos até o lease expirar sem heartbeat
+        
+        Returns:
+            Lease (possivelmente vazio)
+        """
+        pass
+    
+    @abstractmethod
+    async def heartbeat(self, lease_id: str) -> bool:
+        """Renova o lease; False se ele já expirou"""
+        pass
+    
+    @abstractmethod
+    async def ack(self, lease_id: str, item_id: str, result: Any = None) -> bool:
+        """Confirma item processado (com resultado); False se o lease não é mais válido"""
+        pass
+    
+    @abstractmethod
+    async def nack(self, lease_id: str, item_id: str, error: Optional[str] = None) -> bool:
+        """Devolve item que falhou (volta à fila ou vai para dead letters)"""
+        pass
+    
+    @abstractmethod
+    async def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores da fila e por worker"""
+        pass
@@ -5,9 +5,10 @@ Orquestra o processo de indexação de documentos para busca.
 Prepara documentos para indexadores (JSONL, Meilisearch, etc.).
 """
 
-from typing import List, Optional, Dict, Any
+import json
+from typing import AsyncIterator, List, Optional, Dict, Any
 from pathlib import Path
-from libs.scrapers.domain import Document, DocumentMetadata
+from libs.scrapers.domain import Document, DocumentMetadata, MetadataAccumulator
 from libs.scrapers.ports import IDocumentRepository
 
 
@@ -22,7 +23,10 @@ class IndexDocuments:
     4. Gera metadados agregados
     5. Exporta para diferentes formatos
     
-    Separa a lógica de indexação da persistência.
+    Separa a lógica de indexação da persistência. Os documentos são lidos
+    em streaming (iter_all/iter_by_module) e JSONL, metadados e índice por
+    módulo são gerados na mesma passada, com um documento por vez em
+    memória.
     """
     
     def __init__(self, repository: IDocumentRepository):
@@ -54,10 +58,18 @@ class IndexDocuments:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Recuperar todos os documentos
-        documents = await self.repository.get_all()
+        jsonl_path = output_dir / "docs_indexacao_detailed.jsonl" if format == "jsonl" else None
         
-        if not documents:
+        # Uma passada: JSONL, metadados e índice por módulo
+        accumulator = MetadataAccumulator()
+        by_module: Dict[str, List[Dict[str, str]]] = {}
+        total = await self._consume(
+            self.repository.iter_all(), jsonl_path, accumulator, by_module
+        )
+        
+        if not total:
+            if jsonl_path:
+                jsonl_path.unlink(missing_ok=True)
             return {
                 "total_documents": 0,
                 "files_generated": [],
@@ -65,20 +77,13 @@ class IndexDocuments:
             }
         
         files_generated = []
-        
-        # Exportar para JSONL
-        if format == "jsonl":
-            jsonl_path = output_dir / "docs_indexacao_detailed.jsonl"
-            count = await self.repository.export_to_jsonl(str(jsonl_path))
+        if jsonl_path:
             files_generated.append(str(jsonl_path))
         
         # Gerar metadados
         metadata = None
         if include_metadata:
-            metadata = DocumentMetadata.from_documents(
-                documents,
-                output_dir=str(output_dir)
-            )
+            metadata = accumulator.build(output_dir=str(output_dir))
             await self.repository.save_metadata(metadata)
             
             # Salvar metadados em arquivo JSON
@@ -87,11 +92,13 @@ class IndexDocuments:
             files_generated.append(str(metadata_path))
         
         # Gerar índice por módulo
-        by_module_path = await self._generate_module_index(documents, output_dir)
+        by_module_path = output_dir / "index_by_module.json"
+        with open(by_module_path, "w", encoding="utf-8") as f:
+            json.dump(by_module, f, ensure_ascii=False, indent=2)
         files_generated.append(str(by_module_path))
         
         return {
-            "total_documents": len(documents),
+            "total_documents": total,
             "files_generated": files_generated,
             "metadata": metadata.to_dict() if metadata else None,
             "by_module": metadata.documents_by_module if metadata else {},
@@ -141,28 +148,27 @@ class IndexDocuments:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Recuperar documentos do módulo
-        documents = await self.repository.find_by_module(module)
+        # Exportar para JSONL e agregar metadados na mesma passada
+        jsonl_path = output_dir / f"{module}_docs.jsonl"
+        accumulator = MetadataAccumulator()
+        total = await self._consume(self.repository.iter_by_module(module), jsonl_path, accumulator)
         
-        if not documents:
+        if not total:
+            jsonl_path.unlink(missing_ok=True)
             return {
                 "module": module,
                 "total_documents": 0,
                 "error": f"No documents found for module {module}",
             }
         
-        # Exportar para JSONL
-        jsonl_path = output_dir / f"{module}_docs.jsonl"
-        await self._export_documents_jsonl(documents, jsonl_path)
-        
         # Gerar metadados do módulo
-        metadata = DocumentMetadata.from_documents(documents, str(output_dir))
+        metadata = accumulator.build(str(output_dir))
         metadata_path = output_dir / f"{module}_metadata.json"
         await self._save_metadata_file(metadata, metadata_path)
         
         return {
             "module": module,
-            "total_documents": len(documents),
+            "total_documents": total,
             "files_generated": [str(jsonl_path), str(metadata_path)],
             "metadata": metadata.to_dict(),
         }
@@ -199,13 +205,15 @@ class IndexDocuments:
         Returns:
             Dict: Relatório de validação
         """
-        documents = await self.repository.get_all()
-        
         errors = []
         warnings = []
+        total = 0
+        seen_urls = set()
+        duplicates = set()
         
         # Validar documentos
-        for doc in documents:
+        async for doc in self.repository.iter_all():
+            total += 1
             # Verificar campos obrigatórios
             if not doc.title:
                 errors.append(f"Document {doc.id} has no title")
@@ -213,56 +221,58 @@ class IndexDocuments:
                 warnings.append(f"Document {doc.id} has empty content")
             if not doc.url:
                 errors.append(f"Document {doc.id} has no URL")
+            
+            # Verificar duplicatas
+            if doc.url in seen_urls:
+                duplicates.add(doc.url)
+            seen_urls.add(doc.url)
         
-        # Verificar duplicatas
-        urls = [doc.url for doc in documents]
-        duplicates = [url for url in urls if urls.count(url) > 1]
         if duplicates:
-            warnings.append(f"Found duplicate URLs: {len(set(duplicates))}")
+            warnings.append(f"Found duplicate URLs: {len(duplicates)}")
         
         return {
-            "total_documents": len(documents),
+            "total_documents": total,
             "valid": len(errors) == 0,
             "errors": errors,
             "warnings": warnings,
         }
     
-    async def _generate_module_index(
+    async def _consume(
         self,
-        documents: List[Document],
-        output_dir: Path,
-    ) -> Path:
-        """Gera índice agrupado por módulo"""
-        import json
-        
-        by_module = {}
-        for doc in documents:
-            if doc.module not in by_module:
-                by_module[doc.module] = []
-            by_module[doc.module].append({
-                "id": doc.id,
-                "title": doc.title,
-                "url": doc.url,
-            })
-        
-        index_path = output_dir / "index_by_module.json"
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(by_module, f, ensure_ascii=False, indent=2)
+        documents: AsyncIterator[Document],
+        jsonl_path: Optional[Path],
+        accumulator: MetadataAccumulator,
+        by_module: Optional[Dict[str, List[Dict[str, str]]]] = None,
+    ) -> int:
+        """
+        Consome o stream de documentos uma única vez.
         
-        return index_path
-    
-    async def _export_documents_jsonl(
-        self,
-        documents: List[Document],
-        filepath: Path,
-    ) -> None:
-        """Exporta documentos para JSONL"""
-        import json
+        Escreve cada documento no JSONL (se jsonl_path), contabiliza no
+        acumulador de metadados e, se by_module for dado, registra só
+        id/título/url no índice por módulo.
         
-        with open(filepath, "w", encoding="utf-8") as f:
-            for doc in documents:
-                json.dump(doc.to_dict(), f, ensure_ascii=False)
-                f.write("\n")
+        Returns:
+            int: Número de documentos consumidos
+        """
+        total = 0
+        f = open(jsonl_path, "w", encoding="utf-8") if jsonl_path else None
+        try:
+            async for doc in documents:
+                total += 1
+                if f:
+                    json.dump(doc.to_dict(), f, ensure_ascii=False)
+                    f.write("\n")
+                accumulator.add(doc)
+                if by_module is not None:
+                    by_module.setdefault(doc.module, []).append({
+                        "id": doc.id,
+                        "title": doc.title,
+                        "url": doc.url,
+                    })
+        finally:
+            if f:
+                f.close()
+        return total
     
     async def _save_metadata_file(
         self,
@@ -270,7 +280,5 @@ class IndexDocuments:
         filepath: Path,
     ) -> None:
         """Salva metadados em arquivo JSON"""
-        import json
-        
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(metadata.to_dict(), f, ensure_ascii=False, indent=2)
@@ -9,7 +9,7 @@ import asyncio
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from libs.scrapers.domain import Document, ScrapingResult, DocumentSource
-from libs.scrapers.ports import IDocumentScraper, IDocumentRepository
+from libs.scrapers.ports import IDocumentScraper, IDocumentRepository, IScrapeCoordinator
 
 
 class ScrapeDocumentation:
@@ -184,6 +184,45 @@ class ScrapeDocumentation:
                 warnings=tuple(),
             )
     
+    async def execute_distributed(
+        self,
+        urls: List[str],
+        coordinator: IScrapeCoordinator,
+        save_to_repository: bool = True,
+    ) -> ScrapingResult:
+        """
+        Executa scraping distribuído (ex: vários processos) via coordenador.
+        
+        Args:
+            urls: Lista de URLs para scraping
+            coordinator: Coordenador que particiona e executa as URLs
+            save_to_repository: Se True, salva documentos no repositório
+        
+        Returns:
+            ScrapingResult: Resultado consolidado de todas as partições
+        """
+        result = await coordinator.run(urls)
+        
+        if save_to_repository and result.documents:
+            try:
+                await self.repository.save_many(list(result.documents))
+            except Exception as e:
+                return ScrapingResult(
+                    documents=result.documents,
+                    total_documents=result.total_documents,
+                    successful_scrapes=result.successful_scrapes,
+                    failed_scrapes=result.failed_scrapes,
+                    skipped_urls=result.skipped_urls,
+                    started_at=result.started_at,
+                    finished_at=result.finished_at,
+                    source_urls=result.source_urls,
+                    errors=result.errors + (f"Failed to save documents: {str(e)}",),
+                    warnings=result.warnings,
+                    metadata=result.metadata,
+                )
+        
+        return result
+    
     async def validate_urls(self, urls: List[str]) -> Dict[str, bool]:
         """
         Valida lista de URLs antes de scraping.
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark - GarbageCollector.clean
+Compara a limpeza antiga (re.sub por regra, a cada chamada) com o pipeline
+compilado do scraper_modular em amostras reais de content.txt, e confere
+se as duas produzem o mesmo texto.
+
+Uso:
+    python scripts/analysis/benchmark_garbage_collector.py [--config=scraper_config.json]
+        [--samples=data/scraped/estruturado] [--limit=200] [--repeat=5]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from apps.scraper.scraper_modular import ConfigManager, GarbageCollector
+
+
+def legacy_clean(gc: GarbageCollector, content: str) -> str:
+    """Implementação anterior: uma varredura por regra, padrões como string"""
+    if not content:
+        return ""
+    for pattern in gc.garbage_patterns:
+        try:
+            if pattern == "\\s+":
+                content = re.sub(r'\s+', ' ', content)
+            elif pattern == "\\n{3,}":
+                content = re.sub(r'\n{3,}', '\n\n', content)
+            else:
+                content = re.sub(pattern, '', content)
+        except re.error:
+            pass
+    for seq in gc.garbage_sequences:
+        if seq.get('action', 'remove') == 'remove':
+            try:
+                content = re.sub(seq.get('pattern', ''), '', content)
+            except re.error:
+                pass
+    if gc.normalize_whitespace:
+        content = re.sub(r'[ \t]+', ' ', content)
+        content = content.strip()
+    if gc.remove_empty_lines:
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        content = '\n'.join(lines)
+    return content
+
+
+def load_samples(samples_dir: Path, limit: int):
+    """Lê até limit arquivos content.txt"""
+    samples = []
+    for path in sorted(samples_dir.rglob("content.txt")):
+        samples.append(path.read_text(encoding="utf-8", errors="replace"))
+        if len(samples) >= limit:
+            break
+    return samples
+
+
+def bench(func, samples, repeat: int) -> float:
+    """Melhor tempo (s) de `repeat` rodadas sobre todas as amostras"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in samples:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = dict(arg.lstrip("-").split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+    config_path = args.get("config", str(project_root / "scraper_config.json"))
+    samples_dir = Path(args.get("samples", project_root / "data" / "scraped" / "estruturado"))
+    limit = int(args.get("limit", 200))
+    repeat = int(args.get("repeat", 5))
+    
+    gc = GarbageCollector(ConfigManager(config_path))
+    samples = load_samples(samples_dir, limit)
+    if not samples:
+        print(f"[ERROR] Nenhum content.txt em {samples_dir}")
+        sys.exit(1)
+    
+    total_chars = sum(len(text) for text in samples)
+    print(f"[*] {len(samples)} amostras, {total_chars:,} caracteres")
+    print(f"[*] Regras no config: {len(gc.garbage_patterns)} padrões + {len(gc.garbage_sequences)} sequências")
+    print(f"[*] Regras compiladas: {len(gc._steps)}")
+    
+    mismatches = sum(1 for text in samples if legacy_clean(gc, text) != gc.clean(text))
+    
+    legacy = bench(lambda text: legacy_clean(gc, text), samples, repeat)
+    compiled = bench(gc.clean, samples, repeat)
+    
+    print(f"\n  antigo:    {legacy * 1000:8.1f} ms  ({total_chars / legacy / 1e6:.1f} M chars/s)")
+    print(f"  compilado: {compiled * 1000:8.1f} ms  ({total_chars / compiled / 1e6:.1f} M chars/s)")
+    print(f"  speedup:   {legacy / compiled:.2f}x")
+    
+    if mismatches:
+        print(f"\n[AVISO] {mismatches} amostras com saída diferente da implementação antiga")
+    else:
+        print(f"\n[OK] Saída idêntica em todas as amostras")
+
+
+if __name__ == "__main__":
+    main()
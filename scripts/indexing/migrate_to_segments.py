@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Migração para o SegmentDocumentRepository
+
+Converte os layouts de um arquivo por documento para segmentos
+append-only:
+
+- repository:   data/scraped/estruturado/<módulo>/<md5>.json(.gz)
+                (FileSystemRepository)
+- estruturado:  docs_estruturado/<módulo>/.../<página>/{content.txt,
+                metadata.json, page.html[.zst|.gz]} (scraper_unificado)
+
+Os arquivos de origem não são alterados. Com --compress, content e HTML
+grandes são gravados comprimidos (zstd com os dicionários de
+--dicts=data/compression_dicts, ou gzip).
+
+Uso:
+    python scripts/indexing/migrate_to_segments.py --source=docs_estruturado
+        [--target=data/scraped/segments] [--layout=auto|repository|estruturado]
+        [--batch=500] [--include-html] [--compress] [--dicts=DIR]
+"""
+
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from libs.scrapers.adapters import FieldCompressor, FileSystemRepository, SegmentDocumentRepository
+from libs.scrapers.adapters.field_compression import find_output_file, open_text_file
+from libs.scrapers.domain import Document, DocumentType, DocumentSource
+
+
+def detect_layout(source: Path) -> str:
+    """estruturado se houver metadata.json de página; senão repository"""
+    return "estruturado" if next(source.rglob("metadata.json"), None) else "repository"
+
+
+def page_to_document(page_dir: Path, module: str, include_html: bool) -> Document:
+    """Monta um Document a partir de uma pasta de página do docs_estruturado"""
+    metadata = json.loads((page_dir / "metadata.json").read_text(encoding="utf-8"))
+    content_file = page_dir / "content.txt"
+    content = content_file.read_text(encoding="utf-8", errors="replace") if content_file.exists() else ""
+    # Remove o cabeçalho "# título / URL: ... / ---" gravado pelo scraper
+    content = content.split("---\n\n", 1)[-1] if "---\n\n" in content else content
+    
+    url = metadata.get("url") or f"file://{page_dir.as_posix()}"
+    title = metadata.get("title") or page_dir.name.replace("_", " ")
+    scraped_at = metadata.get("scraped_at")
+    
+    extra = {k: v for k, v in metadata.items() if k not in ("title", "url", "breadcrumb", "scraped_at")}
+    extra["source_path"] = page_dir.as_posix()
+    if include_html and find_output_file(page_dir / "page.html"):
+        with open_text_file(page_dir / "page.html") as f:
+            extra["html"] = f.read()
+    
+    return Document(
+        id=hashlib.md5(url.encode()).hexdigest(),
+        url=url,
+        title=title,
+        content=content,
+        module=module,
+        doc_type=DocumentType.TECHNICAL_DOC,
+        source=DocumentSource.SENIOR_MADCAP,
+        breadcrumb=metadata.get("breadcrumb") or [],
+        scraped_at=datetime.fromisoformat(scraped_at) if scraped_at else datetime.fromtimestamp(page_dir.stat().st_mtime),
+        metadata=extra,
+    )
+
+
+async def iter_estruturado(source: Path, include_html: bool) -> AsyncIterator[Document]:
+    """Documentos das pastas de página, módulo a módulo"""
+    for module_dir in sorted(source.iterdir()):
+        if not module_dir.is_dir():
+            continue
+        for metadata_file in sorted(module_dir.rglob("metadata.json")):
+            try:
+                doc = page_to_document(metadata_file.parent, module_dir.name, include_html)
+            except Exception as e:
+                print(f"  [AVISO] {metadata_file.parent}: {e}")
+                continue
+            yield doc
+
+
+async def migrate(source: Path, target: Path, layout: str, batch_size: int, include_html: bool,
+                  compressor: FieldCompressor = None) -> None:
+    if layout == "auto":
+        layout = detect_layout(source)
+    print(f"[*] Origem: {source} (layout {layout})")
+    print(f"[*] Destino: {target}")
+    if compressor:
+        print(f"[*] Compressão de campos: {compressor.algorithm}")
+    
+    if layout == "repository":
+        documents = FileSystemRepository(base_dir=str(source)).iter_all()
+    else:
+        documents = iter_estruturado(source, include_html)
+    
+    repository = SegmentDocumentRepository(base_dir=str(target), compressor=compressor)
+    start = time.perf_counter()
+    migrated = 0
+    batch = []
+    async for doc in documents:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await repository.save_many(batch)
+            migrated += len(batch)
+            batch = []
+            print(f"  {migrated} documentos...", end="\r")
+    if batch:
+        await repository.save_many(batch)
+        migrated += len(batch)
+    
+    # Documentos repetidos (mesma URL) viram bytes mortos: compacta no fim
+    freed = await repository.compact() if repository.get_stats()["dead_bytes"] else 0
+    stats = repository.get_stats()
+    repository.close()
+    
+    print(f"\n[OK] {migrated} registros lidos, {stats['documents']} documentos em "
+          f"{stats['segments']} segmentos ({stats['total_bytes'] / 1024 / 1024:.1f} MB) "
+          f"em {time.perf_counter() - start:.1f}s")
+    if freed:
+        print(f"[OK] Compactação removeu versões repetidas ({freed / 1024:.0f} KB)")
+
+
+def main():
+    args = dict(arg.lstrip("-").split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+    source = Path(args.get("source", project_root / "data" / "scraped" / "estruturado"))
+    target = Path(args.get("target", project_root / "data" / "scraped" / "segments"))
+    layout = args.get("layout", "auto")
+    batch_size = int(args.get("batch", 500))
+    include_html = "--include-html" in sys.argv
+    compressor = None
+    if "--compress" in sys.argv:
+        compressor = FieldCompressor(dictionary_dir=args.get("dicts", project_root / "data" / "compression_dicts"))
+    
+    if layout not in ("auto", "repository", "estruturado"):
+        print(f"[ERRO] layout inválido: {layout}")
+        sys.exit(1)
+    if not source.is_dir():
+        print(f"[ERRO] Diretório não encontrado: {source}")
+        sys.exit(1)
+    
+    asyncio.run(migrate(source, target, layout, batch_size, include_html, compressor))
+
+
+if __name__ == "__main__":
+    main()
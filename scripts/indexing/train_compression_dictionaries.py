@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Treino de dicionários zstd por módulo
+
+Amostra páginas de cada módulo e treina um dicionário zstd por módulo
+em data/compression_dicts/ (<id>.zdict + modules.json), usado por
+FieldCompressor nos repositórios e no scraper (--compress-html).
+
+Fontes:
+- estruturado: docs_estruturado/<módulo>/.../page.html[.zst|.gz]
+  (ou content.txt quando não há HTML)
+- repository:  FileSystemRepository (content e metadata["html"])
+- segments:    SegmentDocumentRepository (idem)
+
+Requer o pacote zstandard (pip install zstandard).
+
+Uso:
+    python scripts/indexing/train_compression_dictionaries.py --source=docs_estruturado
+        [--layout=auto|estruturado|repository|segments] [--samples=2000]
+        [--dict-size=112640] [--dicts=data/compression_dicts]
+"""
+
+import asyncio
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from libs.scrapers.adapters import FieldCompressor, FileSystemRepository, SegmentDocumentRepository
+from libs.scrapers.adapters.field_compression import find_output_file, open_text_file, zstandard
+from libs.scrapers.adapters.segment_repository import INDEX_NAME
+
+
+def detect_layout(source: Path) -> str:
+    if (source / INDEX_NAME).exists():
+        return "segments"
+    return "estruturado" if next(source.rglob("metadata.json"), None) else "repository"
+
+
+def sample_estruturado(source: Path, limit: int) -> Dict[str, List[str]]:
+    """Até limit páginas (HTML ou content.txt) por módulo"""
+    samples: Dict[str, List[str]] = defaultdict(list)
+    for module_dir in sorted(source.iterdir()):
+        if not module_dir.is_dir():
+            continue
+        for metadata_file in module_dir.rglob("metadata.json"):
+            page = find_output_file(metadata_file.parent / "page.html") or find_output_file(metadata_file.parent / "content.txt")
+            if page is None:
+                continue
+            with open_text_file(page) as f:
+                samples[module_dir.name].append(f.read())
+            if len(samples[module_dir.name]) >= limit:
+                break
+    return samples
+
+
+async def sample_repository(repository, limit: int) -> Dict[str, List[str]]:
+    """Até limit textos (content e HTML) por módulo"""
+    samples: Dict[str, List[str]] = defaultdict(list)
+    async for doc in repository.iter_all():
+        module_samples = samples[doc.module]
+        if len(module_samples) >= limit:
+            continue
+        module_samples.append(doc.content)
+        if doc.metadata.get("html"):
+            module_samples.append(doc.metadata["html"])
+    return samples
+
+
+def main():
+    args = dict(arg.lstrip("-").split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+    source = Path(args.get("source", "docs_estruturado"))
+    layout = args.get("layout", "auto")
+    limit = int(args.get("samples", 2000))
+    dict_size = int(args.get("dict-size", 112640))
+    dicts_dir = Path(args.get("dicts", project_root / "data" / "compression_dicts"))
+    
+    if zstandard is None:
+        print("[ERRO] Pacote zstandard não instalado (pip install zstandard)")
+        sys.exit(1)
+    if not source.is_dir():
+        print(f"[ERRO] Diretório não encontrado: {source}")
+        sys.exit(1)
+    
+    if layout == "auto":
+        layout = detect_layout(source)
+    print(f"[*] Origem: {source} (layout {layout})")
+    
+    if layout == "estruturado":
+        samples = sample_estruturado(source, limit)
+    elif layout == "segments":
+        samples = asyncio.run(sample_repository(SegmentDocumentRepository(base_dir=str(source)), limit))
+    elif layout == "repository":
+        samples = asyncio.run(sample_repository(FileSystemRepository(base_dir=str(source)), limit))
+    else:
+        print(f"[ERRO] layout inválido: {layout}")
+        sys.exit(1)
+    
+    compressor = FieldCompressor(algorithm="zstd", dictionary_dir=dicts_dir)
+    trained = 0
+    for module, texts in sorted(samples.items()):
+        try:
+            dict_id = compressor.train_dictionary(module, texts, dict_size=dict_size)
+        except ValueError as e:
+            print(f"  [AVISO] {module}: {e}")
+            continue
+        raw = sum(len(text.encode("utf-8")) for text in texts)
+        plain = FieldCompressor(algorithm="zstd", level=compressor.level)
+        without = sum(len(plain.compress_bytes(text.encode("utf-8"))) for text in texts)
+        with_dict = sum(len(compressor.compress_bytes(text.encode("utf-8"), module)) for text in texts)
+        print(f"  {module}: dicionário {dict_id}, {len(texts)} amostras, "
+              f"razão {raw / without:.1f}x -> {raw / with_dict:.1f}x")
+        trained += 1
+    
+    print(f"\n[OK] {trained} dicionários em {dicts_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Fixtures compartilhadas pelos testes unitários e de integração
+"""
+
+from datetime import datetime
+
+import pytest
+
+from libs.scrapers.domain import Document, DocumentType, DocumentSource
+
+
+@pytest.fixture
+def make_document():
+    """
+    Fábrica de documentos de exemplo.
+    
+    make_document(i) cria test-<i> com URL, título e conteúdo derivados
+    de i; module, content e demais campos de Document podem ser passados
+    por keyword.
+    """
+    def factory(i: int, module: str = "test-module", content: str = None, **fields) -> Document:
+        fields.setdefault("metadata", {"version": "6.10.4"})
+        fields.setdefault("keywords", ["senior", f"kw-{i % 3}"])
+        return Document(
+            id=f"test-{i}",
+            url=fields.pop("url", None) or f"https://example.com/doc{i}",
+            title=f"Document {i}",
+            content=content or f"Content {i}",
+            module=module,
+            doc_type=DocumentType.TECHNICAL_DOC,
+            source=DocumentSource.SENIOR_MADCAP,
+            scraped_at=datetime.now(),
+            **fields,
+        )
+    return factory
+
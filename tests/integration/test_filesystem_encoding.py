@@ -0,0 +1,68 @@
+"""
+Testes de integração - Escrita em lote e encodings do FileSystemRepository
+
+Testa save_many concorrente e os encodings pretty/compact/gzip com
+sistema de arquivos real.
+"""
+
+import gzip
+import json
+import pytest
+
+from libs.scrapers.adapters import FileSystemRepository
+
+
+class TestFileSystemEncoding:
+    """Testes de save_many concorrente e encodings em disco"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding,suffix", [
+        ("pretty", ".json"), ("compact", ".json"), ("gzip", ".json.gz"),
+    ])
+    async def test_round_trip(self, tmp_path, encoding, suffix, make_document):
+        """Testa gravar e reler documentos em cada encoding"""
+        repository = FileSystemRepository(base_dir=str(tmp_path), encoding=encoding, save_workers=4)
+        docs = [make_document(i, module=f"mod-{i % 3}") for i in range(30)]
+        await repository.save_many(docs)
+        repository.close()
+        
+        files = list((tmp_path / "mod-0").iterdir())
+        assert len(files) == 10
+        assert all(f.name.endswith(suffix) for f in files)
+        
+        # Instância nova: sem cache, lendo do disco
+        reopened = FileSystemRepository(base_dir=str(tmp_path), encoding=encoding)
+        assert await reopened.count() == 30
+        assert (await reopened.find_by_id("test-7")).to_dict() == docs[7].to_dict()
+        assert len(await reopened.get_all()) == 30
+    
+    @pytest.mark.asyncio
+    async def test_compact_and_gzip_are_smaller(self, tmp_path, make_document):
+        """Testa que compact e gzip ocupam menos que o JSON indentado"""
+        sizes = {}
+        for encoding in ("pretty", "compact", "gzip"):
+            repository = FileSystemRepository(base_dir=str(tmp_path / encoding), encoding=encoding)
+            await repository.save(make_document(1, content="Texto repetido. " * 200))
+            path = next((tmp_path / encoding / "test-module").iterdir())
+            sizes[encoding] = path.stat().st_size
+        
+        assert sizes["gzip"] < sizes["compact"] < sizes["pretty"]
+        gz_path = next((tmp_path / "gzip" / "test-module").iterdir())
+        assert json.loads(gzip.decompress(gz_path.read_bytes()))["id"] == "test-1"
+    
+    @pytest.mark.asyncio
+    async def test_save_many_duplicates_and_encoding_switch(self, tmp_path, make_document):
+        """Testa id repetido no lote e troca de encoding sem deixar arquivo antigo"""
+        repository = FileSystemRepository(base_dir=str(tmp_path), encoding="pretty")
+        await repository.save_many([make_document(1), make_document(1, content="Last")])
+        assert (await repository.find_by_id("test-1")).content == "Last"
+        
+        switched = FileSystemRepository(base_dir=str(tmp_path), encoding="gzip")
+        await switched.save_many([make_document(1, content="Gzip")])
+        
+        files = [f.name for f in (tmp_path / "test-module").iterdir()]
+        assert len(files) == 1 and files[0].endswith(".json.gz")
+        assert await switched.count() == 1
+        
+        with pytest.raises(ValueError):
+            FileSystemRepository(base_dir=str(tmp_path), encoding="xml")
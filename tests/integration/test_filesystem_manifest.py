@@ -0,0 +1,75 @@
+"""
+Testes de integração - Manifesto do FileSystemRepository
+
+Testa o índice _manifest.json (id -> módulo/arquivo, url, hash, tamanho)
+com sistema de arquivos real.
+"""
+
+import json
+import pytest
+
+from libs.scrapers.adapters import FileSystemRepository
+from libs.scrapers.adapters.filesystem_repository import MANIFEST_NAME
+
+
+class TestFileSystemManifest:
+    """Testes do manifesto do FileSystemRepository"""
+    
+    @pytest.mark.asyncio
+    async def test_lookups_use_manifest(self, tmp_path, make_document):
+        """Testa id, url, exists e count a partir do manifesto gravado em save_many"""
+        repository = FileSystemRepository(base_dir=str(tmp_path))
+        await repository.save_many([make_document(i, module=f"mod-{i % 2}") for i in range(5)])
+        
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+        assert set(manifest["entries"]) == {f"test-{i}" for i in range(5)}
+        
+        # Instância nova: nada em cache, só o manifesto
+        fresh = FileSystemRepository(base_dir=str(tmp_path))
+        assert await fresh.count() == 5
+        assert await fresh.exists("test-3")
+        assert not await fresh.exists("missing")
+        assert (await fresh.find_by_url("https://example.com/doc4")).id == "test-4"
+        assert (await fresh.find_by_id("test-1")).module == "mod-1"
+    
+    @pytest.mark.asyncio
+    async def test_delete_updates_manifest(self, tmp_path, make_document):
+        """Testa que delete remove arquivo e entrada do manifesto"""
+        repository = FileSystemRepository(base_dir=str(tmp_path))
+        await repository.save_many([make_document(i) for i in range(3)])
+        
+        assert await repository.delete("test-1")
+        assert not await repository.delete("test-1")
+        
+        fresh = FileSystemRepository(base_dir=str(tmp_path))
+        assert await fresh.count() == 2
+        assert await fresh.find_by_url("https://example.com/doc1") is None
+    
+    @pytest.mark.asyncio
+    async def test_rebuilds_missing_or_stale_manifest(self, tmp_path, make_document):
+        """Testa reconstrução quando o manifesto some ou não viu uma escrita"""
+        repository = FileSystemRepository(base_dir=str(tmp_path))
+        await repository.save_many([make_document(i) for i in range(3)])
+        (tmp_path / MANIFEST_NAME).unlink()
+        
+        assert await FileSystemRepository(base_dir=str(tmp_path)).count() == 3
+        
+        # Escrita sem manifesto (ex: processo antigo): diretório muda, manifesto fica velho
+        writer = FileSystemRepository(base_dir=str(tmp_path), use_manifest=False)
+        await writer.save(make_document(7))
+        
+        fresh = FileSystemRepository(base_dir=str(tmp_path))
+        assert await fresh.count() == 4
+        assert (await fresh.find_by_url("https://example.com/doc7")).id == "test-7"
+    
+    @pytest.mark.asyncio
+    async def test_save_moves_document_between_modules(self, tmp_path, make_document):
+        """Testa que mudar o módulo de um documento não deixa arquivo duplicado"""
+        repository = FileSystemRepository(base_dir=str(tmp_path))
+        await repository.save(make_document(1, module="old"))
+        await repository.save(make_document(1, module="new"))
+        repository.flush_manifest()
+        
+        assert await repository.find_by_module("old") == []
+        assert [doc.id for doc in await repository.find_by_module("new")] == ["test-1"]
+        assert await FileSystemRepository(base_dir=str(tmp_path)).count() == 1
@@ -12,7 +12,7 @@ from pathlib import Path
 from datetime import datetime
 
 from libs.scrapers.adapters import FileSystemRepository
-from libs.scrapers.domain import Document, DocumentType, DocumentSource
+from libs.scrapers.domain import Document, DocumentMetadata, DocumentType, DocumentSource
 
 
 class TestFileSystemRepositoryIntegration:
@@ -201,3 +201,18 @@ class TestFileSystemRepositoryIntegration:
         
         # Assert
         assert total == 7
+    
+    @pytest.mark.asyncio
+    async def test_metadata_round_trip(self, tmp_path, make_document):
+        """Testa salvar e recuperar metadados agregados"""
+        # Arrange
+        repository = FileSystemRepository(base_dir=str(tmp_path / "estruturado"))
+        docs = [make_document(i, module="modulo-a" if i % 2 else "modulo-b") for i in range(4)]
+        metadata = DocumentMetadata.from_documents(docs)
+        
+        # Act
+        await repository.save_metadata(metadata)
+        loaded = await repository.get_metadata()
+        
+        # Assert
+        assert loaded.to_dict() == metadata.to_dict()
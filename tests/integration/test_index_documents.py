@@ -0,0 +1,82 @@
+"""
+Testes de integração - IndexDocuments
+
+Testa a indexação em passada única (JSONL, metadados e índice por módulo)
+sobre um FileSystemRepository real.
+"""
+
+import json
+import pytest
+
+from libs.scrapers.adapters import FileSystemRepository
+from libs.scrapers.domain import DocumentMetadata, MetadataAccumulator
+from libs.scrapers.use_cases.index_documents import IndexDocuments
+
+
+class TestIndexDocumentsStreaming:
+    """Testes da indexação em streaming"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        return FileSystemRepository(base_dir=str(tmp_path / "docs"))
+    
+    @pytest.mark.asyncio
+    async def test_iter_all_and_iter_by_module(self, repository, make_document):
+        """Testa que os iteradores devolvem os mesmos documentos que get_all/find_by_module"""
+        await repository.save_many([make_document(i, module=f"mod-{i % 2}") for i in range(6)])
+        
+        streamed = sorted([doc.id async for doc in repository.iter_all()])
+        mod_0 = sorted([doc.id async for doc in repository.iter_by_module("mod-0")])
+        
+        assert streamed == sorted(doc.id for doc in await repository.get_all())
+        assert mod_0 == ["test-0", "test-2", "test-4"]
+        assert [doc async for doc in repository.iter_by_module("missing")] == []
+    
+    def test_accumulator_matches_from_documents(self, make_document):
+        """Testa que o acumulador gera os mesmos metadados que from_documents"""
+        docs = [make_document(i, module=f"mod-{i % 3}") for i in range(10)]
+        accumulator = MetadataAccumulator()
+        for doc in docs:
+            accumulator.add(doc)
+        
+        expected = DocumentMetadata.from_documents(docs, output_dir="out").to_dict()
+        built = accumulator.build(output_dir="out").to_dict()
+        expected.pop("generated_at", None)
+        built.pop("generated_at", None)
+        
+        assert built == expected
+    
+    @pytest.mark.asyncio
+    async def test_execute_writes_all_outputs(self, repository, tmp_path, make_document):
+        """Testa JSONL, metadados e índice por módulo gerados na mesma passada"""
+        await repository.save_many([make_document(i, module=f"mod-{i % 2}") for i in range(5)])
+        output_dir = tmp_path / "index"
+        
+        result = await IndexDocuments(repository).execute(output_dir=str(output_dir))
+        
+        lines = (output_dir / "docs_indexacao_detailed.jsonl").read_text(encoding="utf-8").splitlines()
+        by_module = json.loads((output_dir / "index_by_module.json").read_text(encoding="utf-8"))
+        
+        assert result["total_documents"] == 5
+        assert result["by_module"] == {"mod-0": 3, "mod-1": 2}
+        assert sorted(json.loads(line)["id"] for line in lines) == [f"test-{i}" for i in range(5)]
+        assert sorted(ref["id"] for ref in by_module["mod-1"]) == ["test-1", "test-3"]
+        assert set(by_module["mod-0"][0]) == {"id", "title", "url"}
+    
+    @pytest.mark.asyncio
+    async def test_execute_empty_and_validate_duplicates(self, repository, tmp_path, make_document):
+        """Testa repositório vazio e detecção de URLs duplicadas"""
+        output_dir = tmp_path / "index"
+        use_case = IndexDocuments(repository)
+        
+        empty = await use_case.execute(output_dir=str(output_dir))
+        assert empty["total_documents"] == 0
+        assert not (output_dir / "docs_indexacao_detailed.jsonl").exists()
+        
+        await repository.save_many([
+            make_document(i, url="https://example.com/same" if i < 2 else None) for i in range(4)
+        ])
+        validation = await use_case.validate_index()
+        
+        assert validation["total_documents"] == 4
+        assert "Found duplicate URLs: 1" in validation["warnings"]
@@ -0,0 +1,129 @@
+"""
+Testes de integração - SegmentDocumentRepository
+
+Testa o repositório de segmentos append-only com sistema de arquivos real.
+"""
+
+import json
+import threading
+
+import pytest
+
+from libs.scrapers.adapters import SegmentDocumentRepository
+from libs.scrapers.adapters.segment_repository import INDEX_NAME
+
+
+def segment_files(path):
+    return sorted(p.name for p in path.glob("segment-*.jsonl"))
+
+
+class TestSegmentDocumentRepository:
+    """Testes do repositório de segmentos"""
+    
+    @pytest.mark.asyncio
+    async def test_random_access_and_scans(self, tmp_path, make_document):
+        """Testa leitura por id/url/módulo e varredura sequencial em vários segmentos"""
+        repository = SegmentDocumentRepository(base_dir=str(tmp_path), segment_max_bytes=2048)
+        docs = [make_document(i, module=f"mod-{i % 2}") for i in range(20)]
+        await repository.save_many(docs)
+        
+        assert len(segment_files(tmp_path)) > 1
+        assert (await repository.find_by_id("test-13")).to_dict() == docs[13].to_dict()
+        assert (await repository.find_by_url("https://example.com/doc4")).id == "test-4"
+        assert [d.id for d in await repository.find_by_module("mod-1")] == [f"test-{i}" for i in range(1, 20, 2)]
+        assert [d.id async for d in repository.iter_all()] == [f"test-{i}" for i in range(20)]
+        assert await repository.count() == 20
+    
+    @pytest.mark.asyncio
+    async def test_overwrite_delete_and_export(self, tmp_path, make_document):
+        """Testa que versões antigas e lápides ficam fora das leituras e do export"""
+        repository = SegmentDocumentRepository(base_dir=str(tmp_path), compact_ratio=0)
+        await repository.save_many([make_document(i) for i in range(4)])
+        await repository.save(make_document(1, content="Updated"))
+        assert await repository.delete("test-2")
+        assert not await repository.delete("test-2")
+        
+        output_file = tmp_path / "export.jsonl"
+        count = await repository.export_to_jsonl(str(output_file))
+        exported = [json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()]
+        
+        assert count == 3
+        assert [d["id"] for d in exported] == ["test-0", "test-3", "test-1"]
+        assert exported[-1]["content"] == "Updated"
+        assert repository.get_stats()["dead_bytes"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_compaction_keeps_live_records(self, tmp_path, make_document):
+        """Testa que compactar remove bytes mortos e preserva os documentos vivos"""
+        repository = SegmentDocumentRepository(base_dir=str(tmp_path), segment_max_bytes=4096, compact_ratio=0)
+        for round_ in range(3):
+            await repository.save_many([make_document(i, content=f"Round {round_}") for i in range(10)])
+        before = segment_files(tmp_path)
+        
+        freed = await repository.compact()
+        
+        assert freed > 0
+        assert repository.get_stats()["dead_bytes"] == 0
+        assert not set(before) & set(segment_files(tmp_path))
+        assert {d.content async for d in repository.iter_all()} == {"Round 2"}
+        
+        reopened = SegmentDocumentRepository(base_dir=str(tmp_path))
+        assert await reopened.count() == 10
+        assert (await reopened.find_by_id("test-5")).content == "Round 2"
+    
+    @pytest.mark.asyncio
+    async def test_recovers_stale_index_and_torn_write(self, tmp_path, make_document):
+        """Testa reabrir com índice desatualizado e uma linha incompleta no fim"""
+        repository = SegmentDocumentRepository(base_dir=str(tmp_path), index_flush_every=1000)
+        await repository.save_many([make_document(i) for i in range(3)])
+        await repository.save(make_document(3))  # índice ainda não regravado
+        repository._writer.flush()
+        with open(tmp_path / segment_files(tmp_path)[-1], "ab") as f:
+            f.write(b'{"id":"test-9","url":')  # escrita interrompida
+        
+        reopened = SegmentDocumentRepository(base_dir=str(tmp_path))
+        
+        assert await reopened.count() == 4
+        assert await reopened.exists("test-3")
+        assert not await reopened.exists("test-9")
+        await reopened.save(make_document(4))
+        assert [d.id async for d in reopened.iter_all()] == [f"test-{i}" for i in range(5)]
+    
+    @pytest.mark.asyncio
+    async def test_rebuilds_without_index(self, tmp_path, make_document):
+        """Testa reconstruir o índice só a partir dos segmentos"""
+        repository = SegmentDocumentRepository(base_dir=str(tmp_path))
+        await repository.save_many([make_document(i) for i in range(5)])
+        await repository.delete("test-0")
+        repository.close()
+        (tmp_path / INDEX_NAME).unlink()
+        
+        rebuilt = SegmentDocumentRepository(base_dir=str(tmp_path))
+        
+        assert await rebuilt.count() == 4
+        assert not await rebuilt.exists("test-0")
+        await rebuilt.clear()
+        assert await rebuilt.count() == 0
+        assert segment_files(tmp_path) == []
+    
+    @pytest.mark.asyncio
+    async def test_io_runs_off_the_event_loop(self, tmp_path, make_document, monkeypatch):
+        """Testa que gravação, compactação e leitura em lotes rodam fora da thread do loop"""
+        repository = SegmentDocumentRepository(base_dir=str(tmp_path), compact_ratio=0, batch_size=3)
+        loop_thread = threading.get_ident()
+        io_threads = set()
+        original_append = repository._append
+        
+        def append(line):
+            io_threads.add(threading.get_ident())
+            return original_append(line)
+        
+        monkeypatch.setattr(repository, "_append", append)
+        await repository.save_many([make_document(i, module=f"mod-{i % 2}") for i in range(10)])
+        await repository.save(make_document(3, module="mod-1", content="Updated"))
+        await repository.compact()
+        
+        assert io_threads and loop_thread not in io_threads
+        assert [d.id async for d in repository.iter_all()] == [f"test-{i}" for i in range(10) if i != 3] + ["test-3"]
+        assert len(await repository.find_by_module("mod-1")) == 5
+        assert (await repository.find_by_id("test-3")).content == "Updated"
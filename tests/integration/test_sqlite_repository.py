@@ -0,0 +1,111 @@
+"""
+Testes de integração - SqliteDocumentRepository
+
+Testa o adapter SqliteDocumentRepository com um banco SQLite real.
+"""
+
+import json
+import pytest
+
+from libs.scrapers.adapters import SqliteDocumentRepository
+from libs.scrapers.domain import DocumentMetadata
+
+
+class TestSqliteDocumentRepositoryIntegration:
+    """Testes de integração para SqliteDocumentRepository"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        """Cria repositório em diretório temporário"""
+        repo = SqliteDocumentRepository(db_path=str(tmp_path / "documents.sqlite3"), batch_size=3)
+        yield repo
+        repo.close()
+    
+    @pytest.mark.asyncio
+    async def test_save_and_find(self, repository, make_document):
+        """Testa salvar e buscar por id, url e existência"""
+        doc = make_document(1)
+        await repository.save(doc)
+        
+        by_id = await repository.find_by_id("test-1")
+        by_url = await repository.find_by_url("https://example.com/doc1")
+        
+        assert by_id.to_dict() == doc.to_dict()
+        assert by_url.id == "test-1"
+        assert await repository.exists("test-1")
+        assert not await repository.exists("missing")
+        assert await repository.find_by_id("missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_save_many_replaces_and_counts(self, repository, make_document):
+        """Testa salvar lote em transação única e substituir documentos existentes"""
+        await repository.save_many([make_document(i) for i in range(7)])
+        await repository.save_many([make_document(0, content="Updated")])
+        
+        assert await repository.count() == 7
+        assert (await repository.find_by_id("test-0")).content == "Updated"
+    
+    @pytest.mark.asyncio
+    async def test_find_by_module_and_content_hash(self, repository, make_document):
+        """Testa buscas pelas colunas indexadas de módulo e hash de conteúdo"""
+        modules = ["modulo-a", "modulo-b", "modulo-a"]
+        await repository.save_many([
+            make_document(i, module=modules[i], content="Same content") for i in range(3)
+        ])
+        
+        modulo_a = await repository.find_by_module("modulo-a")
+        same = await repository.find_by_content_hash(repository.content_hash("Same content"))
+        
+        assert [doc.id for doc in modulo_a] == ["test-0", "test-2"]
+        assert len(same) == 3
+    
+    @pytest.mark.asyncio
+    async def test_iter_all_streams_in_batches(self, repository, make_document):
+        """Testa iteração em lotes (batch_size=3) preservando a ordem de inserção"""
+        await repository.save_many([make_document(i) for i in range(8)])
+        
+        ids = [doc.id async for doc in repository.iter_all()]
+        
+        assert ids == [f"test-{i}" for i in range(8)]
+        assert len(await repository.get_all()) == 8
+    
+    @pytest.mark.asyncio
+    async def test_delete_export_and_clear(self, repository, tmp_path, make_document):
+        """Testa remover, exportar para JSONL e limpar"""
+        await repository.save_many([make_document(i) for i in range(4)])
+        
+        assert await repository.delete("test-1")
+        assert not await repository.delete("test-1")
+        
+        output_file = tmp_path / "export.jsonl"
+        count = await repository.export_to_jsonl(str(output_file))
+        lines = output_file.read_text(encoding="utf-8").strip().split("\n")
+        
+        assert count == 3
+        assert [json.loads(line)["id"] for line in lines] == ["test-0", "test-2", "test-3"]
+        
+        await repository.clear()
+        assert await repository.count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_metadata_round_trip(self, repository, make_document):
+        """Testa salvar e recuperar metadados agregados"""
+        docs = [make_document(i, module="modulo-a" if i % 2 else "modulo-b") for i in range(4)]
+        metadata = DocumentMetadata.from_documents(docs)
+        
+        await repository.save_metadata(metadata)
+        loaded = await repository.get_metadata()
+        
+        assert loaded.to_dict() == metadata.to_dict()
+    
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path, make_document):
+        """Testa que os dados sobrevivem a reabrir o arquivo"""
+        db_path = str(tmp_path / "documents.sqlite3")
+        first = SqliteDocumentRepository(db_path=db_path)
+        await first.save(make_document(1))
+        first.close()
+        
+        second = SqliteDocumentRepository(db_path=db_path)
+        assert await second.count() == 1
+        second.close()
@@ -0,0 +1,140 @@
+"""
+Testes unitários para AdaptiveHostLimiter
+"""
+
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from libs.scrapers.adapters.adaptive_host_limiter import AdaptiveHostLimiter
+from libs.scrapers.ports.rate_limiter import rate_limited
+
+
+def make_limiter(**kwargs):
+    params = dict(
+        requests_per_second=1000.0,
+        burst=100,
+        initial_concurrency=2,
+        min_concurrency=1,
+        max_concurrency=8,
+        latency_target=0.0,
+    )
+    params.update(kwargs)
+    return AdaptiveHostLimiter(**params)
+
+
+@pytest.mark.asyncio
+async def test_window_limits_in_flight_per_host():
+    """Janela de concorrência bloqueia o host, mas não outros hosts"""
+    limiter = make_limiter(latency_target=10.0)
+    url = "https://documentacao.senior.com.br/a"
+    
+    await limiter.acquire(url)
+    await limiter.acquire(url)
+    
+    blocked = asyncio.create_task(limiter.acquire(url))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+    
+    # Outro host tem janela própria
+    await asyncio.wait_for(limiter.acquire("https://suporte.senior.com.br/x"), timeout=1)
+    
+    await limiter.release(url, status=200, latency=0.01)
+    await asyncio.wait_for(blocked, timeout=1)
+    assert limiter.get_stats()["documentacao.senior.com.br"]["in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests():
+    """Sem tokens, acquire espera a reposição do bucket"""
+    limiter = make_limiter(requests_per_second=20.0, burst=1, latency_target=10.0)
+    url = "https://example.com/"
+    
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire(url)
+        await limiter.release(url, status=200, latency=0.0)
+    
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_aimd_increase_and_decrease():
+    """Sucessos aumentam a janela; 429/5xx reduzem multiplicativamente"""
+    limiter = make_limiter(initial_concurrency=4, latency_target=10.0)
+    url = "https://example.com/"
+    
+    # +1 por janela completa de sucessos (~4 respostas com janela 4)
+    for _ in range(5):
+        await limiter.acquire(url)
+        await limiter.release(url, status=200, latency=0.01)
+    assert limiter.get_concurrency(url) == 5
+    
+    await limiter.acquire(url)
+    await limiter.release(url, status=500, latency=0.01)
+    assert limiter.get_concurrency(url) == 2
+    assert limiter.get_stats()["example.com"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_shrink_window():
+    """Latência acima do alvo conta como sinal de congestionamento"""
+    limiter = make_limiter(initial_concurrency=4, latency_target=0.5)
+    url = "https://example.com/"
+    
+    await limiter.acquire(url)
+    await limiter.release(url, status=200, latency=2.0)
+    
+    assert limiter.get_concurrency(url) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_host():
+    """429 com Retry-After pausa novas requisições ao host"""
+    limiter = make_limiter(initial_concurrency=4)
+    url = "https://example.com/"
+    
+    await limiter.acquire(url)
+    await limiter.release(url, status=429, retry_after="0.2")
+    
+    start = time.monotonic()
+    await limiter.acquire(url)
+    assert time.monotonic() - start >= 0.15
+    assert limiter.get_stats()["example.com"]["throttled"] == 1
+
+
+def test_parse_retry_after():
+    """Retry-After aceita segundos ou data HTTP"""
+    assert AdaptiveHostLimiter.parse_retry_after("120") == 120.0
+    assert AdaptiveHostLimiter.parse_retry_after(None) is None
+    assert AdaptiveHostLimiter.parse_retry_after("invalido") is None
+    
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= AdaptiveHostLimiter.parse_retry_after(future) <= 30
+
+
+@pytest.mark.asyncio
+async def test_limit_context_reports_errors():
+    """Exceção sem resposta é registrada como erro e a vaga é liberada"""
+    limiter = make_limiter(initial_concurrency=2)
+    url = "https://example.com/"
+    
+    with pytest.raises(RuntimeError):
+        async with limiter.limit(url):
+            raise RuntimeError("timeout")
+    
+    stats = limiter.get_stats()["example.com"]
+    assert stats["errors"] == 1
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_without_limiter():
+    """rate_limited sem limitador apenas entrega o ticket"""
+    async with rate_limited(None, "https://example.com/") as ticket:
+        ticket.observe(200)
+    
+    assert ticket.status == 200
@@ -0,0 +1,138 @@
+"""
+Testes unitários para AssetCache
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from libs.scrapers.adapters.asset_cache import AssetCache
+
+
+CSS_URL = "https://documentacao.senior.com.br/Skins/Default/Stylesheets/Components/Styles.css"
+
+
+def make_route(url=CSS_URL, resource_type="stylesheet", status=200, body=b"body{}", headers=None):
+    """Route falso do Playwright cuja rede responde com status/body/headers"""
+    route = MagicMock()
+    route.request.url = url
+    route.request.method = "GET"
+    route.request.resource_type = resource_type
+    route.request.headers = {"user-agent": "test"}
+    
+    response = MagicMock()
+    response.status = status
+    response.headers = headers if headers is not None else {"cache-control": "max-age=3600", "etag": '"v1"'}
+    response.body = AsyncMock(return_value=body)
+    
+    route.fetch = AsyncMock(return_value=response)
+    route.fulfill = AsyncMock()
+    route.continue_ = AsyncMock()
+    return route
+
+
+@pytest.mark.asyncio
+async def test_miss_stores_then_fresh_hit_skips_network(tmp_path):
+    """Primeira requisição vai à rede e grava; a segunda é servida do disco"""
+    cache = AssetCache(tmp_path)
+    
+    first = make_route()
+    await cache.handle_route(first)
+    first.fetch.assert_awaited_once()
+    assert first.fulfill.await_args.kwargs["body"] == b"body{}"
+    
+    # Outra instância (outro worker/execução) sobre o mesmo diretório
+    cache.close()
+    cache = AssetCache(tmp_path)
+    second = make_route()
+    await cache.handle_route(second)
+    
+    second.fetch.assert_not_awaited()
+    assert second.fulfill.await_args.kwargs["body"] == b"body{}"
+    assert cache.get_stats()["hits"] == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_revalidates_with_etag(tmp_path):
+    """Entrada vencida é revalidada com If-None-Match e reaproveitada em 304"""
+    cache = AssetCache(tmp_path)
+    await cache.handle_route(make_route(headers={"cache-control": "no-cache", "etag": '"v1"'}))
+    
+    route = make_route(status=304, body=b"", headers={"cache-control": "max-age=60"})
+    await cache.handle_route(route)
+    
+    assert route.fetch.await_args.kwargs["headers"]["if-none-match"] == '"v1"'
+    assert route.fulfill.await_args.kwargs["body"] == b"body{}"
+    assert route.fulfill.await_args.kwargs["status"] == 200
+    assert cache.get_stats()["revalidated"] == 1
+    
+    # Revalidado com max-age: próxima requisição nem vai à rede
+    third = make_route()
+    await cache.handle_route(third)
+    third.fetch.assert_not_awaited()
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_no_store_and_documents_are_not_cached(tmp_path):
+    """no-store não é gravado; documentos HTML seguem direto para a rede"""
+    cache = AssetCache(tmp_path)
+    
+    await cache.handle_route(make_route(headers={"cache-control": "no-store"}))
+    assert cache.get_stats()["entries"] == 0
+    
+    document = make_route(url="https://documentacao.senior.com.br/bpm/6.0/", resource_type="document")
+    await cache.handle_route(document)
+    document.continue_.assert_awaited_once()
+    document.fetch.assert_not_awaited()
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_keeps_size_bounded(tmp_path):
+    """Acima de max_bytes, as entradas menos usadas são despejadas"""
+    cache = AssetCache(tmp_path, max_bytes=250)
+    urls = [f"https://documentacao.senior.com.br/Skins/{i}.js" for i in range(3)]
+    
+    await cache.handle_route(make_route(url=urls[0], resource_type="script", body=b"a" * 100))
+    await cache.handle_route(make_route(url=urls[1], resource_type="script", body=b"b" * 100))
+    # Toca a primeira para que a segunda seja a menos usada
+    await cache.handle_route(make_route(url=urls[0], resource_type="script"))
+    await cache.handle_route(make_route(url=urls[2], resource_type="script", body=b"c" * 100))
+    
+    assert cache.size_bytes() <= 250
+    assert cache._lookup(urls[1]) is None
+    assert cache._lookup(urls[0]) is not None
+    assert cache.get_stats()["evicted"] == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_of_same_blob_are_all_fulfilled(tmp_path):
+    """Vários contextos buscando o mesmo asset gravam o blob uma vez e todos recebem resposta"""
+    cache = AssetCache(tmp_path)
+    routes = [make_route() for _ in range(8)]
+    
+    await asyncio.gather(*[cache.handle_route(route) for route in routes])
+    
+    assert all(route.fulfill.await_args.kwargs["body"] == b"body{}" for route in routes)
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert cache.get_stats()["bypassed"] == 0
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_store_failure_still_fulfills_fetched_body(tmp_path):
+    """Erro ao gravar no cache só conta como bypass; a página recebe o corpo buscado"""
+    cache = AssetCache(tmp_path)
+    route = make_route()
+    
+    with patch.object(AssetCache, "_store", side_effect=OSError("disk full")):
+        await cache.handle_route(route)
+    
+    assert route.fulfill.await_args.kwargs["body"] == b"body{}"
+    route.continue_.assert_not_awaited()
+    assert cache.get_stats()["bypassed"] == 1
+    cache.close()
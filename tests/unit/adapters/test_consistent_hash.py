@@ -0,0 +1,90 @@
+"""
+Testes unitários para o particionamento por hash consistente
+"""
+
+import pytest
+
+from libs.scrapers.adapters.consistent_hash import (
+    ConsistentHashRing,
+    module_shard_key,
+    shard_urls_by_key,
+)
+from libs.scrapers.adapters.lease_work_queue import LeaseWorkQueue
+
+
+BASE = "https://documentacao.senior.com.br"
+
+
+def test_module_shard_key_groups_module_and_version():
+    """Páginas do mesmo módulo/versão têm a mesma chave; versões diferentes não"""
+    a = module_shard_key(f"{BASE}/gestaoempresarialerp/5.10.4/#financas/titulos.htm")
+    b = module_shard_key(f"{BASE}/gestaoempresarialerp/5.10.4/#vendas/pedidos.htm")
+    c = module_shard_key(f"{BASE}/gestaoempresarialerp/5.10.3/#financas/titulos.htm")
+    
+    assert a == b == "documentacao.senior.com.br/gestaoempresarialerp/5.10.4"
+    assert a != c
+
+
+def test_ring_moves_only_keys_of_new_node():
+    """Adicionar um worker só move chaves para ele; remover devolve o mapeamento anterior"""
+    ring = ConsistentHashRing(["w1", "w2", "w3"])
+    keys = [f"module-{i}/1.0" for i in range(1000)]
+    before = {key: ring.get_node(key) for key in keys}
+    
+    ring.add_node("w4")
+    after = {key: ring.get_node(key) for key in keys}
+    moved = [key for key in keys if before[key] != after[key]]
+    
+    assert all(after[key] == "w4" for key in moved)
+    assert 150 < len(moved) < 350  # ~1/4 das chaves
+    
+    ring.remove_node("w4")
+    assert {key: ring.get_node(key) for key in keys} == before
+
+
+def test_shard_urls_by_key_keeps_modules_together_with_bounded_load():
+    """Módulos pequenos ficam inteiros numa partição; nenhuma passa do limite de carga"""
+    urls = (
+        [f"{BASE}/bpm/6.0/#p{i}.htm" for i in range(6)]
+        + [f"{BASE}/crm/5.10.4/#p{i}.htm" for i in range(6)]
+        + [f"{BASE}/tecnologia/5.10.4/#p{i}.htm" for i in range(6)]
+    )
+    
+    shards = shard_urls_by_key(urls, 3, load_factor=2.0)
+    
+    assert sorted(u for shard in shards for u in shard) == sorted(urls)
+    assert max(len(shard) for shard in shards) <= 12
+    for module in ("bpm", "crm", "tecnologia"):
+        assert sum(1 for shard in shards if any(f"/{module}/" in u for u in shard)) == 1
+
+
+def test_shard_urls_by_key_splits_single_large_module():
+    """Um módulo só ainda é dividido entre todas as partições"""
+    urls = [f"{BASE}/bpm/6.0/#p{i}.htm" for i in range(40)]
+    
+    shards = shard_urls_by_key(urls, 4)
+    
+    assert all(shard for shard in shards)
+    assert max(len(shard) for shard in shards) <= 13
+
+
+@pytest.mark.asyncio
+async def test_queue_affinity_with_work_stealing():
+    """Cada worker recebe os módulos dos quais é dono e rouba quando os seus acabam"""
+    queue = LeaseWorkQueue()
+    # Registrar os workers no anel antes de haver itens
+    for worker_id in ("w1", "w2"):
+        await queue.lease(worker_id)
+    
+    urls = [f"{BASE}/{m}/1.0/#p{i}.htm" for m in ("bpm", "crm", "sgi", "ronda") for i in range(3)]
+    await queue.enqueue(urls)
+    owners = {module_shard_key(u): queue._ring.get_node(module_shard_key(u)) for u in urls}
+    
+    first = await queue.lease("w1", max_items=100)
+    own = [i for i in first.items if owners[module_shard_key(i.url)] == "w1"]
+    stolen = [i for i in first.items if owners[module_shard_key(i.url)] != "w1"]
+    
+    # Itens próprios vêm antes dos roubados
+    assert first.items[:len(own)] == own
+    assert len(first.items) == len(urls)
+    assert queue.stolen == len(stolen)
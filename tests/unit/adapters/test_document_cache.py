@@ -0,0 +1,55 @@
+"""
+Testes unitários para DocumentLRUCache e seu uso no FileSystemRepository
+"""
+
+import pytest
+
+from libs.scrapers.adapters.document_cache import DocumentLRUCache, approximate_size
+from libs.scrapers.adapters.filesystem_repository import FileSystemRepository
+
+
+def test_evicts_least_recently_used_by_entries(make_document):
+    """Acima de max_entries sai o menos usado recentemente"""
+    cache = DocumentLRUCache(max_entries=2, max_bytes=None)
+    cache.put(make_document(1))
+    cache.put(make_document(2))
+    cache.get("test-1")
+    cache.put(make_document(3))
+    
+    assert "test-2" not in cache
+    assert "test-1" in cache and "test-3" in cache
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_bounds_by_approximate_bytes_and_counts_hits(make_document):
+    """Limite por bytes despeja documentos grandes; hits/misses são contados"""
+    big = make_document(1, content="a" * 5000)
+    cache = DocumentLRUCache(max_entries=100, max_bytes=approximate_size(big) + 2000)
+    cache.put(big)
+    cache.put(make_document(2, content="b" * 5000))
+    
+    assert len(cache) == 1
+    assert cache.size_bytes <= cache.max_bytes
+    assert cache.get("test-1") is None
+    assert cache.get("test-2").content == "b" * 5000
+    
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_repository_bulk_scan_bypasses_cache(tmp_path, make_document):
+    """get_all/export não enchem o cache; find_by_id usa e reaproveita"""
+    repository = FileSystemRepository(base_dir=str(tmp_path), cache_max_entries=3)
+    await repository.save_many([make_document(i) for i in range(6)])
+    
+    fresh = FileSystemRepository(base_dir=str(tmp_path), cache_max_entries=3)
+    assert len(await fresh.get_all()) == 6
+    assert await fresh.export_to_jsonl(str(tmp_path / "out.jsonl")) == 6
+    assert fresh.get_cache_stats()["entries"] == 0
+    
+    await fresh.find_by_id("test-4")
+    await fresh.find_by_id("test-4")
+    stats = fresh.get_cache_stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
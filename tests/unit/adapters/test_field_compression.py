@@ -0,0 +1,175 @@
+"""
+Testes unitários para a compressão de campos (FieldCompressor)
+"""
+
+import gzip
+import json
+import threading
+import pytest
+
+from libs.scrapers.adapters import (
+    CompressionError,
+    FieldCompressor,
+    FileSystemRepository,
+    SegmentDocumentRepository,
+    SqliteDocumentRepository,
+)
+from libs.scrapers.adapters import field_compression
+from libs.scrapers.adapters.field_compression import (
+    COMPRESSED_KEY,
+    decompress_json_line,
+    is_compressed,
+    open_text_file,
+)
+
+
+MADCAP_HTML = '<div class="MCBreadcrumbsBox"><span class="MCBreadcrumbsPrefix">Você está aqui: </span></div>' * 200
+
+
+@pytest.fixture
+def make_page_document(make_document):
+    """Documento do módulo crm com content e metadata["html"] grandes (markup MadCap)"""
+    def factory(i: int, content: str = MADCAP_HTML):
+        return make_document(i, module="crm", content=content, metadata={"html": MADCAP_HTML, "version": "6.2.4"})
+    return factory
+
+
+def test_compress_text_round_trip_and_small_values():
+    """Campos grandes são comprimidos e voltam iguais; pequenos ficam como estão"""
+    compressor = FieldCompressor(algorithm="gzip", min_size=1024)
+    
+    value = compressor.compress_text(MADCAP_HTML)
+    
+    assert is_compressed(value) and value[COMPRESSED_KEY] == "gzip"
+    assert len(value["data"]) < len(MADCAP_HTML) / 10
+    assert compressor.decompress_value(value) == MADCAP_HTML
+    assert compressor.compress_text("curto") == "curto"
+    assert compressor.open_stream(value).read(5) == MADCAP_HTML[:5]
+
+
+def test_document_fields_and_json_line(make_page_document):
+    """content e metadata["html"] comprimidos; linha JSONL descomprimida preserva o resto"""
+    compressor = FieldCompressor(algorithm="gzip")
+    data = make_page_document(1).to_dict()
+    
+    compressed = compressor.compress_document(data)
+    line = json.dumps(compressed, ensure_ascii=False).encode("utf-8") + b"\n"
+    restored = json.loads(decompress_json_line(line))
+    
+    assert is_compressed(compressed["content"]) and is_compressed(compressed["metadata"]["html"])
+    assert compressed["metadata"]["version"] == "6.2.4"
+    assert restored == data
+    assert decompress_json_line(b'{"id":"x"}\n') == b'{"id":"x"}\n'
+
+
+def test_open_text_file_finds_compressed_variant(tmp_path):
+    """open_text_file aceita page.html e lê page.html.gz em streaming"""
+    compressor = FieldCompressor(algorithm="gzip")
+    name, data = compressor.encode_file("page.html", MADCAP_HTML)
+    (tmp_path / name).write_bytes(data)
+    
+    assert name == "page.html.gz"
+    assert gzip.decompress(data).decode("utf-8") == MADCAP_HTML
+    with open_text_file(tmp_path / "page.html") as f:
+        assert f.read() == MADCAP_HTML
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["filesystem", "sqlite", "segments"])
+async def test_repositories_store_compressed_and_read_transparently(tmp_path, kind, make_page_document):
+    """Repositórios gravam campos comprimidos e leem/exportam o texto original"""
+    compressor = FieldCompressor(algorithm="gzip")
+    factories = {
+        "filesystem": lambda c: FileSystemRepository(base_dir=str(tmp_path / "fs"), encoding="compact", compressor=c),
+        "sqlite": lambda c: SqliteDocumentRepository(db_path=str(tmp_path / "docs.sqlite3"), compressor=c),
+        "segments": lambda c: SegmentDocumentRepository(base_dir=str(tmp_path / "seg"), compressor=c),
+    }
+    repository = factories[kind](compressor)
+    docs = [make_page_document(i) for i in range(3)]
+    await repository.save_many(docs)
+    repository.close()
+    
+    # Instância sem compressor lê os campos comprimidos mesmo assim
+    reader = factories[kind](None)
+    found = await reader.find_by_id("test-1")
+    export = tmp_path / "export.jsonl"
+    await reader.export_to_jsonl(str(export))
+    exported = [json.loads(line) for line in export.read_text(encoding="utf-8").splitlines()]
+    reader.close()
+    
+    assert found.to_dict() == docs[1].to_dict()
+    assert sorted(d["id"] for d in exported) == ["test-0", "test-1", "test-2"]
+    assert all(d["content"] == MADCAP_HTML and d["metadata"]["html"] == MADCAP_HTML for d in exported)
+    stored = sum(p.stat().st_size for p in tmp_path.rglob("*") if p.is_file() and p != export)
+    assert stored < len(MADCAP_HTML) * 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", ["gzip", "zstd"])
+async def test_save_many_compresses_on_thread_pool(tmp_path, algorithm, make_page_document):
+    """save_many comprime no pool de escrita; cada thread usa o próprio ZstdCompressor"""
+    if algorithm == "zstd":
+        pytest.importorskip("zstandard")
+    compressor = FieldCompressor(algorithm=algorithm)
+    repository = FileSystemRepository(
+        base_dir=str(tmp_path), encoding="compact", compressor=compressor, save_workers=8
+    )
+    docs = [make_page_document(i, content=MADCAP_HTML + str(i)) for i in range(200)]
+    await repository.save_many(docs)
+    repository.close()
+    
+    reader = FileSystemRepository(base_dir=str(tmp_path), compressor=compressor)
+    assert [(await reader.find_by_id(doc.id)).content for doc in docs] == [doc.content for doc in docs]
+    
+    if algorithm == "zstd":
+        other = []
+        thread = threading.Thread(target=lambda: other.append(compressor._zstd_compressor("crm")))
+        thread.start()
+        thread.join()
+        assert other[0] is not compressor._zstd_compressor("crm")
+
+
+def test_zstd_dictionary_per_module(tmp_path):
+    """Dicionário treinado por módulo melhora a razão e é achado na leitura pelo id"""
+    pytest.importorskip("zstandard")
+    samples = [
+        f'<div class="MCBreadcrumbsBox"><a href="page{i}.htm">Página {i}</a></div>'
+        f'<p class="Corpo">Cadastro de clientes {i} no módulo CRM</p>' * 5
+        for i in range(300)
+    ]
+    compressor = FieldCompressor(algorithm="zstd", dictionary_dir=tmp_path, min_size=0)
+    plain = [len(compressor.compress_bytes(s.encode("utf-8"))) for s in samples]
+    
+    compressor.train_dictionary("crm", samples, dict_size=8192)
+    value = compressor.compress_text(samples[7], module="crm")
+    with_dict = [len(compressor.compress_bytes(s.encode("utf-8"), "crm")) for s in samples]
+    
+    assert sum(with_dict) < sum(plain)
+    assert FieldCompressor(dictionary_dir=tmp_path).decompress_value(value) == samples[7]
+
+
+@pytest.mark.asyncio
+async def test_reader_without_compressor_uses_default_dictionaries(tmp_path, monkeypatch, make_page_document):
+    """Leitor sem compressor acha os dicionários em data/compression_dicts; sem eles, erro em vez de sumir"""
+    pytest.importorskip("zstandard")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(field_compression, "_default_compressor", None)
+    samples = [
+        f'<div class="MCBreadcrumbsBox"><a href="page{i}.htm">Página {i}</a></div>' * 20
+        for i in range(300)
+    ]
+    compressor = FieldCompressor(algorithm="zstd", dictionary_dir=tmp_path / "data" / "compression_dicts")
+    compressor.train_dictionary("crm", samples, dict_size=8192)
+    writer = FileSystemRepository(base_dir=str(tmp_path / "fs"), compressor=compressor)
+    await writer.save_many([make_page_document(i) for i in range(3)])
+    writer.close()
+    
+    reader = FileSystemRepository(base_dir=str(tmp_path / "fs"))
+    assert len([doc async for doc in reader.iter_all()]) == 3
+    assert (await reader.find_by_id("test-1")).content == MADCAP_HTML
+    
+    for dictionary in (tmp_path / "data" / "compression_dicts").glob("*.zdict"):
+        dictionary.unlink()
+    monkeypatch.setattr(field_compression, "_default_compressor", None)
+    with pytest.raises(CompressionError):
+        [doc async for doc in FileSystemRepository(base_dir=str(tmp_path / "fs")).iter_all()]
@@ -0,0 +1,169 @@
+"""
+Testes unitários para LeaseWorkQueue e o serviço HTTP da fila
+"""
+
+import asyncio
+
+import pytest
+
+from libs.scrapers.adapters.docker_worker_orchestrator import DockerWorkerOrchestrator
+from libs.scrapers.adapters.lease_work_queue import LeaseWorkQueue, run_queue_worker
+from libs.scrapers.adapters.work_queue_server import WorkQueueClient
+
+
+def make_process_func(fail=()):
+    """Stand-in do scraper: falha para URLs em fail, senão devolve o título"""
+    async def process(urls):
+        await asyncio.sleep(0.01)
+        return {url: (False, "boom") if url in fail else (True, {"title": url}) for url in urls}
+    return process
+
+
+@pytest.mark.asyncio
+async def test_lease_hides_items_until_ack():
+    """Itens em lease não são entregues a outro worker"""
+    queue = LeaseWorkQueue()
+    await queue.enqueue(["u1", "u2", "u3"])
+    
+    first = await queue.lease("w1", max_items=2)
+    second = await queue.lease("w2", max_items=2)
+    
+    assert [i.url for i in first.items] == ["u1", "u2"]
+    assert [i.url for i in second.items] == ["u3"]
+    assert queue.qsize() == 0 and queue.in_flight() == 3
+    
+    for lease in (first, second):
+        for item in lease.items:
+            assert await queue.ack(lease.lease_id, item.item_id, item.url)
+    
+    assert not queue.is_drained()
+    await queue.close_input()
+    assert queue.is_drained()
+    assert sorted(r for _, r in queue.collect_results()) == ["u1", "u2", "u3"]
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_requeued_and_heartbeat_extends():
+    """Lease sem heartbeat volta para a fila; ack tardio é recusado"""
+    queue = LeaseWorkQueue(visibility_timeout=0.1)
+    await queue.enqueue(["u1", "u2"])
+    
+    kept = await queue.lease("w1", max_items=1)
+    lost = await queue.lease("w2", max_items=1)
+    for _ in range(3):
+        await asyncio.sleep(0.05)
+        assert await queue.heartbeat(kept.lease_id)
+    
+    assert not await queue.heartbeat(lost.lease_id)
+    assert not await queue.ack(lost.lease_id, lost.items[0].item_id)
+    
+    retry = await queue.lease("w3")
+    assert [i.url for i in retry.items] == ["u2"]
+    assert retry.items[0].attempts == 2
+    assert (await queue.get_stats())["expired_leases"] == 1
+
+
+@pytest.mark.asyncio
+async def test_nack_retries_then_dead_letters():
+    """nack devolve o item até max_attempts; depois vai para dead letters"""
+    queue = LeaseWorkQueue(max_attempts=2)
+    await queue.enqueue(["bad"])
+    await queue.close_input()
+    
+    for _ in range(2):
+        lease = await queue.lease("w1")
+        assert await queue.nack(lease.lease_id, lease.items[0].item_id, "timeout")
+    
+    empty = await queue.lease("w1")
+    assert empty.items == [] and empty.drained
+    assert [i.url for i in queue.dead_letters] == ["bad"]
+    assert queue.dead_letters[0].last_error == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_worker_counts_success_only_when_ack_accepted():
+    """Ack recusado (lease expirado) não conta como sucesso"""
+    queue = LeaseWorkQueue(visibility_timeout=0.05)
+    await queue.enqueue(["slow"])
+    await queue.close_input()
+    calls = []
+    
+    async def process(urls):
+        calls.append(urls)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+        return {url: (True, url) for url in urls}
+    
+    stats = await run_queue_worker(queue, "w1", process, heartbeat_interval=10, poll_interval=0.01)
+    
+    assert stats["lost"] == 1 and stats["succeeded"] == 1
+    assert queue.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_http_workers_drain_orchestrator_queue():
+    """Workers locais consomem a fila do orchestrator pelo servidor HTTP"""
+    orchestrator = DockerWorkerOrchestrator(max_attempts=2, batch_size=3)
+    urls = [f"https://example.com/{i}" for i in range(10)]
+    await orchestrator.distribute_urls(urls, batch_size=4)
+    await orchestrator.close_input()
+    server = await orchestrator.start_queue_server(host="127.0.0.1", port=0)
+    
+    clients = [WorkQueueClient(server.url) for _ in range(3)]
+    try:
+        assert await clients[0].health()
+        process = make_process_func(fail={"https://example.com/7"})
+        worker_stats = await asyncio.gather(*[
+            run_queue_worker(client, f"worker-{i}", process, batch_size=3, poll_interval=0.01)
+            for i, client in enumerate(clients)
+        ])
+        assert await orchestrator.wait_for_completion(timeout=5, poll_interval=0.01)
+        remote_stats = await clients[0].get_stats()
+    finally:
+        for client in clients:
+            await client.close()
+        await orchestrator.stop_queue_server()
+    
+    results = orchestrator.collect_results()
+    assert sorted(item.url for item, _ in results) == sorted(u for u in urls if not u.endswith("/7"))
+    assert all(result == {"title": item.url} for item, result in results)
+    assert [i.url for i in orchestrator.queue.dead_letters] == ["https://example.com/7"]
+    assert sum(s["succeeded"] for s in worker_stats) == 9
+    assert remote_stats["completed"] == 9
+    assert remote_stats["dead_letters"] == 1
+
+
+@pytest.mark.asyncio
+async def test_workers_started_before_enqueue_wait_for_close():
+    """Workers que chegam antes das URLs aguardam até a entrada ser fechada"""
+    orchestrator = DockerWorkerOrchestrator(batch_size=2)
+    server = await orchestrator.start_queue_server(host="127.0.0.1", port=0)
+    
+    clients = [WorkQueueClient(server.url) for _ in range(2)]
+    try:
+        workers = [
+            asyncio.create_task(
+                run_queue_worker(client, f"worker-{i}", make_process_func(), batch_size=2, poll_interval=0.01)
+            )
+            for i, client in enumerate(clients)
+        ]
+        await asyncio.sleep(0.05)
+        assert not any(worker.done() for worker in workers)
+        
+        urls = [f"https://example.com/{i}" for i in range(6)]
+        await orchestrator.distribute_urls(urls[:3])
+        await asyncio.sleep(0.05)
+        await orchestrator.distribute_urls(urls[3:])
+        await clients[0].close_input()
+        
+        worker_stats = await asyncio.wait_for(asyncio.gather(*workers), timeout=5)
+        assert await orchestrator.wait_for_completion(timeout=5, poll_interval=0.01)
+    finally:
+        for client in clients:
+            await client.close()
+        await orchestrator.stop_queue_server()
+    
+    assert sorted(item.url for item, _ in orchestrator.collect_results()) == sorted(urls)
+    assert sum(s["succeeded"] for s in worker_stats) == 6
+    with pytest.raises(RuntimeError):
+        await orchestrator.distribute_urls(["https://example.com/late"])
@@ -0,0 +1,175 @@
+"""
+Testes unitários para MultiprocessScrapeCoordinator
+"""
+
+import asyncio
+import multiprocessing as mp
+import queue
+from datetime import datetime
+
+import pytest
+
+from libs.scrapers.adapters.multiprocess_coordinator import (
+    MultiprocessScrapeCoordinator,
+    ResultAggregator,
+    run_shard,
+    shard_urls,
+)
+from libs.scrapers.domain import Document, DocumentSource, DocumentType
+from libs.scrapers.ports.browser_worker_pool import WorkerResult
+
+
+class FakePool:
+    """Pool sem navegador: chama worker_func diretamente"""
+    
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.pages = []
+        self.closed = False
+    
+    async def initialize(self, num_workers):
+        self.pages = [None] * num_workers
+    
+    async def process_urls_with_retry(self, urls, worker_func, max_retries=3, show_progress=True):
+        results = []
+        for i, url in enumerate(urls):
+            worker_id = i % len(self.pages)
+            try:
+                await worker_func(url, worker_id)
+                results.append(WorkerResult(url=url, success=True, worker_id=worker_id))
+            except Exception as e:
+                results.append(WorkerResult(url=url, success=False, error=str(e), worker_id=worker_id))
+        return results
+    
+    async def close(self):
+        self.closed = True
+
+
+def make_document(url):
+    return Document(
+        id=url.rsplit("/", 1)[-1],
+        url=url,
+        title=f"Title {url}",
+        content="conteúdo",
+        module="bpm",
+        doc_type=DocumentType.TECHNICAL_DOC,
+        source=DocumentSource.SENIOR_ASTRO,
+    )
+
+
+def fake_worker_factory(pool):
+    async def worker(url, worker_id):
+        if "fail" in url:
+            raise RuntimeError("boom")
+        return make_document(url)
+    return worker
+
+
+def drain(q):
+    messages = []
+    while True:
+        try:
+            messages.append(q.get_nowait())
+        except queue.Empty:
+            return messages
+
+
+def test_shard_urls_round_robin():
+    """URLs são distribuídas sem perda nem duplicação"""
+    urls = [f"https://x/{i}" for i in range(7)]
+    shards = shard_urls(urls, 3)
+    
+    assert len(shards) == 3
+    assert sorted(u for shard in shards for u in shard) == sorted(urls)
+    assert shards[0] == ["https://x/0", "https://x/3", "https://x/6"]
+
+
+def test_coordinator_skips_empty_shards():
+    """Menos URLs que processos não cria processos ociosos"""
+    coordinator = MultiprocessScrapeCoordinator(num_processes=8)
+    
+    assert len(coordinator.shard(["https://x/1", "https://x/2"])) == 2
+    assert coordinator.get_num_executors() == 8
+
+
+@pytest.mark.asyncio
+async def test_run_shard_streams_documents_and_errors():
+    """Cada documento vai para a fila assim que fica pronto; falhas viram mensagens de erro"""
+    out = queue.Queue()
+    urls = ["https://x/a", "https://x/fail", "https://x/b"]
+    
+    await run_shard(0, urls, out, worker_factory=fake_worker_factory, pool_factory=FakePool, pages=2)
+    
+    messages = drain(out)
+    kinds = [m[0] for m in messages]
+    assert kinds.count("document") == 2
+    assert kinds.count("error") == 1
+    assert kinds[-1] == "done"
+    assert messages[-1][2]["documents"] == 2
+    assert messages[-1][2]["failed"] == 1
+    assert messages[0][2]["metadata"]["shard"] == 0
+
+
+def test_aggregator_builds_scraping_result():
+    """Mensagens de várias partições viram um único ScrapingResult"""
+    received = []
+    aggregator = ResultAggregator(on_document=received.append)
+    aggregator.add(("document", 0, make_document("https://x/a").to_dict()))
+    aggregator.add(("document", 1, make_document("https://x/b").to_dict()))
+    aggregator.add(("error", 1, "Failed to scrape https://x/c: boom"))
+    aggregator.add(("done", 0, {"urls": 1, "documents": 1, "failed": 0}))
+    aggregator.add(("done", 1, {"urls": 2, "documents": 1, "failed": 1}))
+    
+    result = aggregator.build(datetime.now(), ["https://x/a", "https://x/b", "https://x/c"])
+    
+    assert result.total_documents == 2
+    assert result.successful_scrapes == 2
+    assert result.failed_scrapes == 1
+    assert result.errors == ("Failed to scrape https://x/c: boom",)
+    assert [d.url for d in received] == ["https://x/a", "https://x/b"]
+    assert set(result.metadata["shards"]) == {0, 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="requer fork")
+async def test_coordinator_runs_shards_in_processes():
+    """Execução ponta a ponta com processos reais (pool falso)"""
+    coordinator = MultiprocessScrapeCoordinator(
+        worker_factory=fake_worker_factory,
+        pool_factory=FakePool,
+        num_processes=2,
+        pages_per_process=1,
+        start_method="fork",
+    )
+    urls = ["https://x/1", "https://x/2", "https://x/fail", "https://x/3"]
+    
+    result = await coordinator.run(urls)
+    
+    assert sorted(d.url for d in result.documents) == ["https://x/1", "https://x/2", "https://x/3"]
+    assert result.failed_scrapes == 1
+    assert result.source_urls == tuple(urls)
+
+
+@pytest.mark.asyncio
+async def test_run_shard_does_not_block_loop_on_full_queue():
+    """Fila de resultados cheia não trava o event loop do processo filho"""
+    out = queue.Queue(maxsize=1)
+    urls = [f"https://x/{i}" for i in range(5)]
+    messages = []
+    
+    async def consume():
+        while not messages or messages[-1][0] != "done":
+            try:
+                messages.append(out.get_nowait())
+            except queue.Empty:
+                await asyncio.sleep(0.001)
+    
+    await asyncio.wait_for(
+        asyncio.gather(
+            run_shard(0, urls, out, worker_factory=fake_worker_factory, pool_factory=FakePool, pages=2),
+            consume(),
+        ),
+        timeout=5,
+    )
+    
+    assert [m[0] for m in messages].count("document") == 5
@@ -9,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from libs.scrapers.adapters.playwright_worker_pool import (
     PlaywrightWorkerPool,
     WorkerResult,
+    toc_first_priority,
 )
 
 
@@ -116,5 +117,248 @@ async def test_worker_result_statistics():
     assert total_count == 4
 
 
+def make_fake_page(heap_bytes: int = 0):
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value=heap_bytes)
+    page.close = AsyncMock()
+    return page
+
+
+def make_fake_browser(heap_bytes: int = 0):
+    """Browser falso: cada contexto cria páginas MagicMock"""
+    browser = MagicMock()
+    
+    async def new_context():
+        context = MagicMock()
+        context.new_page = AsyncMock(side_effect=lambda: make_fake_page(heap_bytes))
+        context.close = AsyncMock()
+        return context
+    
+    browser.new_context = AsyncMock(side_effect=new_context)
+    return browser
+
+
+async def make_started_pool(num_workers: int, heap_bytes: int = 0, **kwargs):
+    pool = PlaywrightWorkerPool(**kwargs)
+    pool.num_workers = num_workers
+    pool.semaphore = asyncio.Semaphore(num_workers)
+    pool.browser = make_fake_browser(heap_bytes)
+    await pool._open_context()
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_page_recycled_after_navigation_budget():
+    """Página é recriada ao atingir o orçamento de navegações"""
+    pool = await make_started_pool(1, max_navigations_per_page=2, max_navigations_per_context=None)
+    first_page = pool.pages[0]
+    seen_pages = []
+    
+    async def worker_func(url, worker_id):
+        seen_pages.append(pool.pages[worker_id])
+        return url
+    
+    results = await pool.process_urls([f"u{i}" for i in range(5)], worker_func, show_progress=False)
+    
+    assert [r.url for r in results] == [f"u{i}" for i in range(5)]
+    assert all(r.success for r in results)
+    assert pool.get_recycle_stats()["pages_recycled"] == 2
+    assert seen_pages[0] is seen_pages[1] is first_page
+    assert seen_pages[2] is not first_page
+    first_page.close.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_context_recycled_without_losing_urls():
+    """Reciclagem de contexto espera tarefas ativas e não perde URLs da fila"""
+    pool = await make_started_pool(3, max_navigations_per_page=None, max_navigations_per_context=4)
+    first_context = pool.context
+    
+    async def worker_func(url, worker_id):
+        await asyncio.sleep(0.01)
+        return url
+    
+    urls = [f"u{i}" for i in range(10)]
+    results = await pool.process_urls(urls, worker_func, show_progress=False)
+    
+    assert sorted(r.url for r in results) == sorted(urls)
+    assert all(r.success for r in results)
+    assert pool.get_recycle_stats()["contexts_recycled"] == 2
+    assert pool.context is not first_context
+    assert len(pool.pages) == 3
+    first_context.close.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_js_heap_watermark_recycles_page():
+    """Heap JS acima do limite força a recriação da página"""
+    pool = await make_started_pool(
+        1, heap_bytes=600 * 1024 * 1024,
+        max_navigations_per_page=None, max_navigations_per_context=None,
+        max_js_heap_mb=512, memory_check_interval=1,
+    )
+    
+    async def worker_func(url, worker_id):
+        return url
+    
+    await pool.process_urls(["u1", "u2"], worker_func, show_progress=False)
+    
+    stats = pool.get_recycle_stats()
+    assert stats["js_heap_watermark"] == 2
+    assert stats["pages_recycled"] == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_results_streams_before_slow_urls():
+    """Resultados rápidos são entregues antes da URL mais lenta terminar"""
+    pool = await make_started_pool(2, max_navigations_per_page=None, max_navigations_per_context=None)
+    
+    async def worker_func(url, worker_id):
+        await asyncio.sleep(0.3 if url == "slow" else 0.01)
+        return url
+    
+    order = [r.url async for r in pool.iter_results(["slow", "a", "b", "c"], worker_func)]
+    
+    assert sorted(order) == ["a", "b", "c", "slow"]
+    assert order[-1] == "slow"
+    assert pool.get_dead_letters() == []
+
+
+@pytest.mark.asyncio
+async def test_iter_results_retries_and_dead_letters():
+    """Falhas transitórias são retentadas; falhas persistentes vão para dead letters"""
+    pool = await make_started_pool(2, max_navigations_per_page=None, max_navigations_per_context=None)
+    calls = {}
+    
+    async def worker_func(url, worker_id):
+        calls[url] = calls.get(url, 0) + 1
+        if url == "flaky" and calls[url] < 2:
+            raise RuntimeError("timeout")
+        if url == "broken":
+            raise RuntimeError("404")
+        return url
+    
+    results = [
+        r async for r in pool.iter_results(
+            ["ok", "flaky", "broken"], worker_func, max_retries=3, base_delay=0.01
+        )
+    ]
+    
+    by_url = {r.url: r for r in results}
+    assert len(results) == 3
+    assert by_url["flaky"].success and by_url["flaky"].attempts == 2
+    assert not by_url["broken"].success and by_url["broken"].attempts == 3
+    assert calls["broken"] == 3
+    assert [r.url for r in pool.get_dead_letters()] == ["broken"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_iter_results_keep_their_own_dead_letters():
+    """Cada chamada recebe só as próprias falhas; o pool guarda o agregado"""
+    pool = await make_started_pool(2, max_navigations_per_page=None, max_navigations_per_context=None)
+    
+    async def worker_func(url, worker_id):
+        await asyncio.sleep(0.01)
+        if url.endswith("/broken"):
+            raise RuntimeError("404")
+        return url
+    
+    async def consume(urls, dead_letters):
+        return [r async for r in pool.iter_results(
+            urls, worker_func, max_retries=2, base_delay=0.01, dead_letters=dead_letters
+        )]
+    
+    bpm_dead, erp_dead = [], []
+    await asyncio.gather(
+        consume(["bpm/1", "bpm/broken", "bpm/2"], bpm_dead),
+        consume(["erp/1", "erp/broken"], erp_dead),
+    )
+    
+    assert [r.url for r in bpm_dead] == ["bpm/broken"]
+    assert [r.url for r in erp_dead] == ["erp/broken"]
+    assert sorted(r.url for r in pool.get_dead_letters()) == ["bpm/broken", "erp/broken"]
+
+
+@pytest.mark.asyncio
+async def test_iter_results_stops_workers_on_early_exit():
+    """Interromper a iteração cancela workers e retentativas pendentes"""
+    pool = await make_started_pool(1, max_navigations_per_page=None, max_navigations_per_context=None)
+    processed = []
+    
+    async def worker_func(url, worker_id):
+        processed.append(url)
+        await asyncio.sleep(0.01)
+        return url
+    
+    results = pool.iter_results([f"u{i}" for i in range(10)], worker_func)
+    first = await results.__anext__()
+    await results.aclose()
+    await asyncio.sleep(0.05)
+    
+    assert first.success
+    assert len(processed) < 10
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_keep_their_own_urls():
+    """Chamadas concorrentes não roubam URLs umas das outras e dividem as páginas"""
+    pool = await make_started_pool(2, max_navigations_per_page=None, max_navigations_per_context=None)
+    in_use = set()
+    
+    async def worker_func(url, worker_id, page):
+        assert page is pool.pages[worker_id]
+        assert worker_id not in in_use
+        in_use.add(worker_id)
+        await asyncio.sleep(0.01)
+        in_use.discard(worker_id)
+        return url
+    
+    bpm = [f"bpm/{i}" for i in range(6)]
+    erp = [f"erp/{i}" for i in range(6)]
+    bpm_results, erp_results = await asyncio.gather(
+        pool.process_urls(bpm, worker_func, show_progress=False, pass_page=True),
+        pool.process_urls(erp, worker_func, show_progress=False, pass_page=True),
+    )
+    
+    assert sorted(r.url for r in bpm_results) == sorted(bpm)
+    assert sorted(r.url for r in erp_results) == sorted(erp)
+    assert all(r.success for r in bpm_results + erp_results)
+    assert pool.get_queue_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_page_is_passed_only_on_request():
+    """Sem pass_page, parâmetros extras do worker mantêm seus valores padrão"""
+    pool = await make_started_pool(1, max_navigations_per_page=None, max_navigations_per_context=None)
+    seen = []
+    
+    async def worker_func(url, worker_id, retries=3):
+        seen.append(retries)
+        return url
+    
+    await pool.process_urls(["u1"], worker_func, show_progress=False)
+    results = [r async for r in pool.iter_results(["u2"], worker_func)]
+    
+    assert results[0].success
+    assert seen == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_priority_processes_toc_pages_first():
+    """Prioridade TOC primeiro: índices antes de tópicos, tópicos rasos antes de profundos"""
+    pool = await make_started_pool(1, max_navigations_per_page=None, max_navigations_per_context=None)
+    base = "https://documentacao.senior.com.br/bpm/6.0/"
+    urls = [base + "#a/b/topico.htm", base + "#intro.htm", base, base + "#a/index.htm"]
+    order = []
+    
+    async def worker_func(url, worker_id):
+        order.append(url)
+        return url
+    
+    await pool.process_urls(urls, worker_func, show_progress=False, priority=toc_first_priority)
+    
+    assert order == [base, base + "#a/index.htm", base + "#intro.htm", base + "#a/b/topico.htm"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
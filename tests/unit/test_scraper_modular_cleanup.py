@@ -0,0 +1,39 @@
+"""
+Testes unitários para GarbageCollector (scraper_modular)
+"""
+
+import json
+
+from apps.scraper.scraper_modular import ConfigManager, GarbageCollector
+
+
+def make_collector(tmp_path, cleanup):
+    path = tmp_path / "scraper_config.json"
+    path.write_text(json.dumps({"cleanup": cleanup}), encoding="utf-8")
+    return GarbageCollector(ConfigManager(str(path)))
+
+
+def test_prefilter_literals_skip_rule_only_without_literal(tmp_path):
+    """Regra com literais declarados roda quando um deles aparece no texto"""
+    gc = make_collector(tmp_path, {
+        "garbage_patterns": ["<!--.*?-->"],
+        "garbage_sequences": [{"pattern": "(cookie|analytics)", "action": "remove"}],
+        "prefilter_literals": {
+            "<!--.*?-->": ["<!--"],
+            "(cookie|analytics)": ["cookie", "analytics"],
+        },
+    })
+    
+    assert gc.clean("a <!-- x --> b") == "a b"
+    assert gc.clean("aceite analytics agora") == "aceite agora"
+    assert gc.clean("texto limpo") == "texto limpo"
+
+
+def test_rules_without_literals_always_run(tmp_path):
+    """Sem prefilter_literals a regex varre todo texto"""
+    gc = make_collector(tmp_path, {
+        "garbage_patterns": ["[0-9]+"],
+        "garbage_sequences": [{"pattern": "(?i)cookie", "action": "remove"}],
+    })
+    
+    assert gc.clean("abc 123 COOKIE def") == "abc def"
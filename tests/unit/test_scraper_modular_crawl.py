@@ -0,0 +1,141 @@
+"""
+Testes unitários para BfsFrontier e o crawl concorrente do ModularScraper (páginas falsas)
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from apps.scraper.scraper_modular import BfsFrontier, ModularScraper
+
+
+ROOT = "https://docs.example.com/"
+REAL_SLEEP = asyncio.sleep
+
+
+def test_frontier_dedups_on_enqueue():
+    """URL equivalente (host maiúsculo, porta padrão, path vazio) entra na fila uma vez só"""
+    frontier = BfsFrontier()
+    
+    assert frontier.add("https://docs.example.com")
+    assert not frontier.add("HTTPS://Docs.Example.com:443/")
+    assert frontier.extend([ROOT, f"{ROOT}a.htm", f"{ROOT}a.htm"], depth=1) == 1
+    
+    frontier.pop()
+    assert not frontier.add(ROOT)
+    assert ROOT in frontier
+    assert len(frontier) == 1
+    assert frontier.get_stats()["duplicates"] == 4
+
+
+def test_frontier_keeps_hash_topics_apart():
+    """Fragmento do MadCap identifica a página: #a e #b são URLs distintas"""
+    frontier = BfsFrontier()
+    
+    assert frontier.add(f"{ROOT}#lsp/a.htm")
+    assert frontier.add(f"{ROOT}#lsp/b.htm")
+    assert not frontier.add(f"{ROOT}#lsp/a.htm")
+
+
+def test_frontier_pops_by_depth_then_arrival():
+    """Menor profundidade sai primeiro; no empate, ordem de chegada (BFS)"""
+    frontier = BfsFrontier(max_depth=2)
+    frontier.add(f"{ROOT}deep.htm", depth=2)
+    frontier.extend([f"{ROOT}b.htm", f"{ROOT}a.htm"], depth=1)
+    frontier.add(ROOT)
+    
+    assert not frontier.add(f"{ROOT}too-deep.htm", depth=3)
+    assert [frontier.pop() for _ in range(len(frontier))] == [
+        (ROOT, 0),
+        (f"{ROOT}b.htm", 1),
+        (f"{ROOT}a.htm", 1),
+        (f"{ROOT}deep.htm", 2),
+    ]
+
+
+def make_site(num_pages):
+    """Grafo de links: cada página aponta para a raiz, para a anterior e para as duas seguintes"""
+    urls = [ROOT] + [f"{ROOT}p{i}.htm" for i in range(1, num_pages)]
+    return {
+        url: [ROOT, urls[i - 1]] + urls[i + 1:i + 3]
+        for i, url in enumerate(urls)
+    }
+
+
+class FakePage:
+    def __init__(self):
+        self.url = None
+        self.closed = False
+    
+    async def goto(self, url, **kwargs):
+        await REAL_SLEEP(random.uniform(0, 0.003))
+        self.url = url
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+    
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+def make_scraper(monkeypatch, tmp_path, site, failing=()):
+    scraper = ModularScraper(str(tmp_path / "missing_config.json"))
+    scraper.rate_limiter = None
+    visits = []
+    
+    async def no_op(page):
+        return None
+    
+    async def extract_page(page):
+        visits.append(page.url)
+        content = "" if page.url in failing else f"conteúdo de {page.url}"
+        return {"title": page.url, "content": content, "breadcrumb": [], "links": site[page.url]}
+    
+    async def fast_sleep(delay, *args):
+        await REAL_SLEEP(0)
+    
+    monkeypatch.setattr(scraper.js_handler, "execute_cleanup_scripts", no_op)
+    monkeypatch.setattr(scraper.js_handler, "handle_dynamic_content", no_op)
+    monkeypatch.setattr(scraper.extractor, "extract_page", extract_page)
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    scraper.frontier.add(ROOT)
+    return scraper, visits
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("num_workers", [2, 4])
+async def test_concurrent_crawl_respects_max_pages(monkeypatch, tmp_path, num_workers):
+    """Nunca passa de max_pages páginas salvas nem visita uma URL duas vezes"""
+    scraper, visits = make_scraper(monkeypatch, tmp_path, make_site(30))
+    context = FakeContext()
+    
+    await scraper._crawl_concurrent(context, max_pages=10, num_workers=num_workers)
+    
+    assert scraper.stats['pages_scraped'] == 10
+    assert len(scraper.documents) == 10
+    assert len(visits) == len(set(visits)) == 10
+    assert len(context.pages) == num_workers
+    assert all(page.closed for page in context.pages)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_crawl_refills_budget_after_failures(monkeypatch, tmp_path):
+    """Página que falha devolve a vaga; o crawl termina quando a fronteira esgota"""
+    site = make_site(8)
+    failing = {f"{ROOT}p2.htm", f"{ROOT}p5.htm"}
+    scraper, visits = make_scraper(monkeypatch, tmp_path, site, failing)
+    
+    await scraper._crawl_concurrent(FakeContext(), max_pages=100, num_workers=3)
+    
+    assert sorted(visits) == sorted(site)
+    assert scraper.stats['pages_scraped'] == 6
+    assert scraper.stats['pages_failed'] == 2
+    assert len(scraper.frontier) == 0
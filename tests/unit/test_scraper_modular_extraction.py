@@ -0,0 +1,98 @@
+"""
+Testes unitários para ContentExtractor.extract_page (um único evaluate)
+"""
+
+import json
+
+import pytest
+
+from apps.scraper.scraper_modular import ConfigManager, ContentExtractor, GarbageCollector
+
+
+class FakeFrame:
+    def __init__(self, text):
+        self.text = text
+    
+    async def text_content(self, selector):
+        return self.text
+
+
+class FakePage:
+    """Página que devolve `raw` no evaluate e registra as chamadas"""
+    
+    def __init__(self, raw, frames=()):
+        self.raw = raw
+        self.frames = [FakeFrame("")] + [FakeFrame(text) for text in frames]
+        self.calls = []
+    
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        return self.raw
+
+
+def make_extractor(tmp_path):
+    path = tmp_path / "scraper_config.json"
+    path.write_text(json.dumps({
+        "extraction": {"min_content_length": 10, "max_breadcrumb_depth": 3},
+        "cleanup": {"garbage_patterns": ["\\s+"]},
+        "selectors": {"title": ["h1.title"], "content": ["#main"], "skip": [".ads"], "breadcrumb": [".crumbs"]},
+    }), encoding="utf-8")
+    config = ConfigManager(str(path))
+    return ContentExtractor(config, GarbageCollector(config))
+
+
+@pytest.mark.asyncio
+async def test_extract_page_uses_single_evaluate(tmp_path):
+    """Título, conteúdo, breadcrumb e links vêm de uma chamada e são limpos em Python"""
+    extractor = make_extractor(tmp_path)
+    page = FakePage({
+        "title": "  Gerais \n",
+        "content": "Funções   gerais\n do LSP",
+        "breadcrumb": ["LSP", "", "cookie policy", "Funções"],
+        "links": ["https://docs.example.com/a.htm"],
+    })
+    
+    extracted = await extractor.extract_page(page)
+    
+    assert len(page.calls) == 1
+    script, arg = page.calls[0]
+    assert arg == {"mainContent": True}
+    assert '"h1.title"' in script and '".ads"' in script and '"maxDepth": 3' in script
+    assert extracted == {
+        "title": "Gerais",
+        "content": "Funções gerais do LSP",
+        "breadcrumb": ["LSP", "Funções"],
+        "links": ["https://docs.example.com/a.htm"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_extract_page_prefers_iframe_text(tmp_path):
+    """Com texto em iframe o script não extrai o conteúdo principal"""
+    extractor = make_extractor(tmp_path)
+    page = FakePage(
+        {"title": "Tópico", "content": "", "breadcrumb": [], "links": []},
+        frames=["curto", "conteúdo do tópico no iframe"],
+    )
+    
+    extracted = await extractor.extract_page(page)
+    
+    assert page.calls[0][1] == {"mainContent": False}
+    assert extracted["content"] == "conteúdo do tópico no iframe"
+
+
+@pytest.mark.asyncio
+async def test_extract_page_drops_short_content_and_survives_errors(tmp_path):
+    """Conteúdo abaixo do mínimo vira "" e falha no evaluate devolve campos vazios"""
+    extractor = make_extractor(tmp_path)
+    
+    short = await extractor.extract_page(FakePage({"title": "", "content": "curto", "breadcrumb": [], "links": []}))
+    
+    class BrokenPage(FakePage):
+        async def evaluate(self, script, arg=None):
+            raise RuntimeError("Target closed")
+    
+    broken = await extractor.extract_page(BrokenPage(None))
+    
+    assert short["content"] == ""
+    assert broken == {"title": "", "content": "", "breadcrumb": [], "links": []}
@@ -0,0 +1,144 @@
+"""
+Testes unitários - Scraper unificado: fronteira, JSONL e escrita em background
+
+Testa CrawlFrontier, StreamingJsonlSink e BackgroundDocumentWriter com
+arquivos reais em diretório temporário (sem navegador), e a chave
+canônica de deduplicação de URLs.
+"""
+
+import json
+import pytest
+
+from apps.scraper.scraper_unificado import (
+    BackgroundDocumentWriter,
+    CrawlFrontier,
+    SeniorDocScraper,
+    StreamingJsonlSink,
+)
+
+
+def make_index_doc(i: int) -> dict:
+    return {'id': f"https://example.com/{i}", 'url': f"https://example.com/{i}", 'content_length': 10}
+
+
+class TestCrawlFrontier:
+    """Testes da fronteira persistente"""
+    
+    def test_resume_after_crash_requeues_in_flight(self, tmp_path):
+        """URLs em andamento na queda voltam para discovered; concluídas continuam concluídas"""
+        db_path = tmp_path / "frontier.sqlite3"
+        frontier = CrawlFrontier(db_path)
+        frontier.start()
+        frontier.add_discovered(["a", "b", "c"], "crm")
+        frontier.mark_in_flight("a", "crm")
+        frontier.mark_done("a", {"url": "a", "title": "A"})
+        frontier.mark_in_flight("b", "crm")
+        frontier.close()  # processo cai com "b" em andamento
+        
+        resumed = CrawlFrontier(db_path)
+        resumed.start(resume=True)
+        
+        assert resumed.counts() == {"done": 1, "discovered": 2}
+        assert resumed.is_done("a") and not resumed.is_done("b")
+        assert list(resumed.done_documents()) == [{"url": "a", "title": "A"}]
+        resumed.close()
+    
+    def test_new_run_marks_previous_rows_stale(self, tmp_path):
+        """Execução nova (sem resume) não aproveita concluídas, mas guarda os validadores"""
+        frontier = CrawlFrontier(tmp_path / "frontier.sqlite3")
+        frontier.start()
+        frontier.add_discovered(["a"], "crm")
+        frontier.mark_in_flight("a", "crm")
+        frontier.mark_done("a", {"url": "a"}, etag='"v1"')
+        
+        frontier.start(resume=False)
+        
+        assert frontier.counts() == {"stale": 1}
+        assert frontier.get_state("a")["etag"] == '"v1"'
+        frontier.close()
+    
+    def test_unsaved_document_is_not_marked_done(self, tmp_path, monkeypatch):
+        """Página scrapeada cujo save_document falhou fica como falha, para o resume refazer"""
+        monkeypatch.chdir(tmp_path)
+        scraper = SeniorDocScraper()
+        scraper.frontier = CrawlFrontier(tmp_path / "frontier.sqlite3")
+        scraper.frontier.start()
+        scraper.frontier.mark_in_flight("a", "crm")
+        
+        scraper._finish_url({'status': 'scraped', 'key': "a", 'document': None})
+        
+        assert scraper.frontier.counts() == {"failed": 1}
+        scraper.frontier.close()
+
+
+class TestCanonicalUrl:
+    """Testes da chave canônica usada na deduplicação do crawl"""
+    
+    BASE = "https://documentacao.senior.com.br/tecnologia/5.10.4/"
+    
+    @pytest.fixture
+    def scraper(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        return SeniorDocScraper()
+    
+    def test_path_hash_tocpath_and_index_variants_share_a_key(self, scraper):
+        """Forma direta, hash, hash com TocPath e index.html apontam para o mesmo tópico"""
+        variants = [
+            self.BASE + "lsp/funcoes/gerais.htm",
+            self.BASE + "#lsp/funcoes/gerais.htm",
+            self.BASE + "index.html#lsp/funcoes/gerais.htm",
+            self.BASE + "#lsp/funcoes/gerais.htm%3FTocPath%3DTecnologia%7CLSP%7C_____3",
+            self.BASE + "index.htm#lsp/funcoes/gerais.htm?TocPath=Tecnologia|LSP",
+        ]
+        
+        keys = {scraper.canonical_url(url) for url in variants}
+        
+        assert keys == {self.BASE + "lsp/funcoes/gerais.htm"}
+    
+    def test_index_page_and_plain_anchor(self, scraper):
+        """index.html some da chave; âncora que não é tópico continua na chave"""
+        assert scraper.canonical_url(self.BASE + "index.html") == scraper.canonical_url(self.BASE)
+        assert scraper.canonical_url(self.BASE + "#lsp/funcoes/outras.htm") != scraper.canonical_url(
+            self.BASE + "#lsp/funcoes/gerais.htm"
+        )
+        assert scraper.canonical_url(self.BASE + "#secao") != scraper.canonical_url(self.BASE)
+
+
+class TestStreamingJsonlSink:
+    """Testes do JSONL escrito em streaming"""
+    
+    def test_writes_to_tmp_then_renames_atomically(self, tmp_path):
+        """O destino só aparece completo, no close; antes disso só existe o .tmp"""
+        path = tmp_path / "docs.jsonl"
+        sink = StreamingJsonlSink(path, batch_size=2)
+        for i in range(5):
+            sink.write(make_index_doc(i))
+        
+        assert not path.exists()
+        assert len(sink.tmp_path.read_text(encoding="utf-8").splitlines()) == 4
+        
+        sink.close(alt_breadcrumbs={"https://example.com/3": ["crm > outro"]})
+        
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [d['id'] for d in lines] == [f"https://example.com/{i}" for i in range(5)]
+        assert lines[3]['alt_breadcrumbs'] == ["crm > outro"]
+        assert (sink.count, sink.total_chars) == (5, 50)
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestBackgroundDocumentWriter:
+    """Testes da escrita de arquivos fora do event loop"""
+    
+    @pytest.mark.asyncio
+    async def test_close_drains_pending_writes(self, tmp_path):
+        """close() grava tudo que estava na fila antes de encerrar a thread"""
+        writer = BackgroundDocumentWriter(max_pending=4, batch_size=2)
+        for i in range(20):
+            await writer.submit(tmp_path / f"page-{i}", [("content.txt", f"texto {i}"), ("page.html.gz", b"\x1f\x8b")])
+        
+        writer.close()
+        writer.close()  # idempotente (chamado de novo no finally de run())
+        
+        assert writer.written == 20 and writer.errors == 0
+        assert (tmp_path / "page-19" / "content.txt").read_text(encoding="utf-8") == "texto 19"
+        assert (tmp_path / "page-19" / "page.html.gz").read_bytes() == b"\x1f\x8b"